@@ -0,0 +1,122 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Board, BoardMembership
+
+ACCESS_CACHE_TIMEOUT = getattr(settings, 'BOARD_ACCESS_CACHE_TIMEOUT', 600)
+PUBLIC_BOARDS_KEY = 'board-access:public'
+DELETED_BOARDS_KEY = 'board-access:deleted'
+
+
+def _member_key(user_id):
+    return f'board-access:member:{user_id}'
+
+
+def public_board_ids():
+    ids = cache.get(PUBLIC_BOARDS_KEY)
+    if ids is None:
+        ids = frozenset(Board.objects.filter(is_public=True).values_list('id', flat=True))
+        cache.set(PUBLIC_BOARDS_KEY, ids, ACCESS_CACHE_TIMEOUT)
+    return ids
+
+
+def deleted_board_ids():
+    """
+    Boards that are soft-deleted and waiting for their purge (see core.deletion).
+    Memberships outlive the soft delete, so these are subtracted from the access set.
+    """
+    ids = cache.get(DELETED_BOARDS_KEY)
+    if ids is None:
+        ids = frozenset(Board.all_objects.filter(deleted_at__isnull=False).values_list('id', flat=True))
+        cache.set(DELETED_BOARDS_KEY, ids, ACCESS_CACHE_TIMEOUT)
+    return ids
+
+
+def member_board_ids(user_id):
+    key = _member_key(user_id)
+    ids = cache.get(key)
+    if ids is None:
+        ids = frozenset(BoardMembership.objects.filter(user_id=user_id).values_list('board_id', flat=True))
+        cache.set(key, ids, ACCESS_CACHE_TIMEOUT)
+    return ids
+
+
+def accessible_board_ids(request):
+    """
+    Ids of the boards the requesting user may read: every public board plus the
+    boards they are a member of. Computed once per request and cached across
+    requests; membership and board writes invalidate the cached parts.
+    """
+    http_request = getattr(request, '_request', request)
+    ids = getattr(http_request, '_accessible_board_ids', None)
+    if ids is None:
+        user = request.user
+        ids = public_board_ids()
+        if user and user.is_authenticated:
+            ids = ids | (member_board_ids(user.pk) - deleted_board_ids())
+        http_request._accessible_board_ids = ids
+    return ids
+
+
+async def _acached_ids(found, key, values):
+    ids = found.get(key)
+    if ids is None:
+        ids = frozenset([pk async for pk in values])
+        await cache.aset(key, ids, ACCESS_CACHE_TIMEOUT)
+    return ids
+
+
+async def aaccessible_board_ids(request):
+    """
+    accessible_board_ids() for async views, reading the cached sets in one
+    round trip. The result is stored on the request the same way, so later
+    sync calls (permissions, get_queryset) don't query.
+    """
+    http_request = getattr(request, '_request', request)
+    ids = getattr(http_request, '_accessible_board_ids', None)
+    if ids is None:
+        user = request.user
+        member = user and user.is_authenticated
+        keys = [PUBLIC_BOARDS_KEY, *([_member_key(user.pk), DELETED_BOARDS_KEY] if member else [])]
+        found = await cache.aget_many(keys)
+        ids = await _acached_ids(found, PUBLIC_BOARDS_KEY,
+                                 Board.objects.filter(is_public=True).values_list('id', flat=True))
+        if member:
+            member_ids = await _acached_ids(found, _member_key(user.pk), BoardMembership.objects
+                                            .filter(user_id=user.pk).values_list('board_id', flat=True))
+            deleted = await _acached_ids(found, DELETED_BOARDS_KEY, Board.all_objects
+                                         .filter(deleted_at__isnull=False).values_list('id', flat=True))
+            ids = ids | (member_ids - deleted)
+        http_request._accessible_board_ids = ids
+    return ids
+
+
+def scoped_board_ids(request, param='board'):
+    """
+    The access set narrowed to `?board=` when the request names one.
+    """
+    board_ids = accessible_board_ids(request)
+    board = request.query_params.get(param)
+    if board and board.isdigit():
+        board_ids = board_ids & {int(board)}
+    return board_ids
+
+
+def can_access_board(request, board_id):
+    return board_id in accessible_board_ids(request)
+
+
+@receiver(post_save, sender=Board)
+@receiver(post_delete, sender=Board)
+def board_written(sender, instance, **kwargs):
+    transaction.on_commit(lambda: cache.delete_many([PUBLIC_BOARDS_KEY, DELETED_BOARDS_KEY]))
+
+
+@receiver(post_save, sender=BoardMembership)
+@receiver(post_delete, sender=BoardMembership)
+def membership_written(sender, instance, **kwargs):
+    user_id = instance.user_id
+    transaction.on_commit(lambda: cache.delete(_member_key(user_id)))
@@ -1,6 +1,6 @@
 from django.contrib import admin #tocloseissue2
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
-from .models import User, Board, Feedback, Comment, Tag, BoardMembership
+from .models import User, Board, Feedback, Comment, Tag, BoardMembership, Vote, Task, DeletionJob
 
 @admin.register(User)
 class UserAdmin(BaseUserAdmin):
@@ -18,10 +18,17 @@ class BoardMembershipAdmin(admin.ModelAdmin):
 
 @admin.register(Feedback)
 class FeedbackAdmin(admin.ModelAdmin):
-    list_display = ('title', 'board', 'status', 'created_by', 'created_at')
+    list_display = ('title', 'board', 'status', 'upvote_count', 'created_by', 'created_at')
     list_filter = ('status', 'feedback_type', 'board')
     search_fields = ('title', 'description')
     filter_horizontal = ('tags',) 
+    readonly_fields = ('upvote_count',)
+
+@admin.register(Vote)
+class VoteAdmin(admin.ModelAdmin):
+    list_display = ('feedback', 'user', 'created_at')
+    raw_id_fields = ('feedback', 'user')
+
 @admin.register(Comment)
 class CommentAdmin(admin.ModelAdmin):
     list_display = ('feedback', 'created_by', 'created_at')
@@ -29,4 +36,17 @@ class CommentAdmin(admin.ModelAdmin):
 @admin.register(Tag)
 class TagAdmin(admin.ModelAdmin):
     list_display = ('name',)
-    search_fields = ('name',)
\ No newline at end of file
+    search_fields = ('name',)
+
+@admin.register(Task)
+class TaskAdmin(admin.ModelAdmin):
+    list_display = ('name', 'status', 'attempts', 'run_after', 'locked_by', 'created_at')
+    list_filter = ('status', 'name')
+    search_fields = ('dedupe_key',)
+
+
+@admin.register(DeletionJob)
+class DeletionJobAdmin(admin.ModelAdmin):
+    list_display = ('target', 'target_ids', 'status', 'deleted', 'total', 'requested_by', 'created_at', 'finished_at')
+    list_filter = ('status', 'target')
+    readonly_fields = ('deleted', 'total', 'error')
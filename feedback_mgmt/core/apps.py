@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class CoreConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'core'
+
+    def ready(self):
+        from . import access, authentication, counters, deletion, ranking, response_cache, search, signals, similarity, stats, tags  # noqa: F401  (connects receivers, registers tasks)
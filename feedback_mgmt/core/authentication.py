@@ -0,0 +1,119 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+from .models import User
+
+AUTH_CACHE_TIMEOUT = getattr(settings, 'AUTH_USER_CACHE_TIMEOUT', 60)
+VERSION_CLAIM = 'ver'
+# Fields the request user is built with; anything else is loaded lazily on first access.
+STATE_FIELDS = ('id', 'username', 'role', 'is_active', 'is_staff', 'is_superuser', 'token_version')
+# Changing any of these bumps token_version, which revokes every token issued before.
+REVOKING_FIELDS = ('role', 'is_active', 'is_superuser')
+
+
+def _state_key(user_id):
+    return f'auth-user:{user_id}'
+
+
+def get_auth_state(user_id):
+    """
+    The user's auth-relevant columns as a dict (None for a missing user), cached briefly.
+    """
+    key = _state_key(user_id)
+    state = cache.get(key)
+    if state is None:
+        state = User.objects.filter(pk=user_id).values(*STATE_FIELDS).first() or {}
+        cache.set(key, state, AUTH_CACHE_TIMEOUT)
+    return state or None
+
+
+async def aget_auth_state(user_id):
+    """
+    get_auth_state() for async views.
+    """
+    key = _state_key(user_id)
+    state = await cache.aget(key)
+    if state is None:
+        state = await User.objects.filter(pk=user_id).values(*STATE_FIELDS).afirst() or {}
+        await cache.aset(key, state, AUTH_CACHE_TIMEOUT)
+    return state or None
+
+
+def build_user(state):
+    """
+    A User with only the auth columns loaded, taken from the (fresher) cached
+    row rather than the token claims. Other fields are deferred, so they load
+    on access and save() writes back only what was loaded.
+    """
+    values = dict(state)
+    # from_db() expects the values in model field order.
+    names = [field.attname for field in User._meta.concrete_fields if field.attname in values]
+    return User.from_db('default', names, [values[name] for name in names])
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWT authentication without a user query per request.
+
+    The user is rebuilt from a short-lived cache of the row's auth columns;
+    the token only has to carry the user id and `ver`. A token whose `ver` claim is behind the user's
+    token_version, or that belongs to an inactive user, is rejected.
+    """
+
+    def get_user(self, validated_token):
+        return self._check_state(get_auth_state(self._user_id(validated_token)), validated_token)
+
+    async def aauthenticate(self, request):
+        """
+        authenticate() for async views (core.views_async); token checks are CPU only.
+        """
+        header = self.get_header(request)
+        raw_token = self.get_raw_token(header) if header is not None else None
+        if raw_token is None:
+            return None
+        validated_token = self.get_validated_token(raw_token)
+        state = await aget_auth_state(self._user_id(validated_token))
+        return self._check_state(state, validated_token), validated_token
+
+    def _user_id(self, validated_token):
+        try:
+            return validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken('Token contained no recognizable user identification')
+
+    def _check_state(self, state, validated_token):
+        if state is None:
+            raise AuthenticationFailed('User not found', code='user_not_found')
+        if not state['is_active']:
+            raise AuthenticationFailed('User is inactive', code='user_inactive')
+        if validated_token.get(VERSION_CLAIM, 0) != state['token_version']:
+            raise AuthenticationFailed('Token has been revoked', code='token_revoked')
+        return build_user(state)
+
+
+@receiver(pre_save, sender=User)
+def bump_token_version(sender, instance, raw=False, update_fields=None, **kwargs):
+    if raw or instance._state.adding:
+        return
+    if update_fields is not None and not set(REVOKING_FIELDS).intersection(update_fields):
+        return
+    current = User.objects.filter(pk=instance.pk).values('token_version', *REVOKING_FIELDS).first()
+    if not current or all(current[field] == getattr(instance, field) for field in REVOKING_FIELDS):
+        return
+    instance.token_version = current['token_version'] + 1
+    if update_fields is not None and 'token_version' not in update_fields:
+        # save(update_fields=[...]) won't write the new version itself.
+        User.objects.filter(pk=instance.pk).update(token_version=instance.token_version)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def user_written(sender, instance, **kwargs):
+    key = _state_key(instance.pk)
+    transaction.on_commit(lambda: cache.delete(key))
@@ -0,0 +1,379 @@
+"""
+In-process API benchmarks.
+
+Each scenario drives one DRF endpoint through APIClient (no network, the full
+middleware and view stack) and records wall-clock latency percentiles and the
+number of queries per request. Results can be saved as a baseline JSON and
+later runs compared against it: any scenario that runs more queries than its
+baseline, or whose p95 grows past the tolerance, is reported as a regression.
+
+`run_concurrency()` is the throughput counterpart: the same GET scenarios
+issued many at a time, once through the sync handler on a fixed pool of worker
+threads (thread-per-request WSGI) and once through the async handler on a
+single event loop (ASGI, with the async read routes from core.urls).
+
+`run_render_benchmark()` times rendering `/api/feedback/` pages with DRF's
+JSONRenderer and core.renderers.FastJSONRenderer, and reports their size
+uncompressed and as core.compression would send them.
+
+Run against whatever database is configured (SQLite or Postgres), after
+`manage.py seed_synthetic`.
+"""
+import asyncio
+import json
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from types import ModuleType
+from urllib.parse import quote
+
+from asgiref.sync import ThreadSensitiveContext, sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+from django.db import connection, connections
+from django.db.backends.signals import connection_created
+from django.db.models import Count
+from django.test import AsyncClient, Client
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import include, path
+from rest_framework.test import APIClient
+
+from rest_framework.renderers import JSONRenderer
+
+from .compression import available_encodings, compress
+from .models import Board, Feedback, SearchTerm
+from .renderers import FastJSONRenderer
+from .serializers import CustomTokenObtainPairSerializer
+
+DEFAULT_ITERATIONS = 50
+DEFAULT_WARMUP = 5
+DEFAULT_TOLERANCE = 0.5
+DEFAULT_REQUESTS = 400
+DEFAULT_WORKERS = 4
+DEFAULT_CONCURRENCY = 64
+CONCURRENCY_SCENARIOS = ['feedback_list', 'feedback_detail', 'board_list']
+RENDER_PAGE_SIZES = (10, 50, 100)
+
+
+class Scenario:
+
+    def __init__(self, name, method, path, data=None):
+        self.name = name
+        self.method = method
+        # `path` and `data` are callables taking the iteration number, so requests can vary.
+        self.path = path
+        self.data = data
+
+    def request(self, client, i):
+        data = self.data(i) if self.data else None
+        return getattr(client, self.method)(self.path(i), data, format='json')
+
+
+def build_scenarios(user):
+    boards = list(Board.objects.filter(members=user).order_by('pk').values_list('pk', flat=True)) \
+        or list(Board.objects.filter(is_public=True).order_by('pk').values_list('pk', flat=True)[:5])
+    if not boards:
+        raise ValueError('No boards to benchmark; run seed_synthetic first.')
+    items = list(Feedback.objects.filter(board_id__in=boards).order_by('-comment_count', 'pk')
+                 .values_list('pk', flat=True)[:20])
+    largest = Feedback.objects.filter(board_id__in=boards).values('board_id') \
+        .annotate(n=Count('id')).order_by('-n').first() or {'board_id': boards[0], 'n': 0}
+    middle_page = max(1, largest['n'] // 20)
+    title = Feedback.objects.filter(board_id__in=boards).values_list('title', flat=True).first() or 'Login fails'
+    term = SearchTerm.objects.filter(board_id__in=boards).values_list('term', flat=True).first() or 'login'
+
+    def board(i):
+        return boards[i % len(boards)]
+
+    def item(i):
+        return items[i % len(items)]
+
+    statuses = [key for key, _ in Feedback.STATUS_CHOICES]
+    return [
+        Scenario('feedback_list', 'get', lambda i: f'/api/feedback/?board={board(i)}'),
+        Scenario('feedback_list_filtered', 'get',
+                 lambda i: f'/api/feedback/?board={board(i)}&status=open&feedback_type=bug'),
+        Scenario('feedback_list_ordered', 'get', lambda i: f'/api/feedback/?board={board(i)}&ordering=-created_at'),
+        Scenario('feedback_list_hot', 'get', lambda i: '/api/feedback/?ordering=hot'),
+        Scenario('feedback_list_trending', 'get', lambda i: f'/api/feedback/?board={board(i)}&ordering=trending'),
+        Scenario('feedback_list_deep_page', 'get',
+                 lambda i: f"/api/feedback/?board={largest['board_id']}&page={middle_page}"),
+        Scenario('feedback_list_cursor', 'get', lambda i: f'/api/feedback/?board={board(i)}&cursor='),
+        Scenario('feedback_search', 'get', lambda i: f'/api/feedback/?search={term[:3 + i % 3]}'),
+        Scenario('feedback_similar', 'get', lambda i: f'/api/feedback/similar/?board={board(i)}&q={quote(title[:8 + i % 20])}'),
+        Scenario('my_votes', 'get', lambda i: f'/api/feedback/my-votes/?board={board(i)}'),
+        Scenario('feedback_detail', 'get', lambda i: f'/api/feedback/{item(i)}/'),
+        Scenario('board_list', 'get', lambda i: '/api/boards/'),
+        Scenario('board_kanban', 'get', lambda i: f'/api/boards/{board(i)}/kanban/'),
+        Scenario('board_stats', 'get', lambda i: f'/api/boards/{board(i)}/stats/'),
+        Scenario('comments', 'get', lambda i: f'/api/feedback/{item(i)}/comments/'),
+        # Toggled twice per item, so an even iteration count leaves votes unchanged.
+        Scenario('upvote_toggle', 'post', lambda i: f'/api/feedback/{item(i // 2)}/upvote/'),
+        Scenario('move', 'post', lambda i: f'/api/feedback/{item(i)}/move/',
+                 data=lambda i: {'status': statuses[i % len(statuses)]}),
+    ]
+
+
+def percentile(values, q):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(q * (len(ordered) - 1)))))
+    return ordered[index]
+
+
+def isolated_caches(name='benchmark'):
+    """
+    A CACHES setting with a private local-memory cache in place of every
+    configured alias, so clearing them never touches a shared (redis) cache.
+    """
+    return {alias: {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': f'{name}-{alias}'}
+            for alias in settings.CACHES}
+
+
+def run_scenario(client, scenario, iterations, warmup, cold):
+    latencies, queries = [], []
+    for i in range(warmup + iterations):
+        if cold:
+            for cache in caches.all():
+                cache.clear()
+        with CaptureQueriesContext(connection) as captured:
+            start = time.perf_counter()
+            response = scenario.request(client, i)
+            elapsed = time.perf_counter() - start
+        if response.status_code >= 400:
+            raise RuntimeError(f'{scenario.name}: HTTP {response.status_code} for {scenario.path(i)}')
+        if i >= warmup:
+            latencies.append(elapsed * 1000)
+            queries.append(len(captured))
+    return {
+        'p50_ms': round(percentile(latencies, 0.5), 3),
+        'p95_ms': round(percentile(latencies, 0.95), 3),
+        'p99_ms': round(percentile(latencies, 0.99), 3),
+        'mean_ms': round(statistics.fmean(latencies), 3),
+        'queries': max(queries),
+    }
+
+
+def api_client(user):
+    # A real token, so authentication is part of what gets measured.
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f'Bearer {CustomTokenObtainPairSerializer.get_token(user).access_token}')
+    return client
+
+
+def run_benchmarks(user, iterations=DEFAULT_ITERATIONS, warmup=DEFAULT_WARMUP, only=None, cold=True):
+    """
+    Run every scenario (or those named in `only`) as `user`; returns {name: stats}.
+    Requests run against isolated_caches(); with `cold`, those are cleared
+    before each request so the database path is measured.
+    """
+    client = api_client(user)
+    scenarios = build_scenarios(user)
+    results = {}
+    with override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'testserver'], CACHES=isolated_caches()):
+        for scenario in scenarios:
+            if only and scenario.name not in only:
+                continue
+            results[scenario.name] = run_scenario(client, scenario, iterations, warmup, cold)
+    return results
+
+
+def compare(results, baseline, tolerance=DEFAULT_TOLERANCE):
+    """
+    Regressions of `results` against `baseline` as human-readable strings.
+    """
+    regressions = []
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if previous is None:
+            continue
+        if current['queries'] > previous['queries']:
+            regressions.append(f"{name}: {current['queries']} queries (baseline {previous['queries']})")
+        limit = previous['p95_ms'] * (1 + tolerance)
+        if current['p95_ms'] > limit:
+            regressions.append(f"{name}: p95 {current['p95_ms']:.1f} ms (baseline {previous['p95_ms']:.1f} ms)")
+    return regressions
+
+
+def load_baseline(path):
+    with open(path) as stream:
+        return json.load(stream)
+
+
+def save_baseline(path, results):
+    with open(path, 'w') as stream:
+        json.dump(results, stream, indent=2, sort_keys=True)
+        stream.write('\n')
+
+
+def _urlconf(async_reads):
+    from . import urls
+    api = [pattern for pattern in urls.urlpatterns if pattern not in urls.async_read_urlpatterns]
+    if async_reads:
+        api = urls.async_read_urlpatterns + api
+    urlconf = ModuleType('async_urls' if async_reads else 'sync_urls')
+    urlconf.urlpatterns = [path('api/', include(api))]
+    return urlconf
+
+
+@contextmanager
+def simulated_latency(ms):
+    """
+    Add `ms` of blocking wait to every query on connections opened inside the
+    block, standing in for a database across the network.
+    """
+    def wait(execute, sql, params, many, context):
+        time.sleep(ms / 1000)
+        return execute(sql, params, many, context)
+
+    def install(sender, connection, **kwargs):
+        connection.execute_wrappers.append(wait)
+
+    if not ms:
+        yield
+        return
+    connection_created.connect(install)
+    try:
+        yield
+    finally:
+        connection_created.disconnect(install)
+
+
+def _throughput(latencies, elapsed, in_flight):
+    return {
+        'requests': len(latencies),
+        'rps': round(len(latencies) / elapsed, 1),
+        'p50_ms': round(percentile(latencies, 0.5), 3),
+        'p95_ms': round(percentile(latencies, 0.95), 3),
+        'max_in_flight': in_flight,
+    }
+
+
+def run_sync_concurrency(headers, paths, workers):
+    """
+    Thread-per-request: `workers` threads each serving one request at a time.
+    """
+    local = threading.local()
+    lock = threading.Lock()
+    state = {'in_flight': 0, 'peak': 0}
+
+    def one(url):
+        if not hasattr(local, 'client'):
+            local.client = Client()
+        with lock:
+            state['in_flight'] += 1
+            state['peak'] = max(state['peak'], state['in_flight'])
+        start = time.perf_counter()
+        response = local.client.get(url, headers=headers)
+        elapsed = time.perf_counter() - start
+        with lock:
+            state['in_flight'] -= 1
+        connections.close_all()
+        if response.status_code >= 400:
+            raise RuntimeError(f'HTTP {response.status_code} for {url}')
+        return elapsed * 1000
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        latencies = list(executor.map(one, paths))
+    return _throughput(latencies, time.perf_counter() - start, state['peak'])
+
+
+def run_async_concurrency(headers, paths, concurrency):
+    """
+    One event loop with up to `concurrency` requests in flight. Each request
+    gets its own sync thread for ORM work, as under ASGIHandler.
+    """
+    client = AsyncClient()
+    state = {'in_flight': 0, 'peak': 0}
+
+    async def one(url, slots):
+        async with slots:
+            state['in_flight'] += 1
+            state['peak'] = max(state['peak'], state['in_flight'])
+            start = time.perf_counter()
+            async with ThreadSensitiveContext():
+                response = await client.get(url, headers=headers)
+                await sync_to_async(connections.close_all)()
+            elapsed = time.perf_counter() - start
+            state['in_flight'] -= 1
+        if response.status_code >= 400:
+            raise RuntimeError(f'HTTP {response.status_code} for {url}')
+        return elapsed * 1000
+
+    async def main():
+        slots = asyncio.Semaphore(concurrency)
+        return await asyncio.gather(*(one(url, slots) for url in paths))
+
+    start = time.perf_counter()
+    latencies = asyncio.run(main())
+    return _throughput(latencies, time.perf_counter() - start, state['peak'])
+
+
+def run_concurrency(user, requests=DEFAULT_REQUESTS, workers=DEFAULT_WORKERS, concurrency=DEFAULT_CONCURRENCY,
+                    only=None, latency_ms=0, cold=True):
+    """
+    Run each GET scenario (CONCURRENCY_SCENARIOS, or those named in `only`)
+    `requests` times through both paths; returns {name: {'sync': stats, 'async': stats}}.
+    With `cold`, a dummy cache stands in for the configured one so every request reads the database.
+    """
+    headers = {'Authorization': f'Bearer {CustomTokenObtainPairSerializer.get_token(user).access_token}'}
+    scenarios = [scenario for scenario in build_scenarios(user)
+                 if scenario.name in (only or CONCURRENCY_SCENARIOS)]
+    if any(scenario.method != 'get' for scenario in scenarios):
+        raise ValueError('Only GET scenarios can be run concurrently.')
+    overrides = {'ALLOWED_HOSTS': [*settings.ALLOWED_HOSTS, 'testserver']}
+    if cold:
+        overrides['CACHES'] = {'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}}
+
+    results = {}
+    with override_settings(**overrides), simulated_latency(latency_ms):
+        for scenario in scenarios:
+            paths = [scenario.path(i) for i in range(requests)]
+            with override_settings(ROOT_URLCONF=_urlconf(async_reads=False)):
+                sync = run_sync_concurrency(headers, paths, workers)
+            with override_settings(ROOT_URLCONF=_urlconf(async_reads=True)):
+                asynchronous = run_async_concurrency(headers, paths, concurrency)
+            results[scenario.name] = {'sync': sync, 'async': asynchronous}
+    return results
+
+
+def _median_ms(func, iterations):
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        result = func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return result, round(statistics.median(timings), 3)
+
+
+def run_render_benchmark(user, page_sizes=RENDER_PAGE_SIZES, iterations=DEFAULT_ITERATIONS):
+    """
+    Render a `/api/feedback/` page of each size with both renderers; returns
+    {page_size: stats} with median render and compression times and the body size per encoding.
+    """
+    client = api_client(user)
+    results = {}
+    with override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'testserver']):
+        for page_size in page_sizes:
+            response = client.get(f'/api/feedback/?page_size={page_size}')
+            if response.status_code >= 400:
+                raise RuntimeError(f'HTTP {response.status_code} for /api/feedback/?page_size={page_size}')
+            data = response.data
+            stock, stock_ms = _median_ms(lambda: JSONRenderer().render(data), iterations)
+            fast, fast_ms = _median_ms(lambda: FastJSONRenderer().render(data), iterations)
+            if json.loads(fast) != json.loads(stock):
+                raise RuntimeError(f'Renderers disagree on page_size={page_size}.')
+            stats = {
+                'items': len(data['results']),
+                'drf_ms': stock_ms,
+                'fast_ms': fast_ms,
+                'bytes': len(fast),
+            }
+            for encoding in available_encodings():
+                body, ms = _median_ms(lambda: compress(fast, encoding), iterations)
+                stats[f'{encoding}_bytes'] = len(body)
+                stats[f'{encoding}_ms'] = ms
+            results[page_size] = stats
+    return results
@@ -0,0 +1,85 @@
+from django.db import transaction
+from django.utils import timezone
+
+from .access import accessible_board_ids
+from .deletion import soft_delete_feedback
+from .events import publish_event
+from .models import Feedback
+from .search import reindex_feedback
+from .signals import notify_boards_changed
+from .tags import resolve_tag_names
+
+MAX_BULK_IDS = 5000
+
+OK = 'ok'
+NOT_FOUND = 'not_found'
+FORBIDDEN = 'forbidden'
+
+
+def bulk_feedback_action(request, action, ids, status=None, tag_ids=None, tag_names=None):
+    """
+    Apply one action to many feedback items with set-based permission checks
+    and a single write statement. Returns ([{'id': ..., 'result': ...}] in input
+    order, the DeletionJob for a delete or None).
+
+    Rules mirror the single-item endpoints: only admins may move, and tagging or
+    deleting needs ownership unless the user is an admin. `tag_names` are
+    resolved (and created, for a tag action) only once some item passed those
+    checks, in the same transaction as the links.
+    """
+    user = request.user
+    ids = list(dict.fromkeys(ids))
+    rows = Feedback.objects.filter(pk__in=ids, board_id__in=accessible_board_ids(request)) \
+        .values_list('pk', 'board_id', 'created_by_id')
+
+    is_admin = user.role == 'admin'
+    results = {pk: NOT_FOUND for pk in ids}
+    allowed = {}
+    for pk, board_id, created_by_id in rows:
+        if is_admin or (action != 'move' and created_by_id == user.pk):
+            allowed[pk] = board_id
+            results[pk] = OK
+        else:
+            results[pk] = FORBIDDEN
+
+    job = None
+    if allowed:
+        if action == 'delete':
+            job = soft_delete_feedback(list(allowed), allowed.values(), user)
+        else:
+            with transaction.atomic():
+                tag_ids = list(tag_ids or [])
+                if tag_names:
+                    tag_ids = list(dict.fromkeys(tag_ids + resolve_tag_names(tag_names, create=action == 'tag')))
+                _apply(action, list(allowed), status=status, tag_ids=tag_ids)
+            notify_boards_changed(allowed.values())
+        _publish(action, allowed, status)
+
+    return [{'id': pk, 'result': results[pk]} for pk in ids], job
+
+
+def _publish(action, allowed, status):
+    by_board = {}
+    for pk, board_id in allowed.items():
+        by_board.setdefault(board_id, []).append(pk)
+    for board_id, ids in by_board.items():
+        publish_event(board_id, 'feedback.bulk', {'action': action, 'ids': ids, 'status': status})
+
+
+def _apply(action, ids, status=None, tag_ids=()):
+    Link = Feedback.tags.through
+
+    if action == 'move':
+        Feedback.objects.filter(pk__in=ids).update(status=status, updated_at=timezone.now())
+    elif action == 'tag':
+        Link.objects.bulk_create(
+            [Link(feedback_id=pk, tag_id=tag_id) for pk in ids for tag_id in tag_ids],
+            ignore_conflicts=True,
+            batch_size=1000,
+        )
+        reindex_feedback(ids)
+    elif action == 'untag':
+        Link.objects.filter(feedback_id__in=ids, tag_id__in=tag_ids).delete()
+        reindex_feedback(ids)
+    else:
+        raise ValueError(f'Unknown bulk action: {action}')
@@ -0,0 +1,163 @@
+"""
+Negotiated response compression (brotli or gzip).
+
+CompressionMiddleware picks an encoding from the request's Accept-Encoding
+header. It prefers brotli when the `brotli` package is installed and the
+client's q-values allow it. Only textual content types (JSON, NDJSON, CSV,
+text) are compressed. Bodies under settings.COMPRESSION_MIN_SIZE are sent
+as they are, since framing overhead outweighs the saving there.
+
+Streaming responses (exports) are compressed chunk by chunk and flushed
+after each chunk, so they still stream. The realtime event stream is left
+alone. As with Django's GZipMiddleware, strong ETags become weak;
+core.response_cache compares If-None-Match weakly.
+"""
+import zlib
+
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+from django.utils.deprecation import MiddlewareMixin
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+MIN_SIZE = getattr(settings, 'COMPRESSION_MIN_SIZE', 1024)
+GZIP_LEVEL = getattr(settings, 'COMPRESSION_GZIP_LEVEL', 6)
+# Quality 11 is for static assets; at 5 brotli beats gzip -6 on API JSON in about the same time.
+BROTLI_QUALITY = getattr(settings, 'COMPRESSION_BROTLI_QUALITY', 5)
+
+COMPRESSIBLE_TYPES = ('application/json', 'application/x-ndjson', 'application/javascript', 'text/')
+SKIPPED_TYPES = ('text/event-stream',)
+
+
+def available_encodings():
+    return ['br', 'gzip'] if brotli is not None else ['gzip']
+
+
+def negotiate(accept_encoding, encodings=None):
+    """
+    The preferred entry of `encodings` acceptable under an Accept-Encoding header, or None.
+    Earlier entries win ties.
+    """
+    encodings = encodings or available_encodings()
+    weights = {}
+    for part in accept_encoding.split(','):
+        name, _, params = part.strip().partition(';')
+        name = name.strip().lower()
+        if not name:
+            continue
+        weight = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                weight = float(params[2:])
+            except ValueError:
+                weight = 0.0
+        weights[name] = weight
+    best, best_weight = None, 0.0
+    for name in encodings:
+        weight = weights.get(name, weights.get('*', 0.0))
+        if weight > best_weight:
+            best, best_weight = name, weight
+    return best
+
+
+def is_compressible(content_type):
+    content_type = content_type.lower()
+    if content_type.startswith(SKIPPED_TYPES):
+        return False
+    return content_type.startswith(COMPRESSIBLE_TYPES) or '+json' in content_type.split(';')[0]
+
+
+class _Gzip:
+
+    def __init__(self):
+        # wbits=31: gzip framing, as Content-Encoding: gzip requires.
+        self.compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)
+
+    def process(self, data):
+        return self.compressor.compress(data)
+
+    def flush(self):
+        return self.compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self):
+        return self.compressor.flush()
+
+
+class _Brotli:
+
+    def __init__(self):
+        self.compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+
+    def process(self, data):
+        return self.compressor.process(data)
+
+    def flush(self):
+        return self.compressor.flush()
+
+    def finish(self):
+        return self.compressor.finish()
+
+
+_COMPRESSORS = {'gzip': _Gzip, 'br': _Brotli}
+
+
+def compress(data, encoding):
+    if encoding == 'br':
+        return brotli.compress(data, quality=BROTLI_QUALITY)
+    compressor = _Gzip()
+    return compressor.process(data) + compressor.finish()
+
+
+def compress_stream(chunks, encoding):
+    compressor = _COMPRESSORS[encoding]()
+    for chunk in chunks:
+        data = compressor.process(chunk) + compressor.flush()
+        if data:
+            yield data
+    yield compressor.finish()
+
+
+async def acompress_stream(chunks, encoding):
+    compressor = _COMPRESSORS[encoding]()
+    async for chunk in chunks:
+        data = compressor.process(chunk) + compressor.flush()
+        if data:
+            yield data
+    yield compressor.finish()
+
+
+class CompressionMiddleware(MiddlewareMixin):
+
+    def process_response(self, request, response):
+        if response.has_header('Content-Encoding') or not is_compressible(response.get('Content-Type', '')):
+            return response
+        if not response.streaming and len(response.content) < MIN_SIZE:
+            return response
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+        encoding = negotiate(request.headers.get('Accept-Encoding', ''))
+        if encoding is None:
+            return response
+
+        if response.streaming:
+            if response.is_async:
+                response.streaming_content = acompress_stream(response.streaming_content, encoding)
+            else:
+                response.streaming_content = compress_stream(response.streaming_content, encoding)
+            del response.headers['Content-Length']
+        else:
+            compressed = compress(response.content, encoding)
+            if len(compressed) >= len(response.content):
+                return response
+            response.content = compressed
+            response.headers['Content-Length'] = str(len(compressed))
+
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response.headers['ETag'] = 'W/' + etag
+        response.headers['Content-Encoding'] = encoding
+        return response
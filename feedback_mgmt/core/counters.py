@@ -0,0 +1,42 @@
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Comment, Feedback
+from .ranking import COMMENT_WEIGHT, activity_update
+
+
+def reconcile_counts(queryset, field, source_model, fk='feedback'):
+    """
+    Rewrite the denormalized `field` on Feedback rows in `queryset` from the number
+    of `source_model` rows pointing at them, touching only drifted rows.
+    Returns the number of rows fixed.
+    """
+    actual = source_model.objects.filter(**{fk: OuterRef('pk')}) \
+        .order_by().values(fk).annotate(n=Count('pk')).values('n')
+
+    drifted = queryset.annotate(actual=Coalesce(Subquery(actual), 0)) \
+        .exclude(**{field: F('actual')})
+
+    return Feedback.objects.filter(pk__in=drifted.values('pk')) \
+        .update(**{field: Coalesce(Subquery(actual), 0)})
+
+
+def reconcile_comment_counts(queryset=None):
+    return reconcile_counts(queryset if queryset is not None else Feedback.objects.all(), 'comment_count', Comment)
+
+
+@receiver(post_save, sender=Comment)
+def comment_created(sender, instance, created, **kwargs):
+    if created:
+        Feedback.objects.filter(pk=instance.feedback_id).update(
+            comment_count=F('comment_count') + 1, **activity_update(instance.feedback, COMMENT_WEIGHT))
+
+
+@receiver(post_delete, sender=Comment)
+def comment_deleted(sender, instance, **kwargs):
+    # Scores are left to the next ranking batch; loading the feedback here would
+    # cost a query per comment when a whole thread is cascade-deleted.
+    Feedback.objects.filter(pk=instance.feedback_id, comment_count__gt=0) \
+        .update(comment_count=F('comment_count') - 1)
@@ -0,0 +1,115 @@
+"""
+Primary/replica routing.
+
+Writes always go to the primary ('default'). Reads made while serving a
+safe-method request go to one of settings.REPLICA_DATABASES, except when:
+
+- the request itself writes (POST/PUT/PATCH/DELETE), so it reads its own data;
+- the caller wrote recently: after a write the user (and the browser, by
+  cookie) is pinned to the primary for settings.DB_PIN_SECONDS, which covers
+  replication lag for read-your-writes;
+- the view opts out with `use_primary_db = True`, or lists the action in
+  `use_primary_db = {'stats', ...}` on a viewset.
+
+Reads outside a request (management commands, workers) use the primary.
+The state lives in a context variable, so it follows sync_to_async hops.
+"""
+import random
+import time
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.deprecation import MiddlewareMixin
+
+from .models import User
+
+PRIMARY = 'default'
+PIN_SECONDS = getattr(settings, 'DB_PIN_SECONDS', 5)
+PIN_COOKIE = 'db_pin'
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+_routing = ContextVar('db_routing', default=None)
+
+
+def _pin_key(user_id):
+    return f'db-pin:{user_id}'
+
+
+def replicas():
+    return getattr(settings, 'REPLICA_DATABASES', [])
+
+
+class RoutingState:
+
+    def __init__(self, request, pinned):
+        self.request = request
+        self.pinned = pinned
+        self.user_checked = False
+
+    def use_primary(self):
+        if self.pinned:
+            return True
+        if not self.user_checked:
+            # Only a user DRF already authenticated; a lazy session user would
+            # need a query of its own to resolve, routed back through here.
+            user = self.request.__dict__.get('user')
+            if type(user) is User:
+                self.user_checked = True
+                self.pinned = cache.get(_pin_key(user.pk)) is not None
+        return self.pinned
+
+
+class PrimaryReplicaRouter:
+
+    def db_for_read(self, model, **hints):
+        state = _routing.get()
+        if state is None or not replicas() or state.use_primary():
+            return PRIMARY
+        return random.choice(replicas())
+
+    def db_for_write(self, model, **hints):
+        return PRIMARY
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas mirror the primary, so objects from any alias can be related.
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == PRIMARY
+
+
+def _pinned_by_cookie(request):
+    try:
+        return float(request.COOKIES.get(PIN_COOKIE, 0)) > time.time()
+    except ValueError:
+        return False
+
+
+class ReplicaRoutingMiddleware(MiddlewareMixin):
+
+    def process_request(self, request):
+        pinned = request.method not in SAFE_METHODS or _pinned_by_cookie(request)
+        _routing.set(RoutingState(request, pinned))
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        state = _routing.get()
+        if state is None:
+            return None
+        override = getattr(getattr(view_func, 'cls', view_func), 'use_primary_db', False)
+        if isinstance(override, bool):
+            state.pinned = state.pinned or override
+        else:
+            action = getattr(view_func, 'actions', {}).get(request.method.lower())
+            state.pinned = state.pinned or action in override
+        return None
+
+    def process_response(self, request, response):
+        _routing.set(None)
+        if request.method not in SAFE_METHODS and response.status_code < 400:
+            until = time.time() + PIN_SECONDS
+            response.set_cookie(PIN_COOKIE, f'{until:.3f}', max_age=PIN_SECONDS, httponly=True, samesite='Lax')
+            user = request.__dict__.get('user')
+            if type(user) is User:
+                cache.set(_pin_key(user.pk), 1, PIN_SECONDS)
+        return response
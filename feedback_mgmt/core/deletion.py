@@ -0,0 +1,167 @@
+"""
+Soft deletion with a chunked background purge.
+
+Deleting a board or feedback only stamps `deleted_at`. LiveManager and the
+access set (core.access) hide the row right away, and a DeletionJob is
+queued. The job's task then removes the feedback in chunks of CHUNK_SIZE
+items, one short transaction per chunk. Each chunk's dependents go first:
+votes, comments, tag links and index rows. Last come the board-level rows
+and the board itself. No request ever holds locks over a whole board, and
+a job that dies part-way resumes from whatever is left, because every step
+only looks at the rows still present.
+
+Rows are removed with one plain DELETE per table (the tables listed in
+FEEDBACK_CHILDREN and BOARD_CHILDREN), without model signals. The counters,
+search postings and events that those signals maintain belong to rows that
+are disappearing anyway.
+"""
+import time
+import traceback
+
+from django.db import connections, router, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import Board, BoardMembership, Comment, DeletionJob, Feedback, SearchTerm, SimilarityBand, Vote
+from .signals import notify_boards_changed
+from .tasks import enqueue, task
+
+CHUNK_SIZE = 200
+# A run stops after this many seconds and queues the next one, so tasks stay short.
+RUN_SECONDS = 20
+
+
+# Tables holding rows that cascade from a feedback item or a board, as
+# (model, foreign key to it). They are emptied before the parent rows.
+FEEDBACK_CHILDREN = [
+    (Vote, 'feedback'),
+    (Comment, 'feedback'),
+    (Feedback.tags.through, 'feedback'),
+    (SearchTerm, 'feedback'),
+    (SimilarityBand, 'feedback'),
+]
+BOARD_CHILDREN = [
+    (SearchTerm, 'board'),
+    (SimilarityBand, 'board'),
+    (BoardMembership, 'board'),
+]
+
+
+def _delete_where(model, field, ids):
+    """
+    DELETE the `model` rows whose `field` is one of `ids` (a bounded list) in one statement.
+    """
+    connection = connections[router.db_for_write(model)]
+    quote = connection.ops.quote_name
+    placeholders = ', '.join(['%s'] * len(ids))
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'DELETE FROM {quote(model._meta.db_table)} '
+            f'WHERE {quote(model._meta.get_field(field).column)} IN ({placeholders})',
+            list(ids),
+        )
+
+
+def _delete_with_children(model, children, ids):
+    for child, field in children:
+        _delete_where(child, field, ids)
+    _delete_where(model, 'id', ids)
+
+
+def soft_delete_boards(boards, user=None):
+    """
+    Hide boards now and queue their purge. Returns the DeletionJob.
+    """
+    ids = [board.pk for board in boards]
+    with transaction.atomic():
+        now = timezone.now()
+        for board in boards:
+            # save() rather than update(), so the access and board-list caches are invalidated.
+            board.deleted_at = now
+            board.save(update_fields=['deleted_at', 'updated_at'])
+        total = Feedback.all_objects.filter(board_id__in=ids).count()
+        job = DeletionJob.objects.create(target=DeletionJob.BOARD, target_ids=ids, total=total, requested_by=user)
+        notify_boards_changed(ids)
+        schedule(job)
+    return job
+
+
+def soft_delete_feedback(ids, board_ids=(), user=None):
+    """
+    Hide feedback `ids` now and queue their purge. Returns the DeletionJob.
+    Pass the items' `board_ids` unless the caller invalidates those boards itself.
+    """
+    ids = list(ids)
+    with transaction.atomic():
+        Feedback.objects.filter(pk__in=ids).update(deleted_at=timezone.now())
+        job = DeletionJob.objects.create(target=DeletionJob.FEEDBACK, target_ids=ids, total=len(ids),
+                                         requested_by=user)
+        notify_boards_changed(board_ids)
+        schedule(job)
+    return job
+
+
+def schedule(job, delay=0):
+    enqueue('deletion.run', {'job_id': job.pk}, key=f'deletion:{job.pk}', delay=delay)
+
+
+def _remaining_feedback(job):
+    if job.target == DeletionJob.BOARD:
+        return Feedback.all_objects.filter(board_id__in=job.target_ids)
+    return Feedback.all_objects.filter(pk__in=job.target_ids, deleted_at__isnull=False)
+
+
+def purge_chunk(job):
+    """
+    Delete one chunk of the job's feedback. Returns the number of items removed (0 when none are left).
+    """
+    remaining = _remaining_feedback(job).order_by('pk').values_list('pk', flat=True)
+    with transaction.atomic():
+        ids = list(remaining[:CHUNK_SIZE])
+        if ids:
+            _delete_with_children(Feedback, FEEDBACK_CHILDREN, ids)
+            DeletionJob.objects.filter(pk=job.pk).update(deleted=F('deleted') + len(ids), updated_at=timezone.now())
+            job.deleted += len(ids)
+    return len(ids)
+
+
+def finish(job):
+    with transaction.atomic():
+        if job.target == DeletionJob.BOARD:
+            ids = list(Board.all_objects.filter(pk__in=job.target_ids, deleted_at__isnull=False)
+                       .values_list('pk', flat=True))
+            if ids:
+                _delete_with_children(Board, BOARD_CHILDREN, ids)
+        job.status = DeletionJob.DONE
+        job.finished_at = timezone.now()
+        job.save(update_fields=['status', 'finished_at', 'updated_at'])
+
+
+def run(job, seconds=RUN_SECONDS):
+    """
+    Purge chunks until the job is done or `seconds` have passed. Returns True when done.
+    """
+    deadline = time.monotonic() + seconds
+    if job.status == DeletionJob.PENDING:
+        job.status = DeletionJob.RUNNING
+        job.save(update_fields=['status', 'updated_at'])
+    while time.monotonic() < deadline:
+        if not purge_chunk(job):
+            finish(job)
+            return True
+    return False
+
+
+@task('deletion.run')
+def run_task(payload):
+    job = DeletionJob.objects.filter(pk=payload['job_id']).first()
+    if job is None or job.status == DeletionJob.DONE:
+        return
+    try:
+        done = run(job)
+    except Exception:
+        # Shown in the progress API; the task queue retries the run with backoff.
+        DeletionJob.objects.filter(pk=job.pk).update(error=traceback.format_exc(), updated_at=timezone.now())
+        raise
+    if not done:
+        schedule(job)
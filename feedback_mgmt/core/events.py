@@ -0,0 +1,177 @@
+"""
+Realtime board events.
+
+Write paths call `publish_event()`, which hands a small delta (a moved card, a
+vote, a new comment, ...) to the broker once the transaction commits. The SSE
+view in views_events.py subscribes to one board and streams those deltas, so
+the kanban board no longer has to poll.
+
+Every board keeps a bounded ring buffer of its recent events. Event ids are
+increasing per board, and a client reconnecting with `Last-Event-ID` is
+replayed whatever it missed; if that is no longer in the buffer (or the id comes
+from an earlier broker lifetime) it gets a single `reset` event and should refetch.
+
+The default InProcessBroker only reaches subscribers in the same process, which
+is fine for a single ASGI node. A multi-node deployment sets
+settings.FEEDBACK_EVENT_BROKER to a class implementing the BaseBroker interface
+on top of a shared pub/sub.
+"""
+import asyncio
+import threading
+import time
+from collections import deque
+
+from django.conf import settings
+from django.db import transaction
+from django.utils.module_loading import import_string
+
+EVENT_BUFFER_SIZE = getattr(settings, 'FEEDBACK_EVENT_BUFFER_SIZE', 500)
+RESET = 'reset'
+
+
+class BaseBroker:
+    """
+    publish() is called synchronously from request threads after commit;
+    subscribe() is called on the event loop and returns an async iterator of events
+    for one board; with `heartbeat` set it yields None after that many idle seconds.
+    An event is a dict: {'id': int, 'type': str, 'board': int, 'data': dict}.
+    """
+
+    def publish(self, board_id, event_type, data):
+        raise NotImplementedError
+
+    def subscribe(self, board_id, last_event_id=None, heartbeat=None):
+        raise NotImplementedError
+
+
+class _Subscription:
+
+    def __init__(self, loop, maxsize):
+        self.loop = loop
+        self.queue = asyncio.Queue(maxsize=maxsize)
+
+    def deliver(self, event):
+        # Runs on the subscriber's loop. A consumer that fell a whole buffer
+        # behind is told to refetch instead of being fed an unbounded backlog.
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait({'id': event['id'], 'type': RESET, 'board': event['board'], 'data': {}})
+
+
+class _Channel:
+
+    def __init__(self, buffer_size):
+        self.buffer = deque(maxlen=buffer_size)
+        # Ids start from the clock so they keep increasing across restarts.
+        self.last_id = time.time_ns() // 1000
+        self.subscribers = set()
+
+
+class InProcessBroker(BaseBroker):
+
+    def __init__(self, buffer_size=EVENT_BUFFER_SIZE):
+        self.buffer_size = buffer_size
+        self.channels = {}
+        self.lock = threading.Lock()
+
+    def channel(self, board_id):
+        with self.lock:
+            channel = self.channels.get(board_id)
+            if channel is None:
+                channel = self.channels[board_id] = _Channel(self.buffer_size)
+            return channel
+
+    def publish(self, board_id, event_type, data):
+        channel = self.channel(board_id)
+        with self.lock:
+            channel.last_id += 1
+            event = {'id': channel.last_id, 'type': event_type, 'board': board_id, 'data': data}
+            channel.buffer.append(event)
+            subscribers = list(channel.subscribers)
+        for subscription in subscribers:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.deliver, event)
+            except RuntimeError:
+                # The subscriber's loop has closed; its generator cleans up on its own.
+                pass
+        return event
+
+    def replay(self, channel, last_event_id):
+        """
+        Buffered events after `last_event_id`, or None when the gap can't be filled.
+        """
+        if last_event_id is None:
+            return []
+        if last_event_id > channel.last_id:
+            return None
+        missed = [event for event in channel.buffer if event['id'] > last_event_id]
+        oldest = channel.buffer[0]['id'] if channel.buffer else channel.last_id + 1
+        if last_event_id < oldest - 1:
+            return None
+        return missed
+
+    def subscribe(self, board_id, last_event_id=None, heartbeat=None):
+        # Registers right away (not on first iteration) so nothing published
+        # between this call and the first read is lost.
+        channel = self.channel(board_id)
+        subscription = _Subscription(asyncio.get_running_loop(), self.buffer_size)
+        with self.lock:
+            channel.subscribers.add(subscription)
+            backlog = self.replay(channel, last_event_id)
+            last_sent = channel.last_id
+        if backlog is None:
+            backlog = [{'id': last_sent, 'type': RESET, 'board': board_id, 'data': {}}]
+        return self.listen(channel, subscription, backlog, last_sent, heartbeat)
+
+    async def listen(self, channel, subscription, backlog, last_sent, heartbeat):
+        try:
+            for event in backlog:
+                yield event
+            while True:
+                try:
+                    event = await asyncio.wait_for(subscription.queue.get(), heartbeat)
+                except asyncio.TimeoutError:
+                    yield None
+                    continue
+                # Anything published while the backlog was taken is already covered.
+                if event['id'] > last_sent or event['type'] == RESET:
+                    last_sent = event['id']
+                    yield event
+        finally:
+            with self.lock:
+                channel.subscribers.discard(subscription)
+
+
+_broker = None
+
+
+def get_broker():
+    """
+    The broker named by settings.FEEDBACK_EVENT_BROKER, or the in-process one.
+    """
+    global _broker
+    if _broker is None:
+        path = getattr(settings, 'FEEDBACK_EVENT_BROKER', None)
+        _broker = import_string(path)() if path else InProcessBroker()
+    return _broker
+
+
+def publish_event(board_id, event_type, data):
+    """
+    Publish an event for a board once the current transaction commits.
+    """
+    transaction.on_commit(lambda: get_broker().publish(board_id, event_type, data))
+
+
+def feedback_delta(feedback):
+    return {
+        'id': feedback.pk,
+        'title': feedback.title,
+        'status': feedback.status,
+        'feedback_type': feedback.feedback_type,
+        'upvote_count': feedback.upvote_count,
+        'comment_count': feedback.comment_count,
+    }
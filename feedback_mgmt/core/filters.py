@@ -1,11 +1,57 @@
 # core/filters.py
 
 import django_filters
+from django.db.models import Exists, OuterRef
+from rest_framework.filters import BaseFilterBackend, OrderingFilter
+
+from .access import scoped_board_ids
 from .models import Feedback
+from .ranking import ORDERINGS
+from .search import get_search_backend
+
+def tags_named(queryset, name, value):
+    """
+    `?tag_name=`: feedback with a tag whose name contains `value`. An EXISTS
+    rather than a join, so an item with several matching tags is listed once.
+    """
+    links = Feedback.tags.through.objects.filter(feedback_id=OuterRef('pk'), tag__name__icontains=value)
+    return queryset.filter(Exists(links))
+
 
 class FeedbackFilter(django_filters.FilterSet):
-    tag_name = django_filters.CharFilter(field_name='tags__name', lookup_expr='icontains')
+    tag_name = django_filters.CharFilter(method=tags_named)
 
     class Meta:
         model = Feedback
         fields = ['tags', 'tag_name', 'status', 'feedback_type', 'board']
+
+
+class FeedbackOrderingFilter(OrderingFilter):
+    """
+    OrderingFilter that also accepts the named rankings `?ordering=hot` and
+    `?ordering=trending`, sorted on their stored scores (see core.ranking).
+    """
+
+    def get_ordering(self, request, queryset, view):
+        param = request.query_params.get(self.ordering_param, '').strip()
+        if param in ORDERINGS:
+            return ORDERINGS[param]
+        return super().get_ordering(request, queryset, view)
+
+
+class FeedbackSearchFilter(BaseFilterBackend):
+    """
+    `?search=` over the precomputed search index (see core.search).
+    Results are ranked by relevance unless the request asks for an explicit ordering.
+    """
+    search_param = 'search'
+
+    def filter_queryset(self, request, queryset, view):
+        query = request.query_params.get(self.search_param, '')
+        if not query.strip():
+            return queryset
+
+        queryset = get_search_backend().filter_queryset(queryset, query, scoped_board_ids(request))
+        if 'search_rank' in queryset.query.annotations and not request.query_params.get('ordering'):
+            queryset = queryset.order_by('-search_rank', '-pk')
+        return queryset
@@ -0,0 +1,275 @@
+"""
+Request instrumentation.
+
+InstrumentationMiddleware wraps every database connection with an execute
+wrapper for the duration of a request (until the response is closed, for
+streamed bodies) and records, per view and method:
+wall time, query count, time spent in the database, time spent building
+serializer data (views with SerializerTimingMixin), time spent rendering the
+response and response size. Observations go into fixed-bucket histograms
+kept in process and exposed in Prometheus text format by views_metrics.py.
+
+Slow requests (settings.SLOW_REQUEST_MS, SLOW_REQUEST_QUERIES) are logged
+with their most repeated SQL statements, which is usually enough to spot an
+N+1. The per-query cost is a counter increment and two clock reads.
+"""
+import logging
+import threading
+import time
+from bisect import bisect_left
+from collections import Counter
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+from django.utils.deprecation import MiddlewareMixin
+
+logger = logging.getLogger(__name__)
+
+SLOW_REQUEST_MS = getattr(settings, 'SLOW_REQUEST_MS', 500)
+SLOW_REQUEST_QUERIES = getattr(settings, 'SLOW_REQUEST_QUERIES', 50)
+TOP_DUPLICATES = 3
+
+SECONDS_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89, 144)
+BYTES_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+
+class Histogram:
+    """
+    Cumulative-bucket histogram, Prometheus style, with approximate percentiles.
+    """
+
+    def __init__(self, buckets):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def percentile(self, q):
+        """
+        Upper bound of the bucket holding the q-th quantile (0 < q <= 1).
+        """
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return float('inf')
+
+    def cumulative(self):
+        total = 0
+        for bound, count in zip(self.buckets + (float('inf'),), self.counts):
+            total += count
+            yield bound, total
+
+
+class MetricsRegistry:
+
+    metrics = {
+        'http_request_duration_seconds': ('Wall time of the request.', SECONDS_BUCKETS),
+        'http_request_db_seconds': ('Time spent in database queries.', SECONDS_BUCKETS),
+        'http_request_db_queries': ('Database queries per request.', QUERY_BUCKETS),
+        'http_request_serialize_seconds': ('Time spent in serializer.data, including queries it triggers.',
+                                           SECONDS_BUCKETS),
+        'http_request_render_seconds': ('Time spent rendering the response body.', SECONDS_BUCKETS),
+        'http_response_size_bytes': ('Size of the response body.', BYTES_BUCKETS),
+    }
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self.histograms = {}
+        self.requests = Counter()
+
+    def observe(self, view, method, status, values):
+        labels = (view, method)
+        with self.lock:
+            self.requests[labels + (f'{status // 100}xx',)] += 1
+            for name, value in values.items():
+                if value is None:
+                    continue
+                histogram = self.histograms.get((name, labels))
+                if histogram is None:
+                    histogram = self.histograms[(name, labels)] = Histogram(self.metrics[name][1])
+                histogram.observe(value)
+
+    def get(self, name, view, method):
+        return self.histograms.get((name, (view, method)))
+
+    def render(self):
+        """
+        The registry in Prometheus text exposition format.
+        """
+        lines = [
+            '# HELP http_requests_total Requests by view, method and status class.',
+            '# TYPE http_requests_total counter',
+        ]
+        with self.lock:
+            for (view, method, status), count in sorted(self.requests.items()):
+                lines.append(f'http_requests_total{{view="{view}",method="{method}",status="{status}"}} {count}')
+            for name, (help_text, _) in self.metrics.items():
+                lines.append(f'# HELP {name} {help_text}')
+                lines.append(f'# TYPE {name} histogram')
+                for (metric, (view, method)), histogram in sorted(self.histograms.items()):
+                    if metric != name:
+                        continue
+                    labels = f'view="{view}",method="{method}"'
+                    for bound, total in histogram.cumulative():
+                        le = '+Inf' if bound == float('inf') else repr(bound)
+                        lines.append(f'{name}_bucket{{{labels},le="{le}"}} {total}')
+                    lines.append(f'{name}_sum{{{labels}}} {histogram.sum}')
+                    lines.append(f'{name}_count{{{labels}}} {histogram.count}')
+        return '\n'.join(lines) + '\n'
+
+
+registry = MetricsRegistry()
+
+
+class QueryRecorder:
+    """
+    connection.execute_wrapper() hook counting queries, their time and repeated SQL.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.statements = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - start
+            self.count += 1
+            self.statements[sql] += 1
+
+    def duplicates(self, limit=TOP_DUPLICATES):
+        return [(sql, count) for sql, count in self.statements.most_common(limit) if count > 1]
+
+
+def view_label(request):
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        return 'unresolved'
+    return match.view_name or match.route
+
+
+class TimedSerializer:
+    """
+    Stands in for a serializer and adds the time its `.data` takes to the
+    request's serialize metric. Everything else goes to the wrapped serializer.
+    """
+
+    def __init__(self, serializer, request):
+        self._serializer = serializer
+        self._request = request
+
+    def __getattr__(self, name):
+        return getattr(self._serializer, name)
+
+    @property
+    def data(self):
+        started = time.perf_counter()
+        try:
+            return self._serializer.data
+        finally:
+            request = self._request
+            if hasattr(request, '_serialize_seconds'):
+                request._serialize_seconds = (request._serialize_seconds or 0) + time.perf_counter() - started
+
+
+class SerializerTimingMixin:
+    """
+    Generic-view mixin: serializers from get_serializer() (including the list
+    serializer of many=True) add the time their `.data` takes to the request's
+    serialize metric.
+    """
+
+    def get_serializer(self, *args, **kwargs):
+        serializer = super().get_serializer(*args, **kwargs)
+        return TimedSerializer(serializer, getattr(self.request, '_request', self.request))
+
+
+class InstrumentationMiddleware(MiddlewareMixin):
+
+    def process_request(self, request):
+        request._query_recorder = recorder = QueryRecorder()
+        request._serialize_seconds = None
+        request._render_seconds = None
+        request._instrumentation = stack = ExitStack()
+        for alias in connections:
+            stack.enter_context(connections[alias].execute_wrapper(recorder))
+        request._started = time.perf_counter()
+
+    def process_response(self, request, response):
+        stack = getattr(request, '_instrumentation', None)
+        if stack is None:
+            return response
+        if not response.streaming:
+            self.finish(request, response)
+            return response
+
+        # Streamed bodies (exports, event streams) keep querying after this point;
+        # record them once the server closes the response.
+        close = response.close
+
+        def closed():
+            try:
+                self.finish(request, response)
+            finally:
+                close()
+
+        response.close = closed
+        return response
+
+    def finish(self, request, response):
+        stack, request._instrumentation = request._instrumentation, None
+        if stack is None:
+            # Already recorded; servers may close a response more than once.
+            return
+        stack.close()
+        duration = time.perf_counter() - request._started
+        recorder = request._query_recorder
+
+        size = None if response.streaming else len(response.content)
+        label = view_label(request)
+        registry.observe(label, request.method, response.status_code, {
+            'http_request_duration_seconds': duration,
+            'http_request_db_seconds': recorder.duration,
+            'http_request_db_queries': recorder.count,
+            'http_request_serialize_seconds': request._serialize_seconds,
+            'http_request_render_seconds': request._render_seconds,
+            'http_response_size_bytes': size,
+        })
+
+        if duration * 1000 >= SLOW_REQUEST_MS or recorder.count >= SLOW_REQUEST_QUERIES:
+            logger.warning(
+                'Slow request %s %s (%s): %.0f ms, %d queries in %.0f ms, serialize %.0f ms, '
+                'render %.0f ms. Most repeated: %s',
+                request.method, request.path, label, duration * 1000, recorder.count,
+                recorder.duration * 1000, (request._serialize_seconds or 0) * 1000,
+                (request._render_seconds or 0) * 1000,
+                '; '.join(f'{count}x {sql[:200]}' for sql, count in recorder.duplicates()) or 'none',
+            )
+
+    def process_template_response(self, request, response):
+        # DRF responses render after the view returns; time that step on its own.
+        started = time.perf_counter()
+
+        def rendered(response):
+            request._render_seconds = time.perf_counter() - started
+
+        response.add_post_render_callback(rendered)
+        return response
@@ -0,0 +1,123 @@
+"""
+Kanban columns for a board in one query.
+
+Every status column gets its first `per_column` items and its total count
+from a single statement: ROW_NUMBER() and COUNT(*) windows partitioned by
+status, filtered on the row number. Backends without window functions fall
+back to one query per column plus one grouped count.
+
+Each column carries a keyset cursor (see core.pagination) for fetching the
+rest of that column alone, issued under the same ordering as the board view.
+"""
+from django.db import connections
+from django.db.models import Count, F, Window
+from django.db.models.functions import RowNumber
+from rest_framework.exceptions import ValidationError
+from rest_framework.utils.urls import replace_query_param
+
+from .models import Feedback
+from .pagination import KeysetPagination
+from .ranking import ORDERINGS
+
+DEFAULT_PER_COLUMN = 20
+MAX_PER_COLUMN = 100
+DEFAULT_ORDERING = ['-upvote_count']
+ORDERING_FIELDS = {'created_at', 'updated_at', 'upvote_count', 'comment_count', 'title'}
+COLUMNS = Feedback.STATUS_CHOICES
+
+
+class ColumnPagination(KeysetPagination):
+    page_size = DEFAULT_PER_COLUMN
+    page_size_query_param = 'per_column'
+    max_page_size = MAX_PER_COLUMN
+
+
+def column_ordering(param):
+    """
+    The field ordering for `?ordering=`: a named ranking (hot, trending), one of
+    ORDERING_FIELDS with an optional '-', or DEFAULT_ORDERING.
+    """
+    param = (param or '').strip()
+    if param in ORDERINGS:
+        return list(ORDERINGS[param])
+    if param.lstrip('-') in ORDERING_FIELDS:
+        return [param]
+    return list(DEFAULT_ORDERING)
+
+
+def _order_expressions(ordering):
+    return [F(field[1:]).desc() if field.startswith('-') else F(field).asc() for field in ordering]
+
+
+def column_heads(queryset, ordering, per_column):
+    """
+    {status: (items, total)} for every column, items ordered by `ordering`.
+    """
+    columns = {key: ([], 0) for key, _ in COLUMNS}
+
+    if connections[queryset.db].features.supports_over_clause:
+        rows = queryset.annotate(
+            column_rank=Window(RowNumber(), partition_by=[F('status')], order_by=_order_expressions(ordering)),
+            column_total=Window(Count('pk'), partition_by=[F('status')]),
+        ).filter(column_rank__lte=per_column).order_by('status', 'column_rank')
+        for item in rows:
+            items, _ = columns.get(item.status, ([], 0))
+            items.append(item)
+            columns[item.status] = (items, item.column_total)
+        return columns
+
+    totals = dict(queryset.order_by().values_list('status').annotate(n=Count('pk')))
+    for key, _ in COLUMNS:
+        items = list(queryset.filter(status=key).order_by(*ordering)[:per_column]) if totals.get(key) else []
+        columns[key] = (items, totals.get(key, 0))
+    return columns
+
+
+class KanbanBoard:
+    """
+    Builds the board view or one column page for `request`; `serialize(items)`
+    turns a list of Feedback into response data.
+    """
+
+    def __init__(self, request, queryset, serialize):
+        self.request = request
+        self.queryset = queryset
+        self.serialize = serialize
+        self.paginator = ColumnPagination()
+        self.per_column = self.paginator.get_page_size(request)
+        # KeysetPagination appends the pk tiebreaker and checks cursors against this exact list.
+        self.ordering = self.paginator.get_ordering(
+            Feedback.objects.order_by(*column_ordering(request.query_params.get('ordering')))
+        )
+
+    def columns(self):
+        heads = column_heads(self.queryset, self.ordering, self.per_column)
+        return {
+            'columns': [
+                {
+                    'status': key,
+                    'title': title,
+                    'count': heads[key][1],
+                    'results': self.serialize(heads[key][0]),
+                    'next': self.next_link(key, heads[key][0], heads[key][1]),
+                }
+                for key, title in COLUMNS
+            ],
+        }
+
+    def next_link(self, status, items, total):
+        if len(items) >= total:
+            return None
+        self.paginator.ordering = self.ordering
+        self.paginator.base_url = replace_query_param(self.request.build_absolute_uri(), 'status', status)
+        return self.paginator.encode_cursor(items[-1])
+
+    def column_page(self, status):
+        """
+        The next page of one column, as a keyset-paginated response.
+        """
+        if status not in dict(COLUMNS):
+            raise ValidationError({'status': 'Invalid status.'})
+        queryset = self.queryset.filter(status=status).order_by(*self.ordering)
+        page = self.paginator.paginate_queryset(queryset, self.request)
+        return self.paginator.get_paginated_response(self.serialize(page))
@@ -0,0 +1,52 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from core.benchmarks import (
+    DEFAULT_ITERATIONS, DEFAULT_TOLERANCE, DEFAULT_WARMUP, compare, load_baseline, run_benchmarks, save_baseline,
+)
+from core.models import User
+
+
+class Command(BaseCommand):
+    help = "Benchmark the API in-process (latency percentiles and query counts), optionally against a baseline."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', help="Username to run as (defaults to the first admin).")
+        parser.add_argument('--iterations', type=int, default=DEFAULT_ITERATIONS)
+        parser.add_argument('--warmup', type=int, default=DEFAULT_WARMUP)
+        parser.add_argument('--scenario', action='append', dest='scenarios',
+                            help="Only run this scenario (repeatable).")
+        parser.add_argument('--warm', action='store_true',
+                            help="Keep caches between requests instead of measuring cold database reads.")
+        parser.add_argument('--baseline', help="Baseline JSON to compare against; regressions fail the command.")
+        parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                            help="Allowed p95 growth over the baseline, as a fraction.")
+        parser.add_argument('--save-baseline', help="Write the results to this path.")
+
+    def handle(self, *args, **options):
+        users = User.objects.filter(username=options['user']) if options['user'] \
+            else User.objects.filter(role=User.ADMIN).order_by('pk')
+        user = users.first()
+        if user is None:
+            raise CommandError("No user to run as; pass --user or run seed_synthetic first.")
+
+        try:
+            results = run_benchmarks(user, iterations=options['iterations'], warmup=options['warmup'],
+                                     only=options['scenarios'], cold=not options['warm'])
+        except (ValueError, RuntimeError) as exc:
+            raise CommandError(str(exc))
+
+        self.stdout.write(f"{'scenario':<26}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'queries':>9}")
+        for name, stats in results.items():
+            self.stdout.write(
+                f"{name:<26}{stats['p50_ms']:>10.2f}{stats['p95_ms']:>10.2f}{stats['p99_ms']:>10.2f}{stats['queries']:>9}"
+            )
+
+        if options['save_baseline']:
+            save_baseline(options['save_baseline'], results)
+            self.stdout.write(f"Baseline written to {options['save_baseline']}")
+
+        if options['baseline']:
+            regressions = compare(results, load_baseline(options['baseline']), options['tolerance'])
+            if regressions:
+                raise CommandError('Regressions against baseline:\n' + '\n'.join(regressions))
+            self.stdout.write(self.style.SUCCESS('No regressions against baseline.'))
@@ -0,0 +1,44 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from core.benchmarks import DEFAULT_CONCURRENCY, DEFAULT_REQUESTS, DEFAULT_WORKERS, run_concurrency
+from core.models import User
+
+
+class Command(BaseCommand):
+    help = "Compare throughput of the sync (thread-per-request) and async read paths at a fixed worker count."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', help="Username to run as (defaults to the first admin).")
+        parser.add_argument('--requests', type=int, default=DEFAULT_REQUESTS, help="Requests per scenario and path.")
+        parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS,
+                            help="Worker threads serving the sync path.")
+        parser.add_argument('--concurrency', type=int, default=DEFAULT_CONCURRENCY,
+                            help="Requests in flight at once on the async path's event loop.")
+        parser.add_argument('--scenario', action='append', dest='scenarios',
+                            help="Only run this GET scenario (repeatable).")
+        parser.add_argument('--db-latency', type=float, default=0,
+                            help="Milliseconds of wait added to every query, to mimic a remote database.")
+        parser.add_argument('--warm', action='store_true',
+                            help="Keep the configured caches instead of measuring cold database reads.")
+
+    def handle(self, *args, **options):
+        users = User.objects.filter(username=options['user']) if options['user'] \
+            else User.objects.filter(role=User.ADMIN).order_by('pk')
+        user = users.first()
+        if user is None:
+            raise CommandError("No user to run as; pass --user or run seed_synthetic first.")
+
+        try:
+            results = run_concurrency(user, requests=options['requests'], workers=options['workers'],
+                                      concurrency=options['concurrency'], only=options['scenarios'],
+                                      latency_ms=options['db_latency'], cold=not options['warm'])
+        except (ValueError, RuntimeError) as exc:
+            raise CommandError(str(exc))
+
+        self.stdout.write(f"{'scenario':<20}{'path':<7}{'req/s':>9}{'p50 ms':>10}{'p95 ms':>10}{'in flight':>11}")
+        for name, paths in results.items():
+            for label, stats in paths.items():
+                self.stdout.write(
+                    f"{name:<20}{label:<7}{stats['rps']:>9.1f}{stats['p50_ms']:>10.2f}{stats['p95_ms']:>10.2f}"
+                    f"{stats['max_in_flight']:>11}"
+                )
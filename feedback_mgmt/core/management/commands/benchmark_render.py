@@ -0,0 +1,40 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from core.benchmarks import DEFAULT_ITERATIONS, RENDER_PAGE_SIZES, run_render_benchmark
+from core.compression import available_encodings
+from core.models import User
+
+
+class Command(BaseCommand):
+    help = "Time JSON rendering of /api/feedback/ pages and report their size on the wire per encoding."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', help="Username to run as (defaults to the first admin).")
+        parser.add_argument('--iterations', type=int, default=DEFAULT_ITERATIONS)
+        parser.add_argument('--page-size', type=int, action='append', dest='page_sizes',
+                            help="Page size to render (repeatable; defaults to 10, 50 and 100).")
+
+    def handle(self, *args, **options):
+        users = User.objects.filter(username=options['user']) if options['user'] \
+            else User.objects.filter(role=User.ADMIN).order_by('pk')
+        user = users.first()
+        if user is None:
+            raise CommandError("No user to run as; pass --user or run seed_synthetic first.")
+
+        try:
+            results = run_render_benchmark(user, page_sizes=options['page_sizes'] or RENDER_PAGE_SIZES,
+                                           iterations=options['iterations'])
+        except (ValueError, RuntimeError) as exc:
+            raise CommandError(str(exc))
+
+        encodings = available_encodings()
+        header = f"{'page':>6}{'items':>7}{'drf ms':>9}{'fast ms':>9}{'bytes':>9}"
+        for encoding in encodings:
+            header += f"{encoding + ' bytes':>12}{encoding + ' ms':>9}"
+        self.stdout.write(header)
+        for page_size, stats in results.items():
+            line = (f"{page_size:>6}{stats['items']:>7}{stats['drf_ms']:>9.3f}{stats['fast_ms']:>9.3f}"
+                    f"{stats['bytes']:>9}")
+            for encoding in encodings:
+                line += f"{stats[f'{encoding}_bytes']:>12}{stats[f'{encoding}_ms']:>9.3f}"
+            self.stdout.write(line)
@@ -0,0 +1,40 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from core.models import User
+from core.query_plans import check_plans
+
+
+class Command(BaseCommand):
+    help = "EXPLAIN each endpoint's main query and fail if a large table is read with a sequential scan."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', help="Username to run as (defaults to the first admin).")
+        parser.add_argument('--scenario', action='append', dest='scenarios',
+                            help="Only check this scenario (repeatable).")
+        parser.add_argument('--show-plans', action='store_true', help="Print every plan, not only failing ones.")
+
+    def handle(self, *args, **options):
+        users = User.objects.filter(username=options['user']) if options['user'] \
+            else User.objects.filter(role=User.ADMIN).order_by('pk')
+        user = users.first()
+        if user is None:
+            raise CommandError("No user to run as; pass --user or run seed_synthetic first.")
+
+        try:
+            checks = check_plans(user, only=options['scenarios'])
+        except (ValueError, RuntimeError, NotImplementedError) as exc:
+            raise CommandError(str(exc))
+
+        failures = []
+        for check in checks:
+            status = 'ok' if check.ok else 'SEQ SCAN ' + ', '.join(check.seq_scans)
+            self.stdout.write(f"{check.scenario:<26}{check.table:<24}{status}")
+            if options['show_plans'] or not check.ok:
+                for line in check.plan:
+                    self.stdout.write(f"    {line}")
+            if not check.ok:
+                failures.append(f"{check.scenario}: {', '.join(check.seq_scans)}")
+
+        if failures:
+            raise CommandError('Sequential scans on large tables:\n' + '\n'.join(failures))
+        self.stdout.write(self.style.SUCCESS(f"{len(checks)} query plans use indexes."))
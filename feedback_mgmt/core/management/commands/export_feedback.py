@@ -0,0 +1,28 @@
+import sys
+
+from django.core.management.base import BaseCommand
+
+from core.models import Feedback
+from core.transfer import DEFAULT_BATCH_SIZE, EXPORT_FORMATS, export_rows, render_export
+
+
+class Command(BaseCommand):
+    help = "Stream feedback (with tags, voters and comments) to NDJSON, CSV or a JSON array."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--board', type=int, action='append', help="Board id (repeatable). Defaults to all boards.")
+        parser.add_argument('--format', choices=EXPORT_FORMATS, default='ndjson')
+        parser.add_argument('--output', help="File to write. Defaults to stdout.")
+        parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        queryset = Feedback.objects.all()
+        if options['board']:
+            queryset = queryset.filter(board_id__in=options['board'])
+
+        chunks = render_export(export_rows(queryset, options['batch_size']), options['format'])
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8', newline='') as out:
+                out.writelines(chunks)
+        else:
+            sys.stdout.writelines(chunks)
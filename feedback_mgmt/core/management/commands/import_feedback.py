@@ -0,0 +1,40 @@
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.models import User
+from core.transfer import DEFAULT_BATCH_SIZE, FORMATS, FeedbackImporter, read_rows
+
+
+class Command(BaseCommand):
+    help = "Import feedback (with tags, votes and comments) from an NDJSON or CSV file."
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="File to import ('-' for stdin).")
+        parser.add_argument('--format', choices=FORMATS, help="Defaults to the file extension, else ndjson.")
+        parser.add_argument('--user', help="Username to attribute rows without created_by to.")
+        parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        path = options['path']
+        fmt = options['format'] or ('csv' if path.endswith('.csv') else 'ndjson')
+
+        default_user = None
+        if options['user']:
+            try:
+                default_user = User.objects.get(username=options['user'])
+            except User.DoesNotExist:
+                raise CommandError(f"User {options['user']!r} not found")
+
+        importer = FeedbackImporter(default_user=default_user, batch_size=options['batch_size'])
+        if path == '-':
+            report = importer.run(read_rows(sys.stdin.buffer, fmt))
+        else:
+            with open(path, 'rb') as stream:
+                report = importer.run(read_rows(stream, fmt))
+
+        for error in report['errors']:
+            self.stderr.write(f"line {error['line']}: {error['errors']}")
+        self.stdout.write(self.style.SUCCESS(
+            f"Imported {report['created']} feedback items ({len(report['errors'])} rows rejected)"
+        ))
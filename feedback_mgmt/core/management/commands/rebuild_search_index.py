@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+
+from core.models import Feedback
+from core.search import get_search_backend
+
+
+class Command(BaseCommand):
+    help = "Rebuild the feedback search index (SearchTerm postings)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--board', type=int, help="Only reindex feedback on this board id.")
+        parser.add_argument('--batch-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        queryset = Feedback.objects.order_by('pk')
+        if options['board']:
+            queryset = queryset.filter(board_id=options['board'])
+
+        backend = get_search_backend()
+        batch_size = options['batch_size']
+        total = 0
+        last_pk = 0
+        while True:
+            ids = list(queryset.filter(pk__gt=last_pk).values_list('pk', flat=True)[:batch_size])
+            if not ids:
+                break
+            backend.index(ids)
+            total += len(ids)
+            last_pk = ids[-1]
+
+        self.stdout.write(self.style.SUCCESS(f"Reindexed {total} feedback items"))
@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+
+from core.models import Feedback
+from core.similarity import index_feedback
+
+
+class Command(BaseCommand):
+    help = "Rebuild the near-duplicate index (SimilarityBand rows)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--board', type=int, help="Only reindex feedback on this board id.")
+        parser.add_argument('--batch-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        queryset = Feedback.objects.order_by('pk').only('id', 'board_id', 'title', 'description')
+        if options['board']:
+            queryset = queryset.filter(board_id=options['board'])
+
+        batch_size = options['batch_size']
+        total = 0
+        last_pk = 0
+        while True:
+            items = list(queryset.filter(pk__gt=last_pk)[:batch_size])
+            if not items:
+                break
+            index_feedback(items)
+            total += len(items)
+            last_pk = items[-1].pk
+
+        self.stdout.write(self.style.SUCCESS(f"Reindexed {total} feedback items"))
@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+
+from core.models import Feedback
+from core.ranking import REFRESH_SECONDS, recompute_scores, schedule_refresh
+
+
+class Command(BaseCommand):
+    help = "Recompute feedback hot/trending scores, applying time decay."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--board', type=int, help="Only rescore feedback on this board id.")
+        parser.add_argument(
+            '--schedule', action='store_true',
+            help=f"Instead of running now, have the task worker run it every {REFRESH_SECONDS}s.",
+        )
+
+    def handle(self, *args, **options):
+        if options['schedule']:
+            schedule_refresh()
+            self.stdout.write(self.style.SUCCESS("Ranking refresh scheduled"))
+            return
+
+        queryset = Feedback.objects.all()
+        if options['board']:
+            queryset = queryset.filter(board_id=options['board'])
+        updated = recompute_scores(queryset)
+        self.stdout.write(self.style.SUCCESS(f"Rescored {updated} feedback items"))
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from core.counters import reconcile_comment_counts
+from core.models import Feedback
+from core.votes import reconcile_upvote_counts
+
+
+class Command(BaseCommand):
+    help = "Recompute denormalized feedback counters (upvote_count, comment_count) from their source tables."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--board', type=int, help="Only reconcile feedback on this board id.")
+
+    def handle(self, *args, **options):
+        queryset = Feedback.objects.all()
+        if options['board']:
+            queryset = queryset.filter(board_id=options['board'])
+
+        fixed = reconcile_upvote_counts(queryset)
+        self.stdout.write(self.style.SUCCESS(f"upvote_count: fixed {fixed} feedback rows"))
+        fixed = reconcile_comment_counts(queryset)
+        self.stdout.write(self.style.SUCCESS(f"comment_count: fixed {fixed} feedback rows"))
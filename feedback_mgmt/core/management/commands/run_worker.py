@@ -0,0 +1,76 @@
+import logging
+import multiprocessing
+import signal
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections, connections
+
+from core.tasks import work
+
+logger = logging.getLogger('core.tasks')
+
+
+def worker_loop(stop, batch_size, poll_interval):
+    # Connections inherited from the parent must not be shared across processes.
+    connections.close_all()
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    while not stop.is_set():
+        try:
+            ran = work(limit=batch_size)
+        except Exception:
+            logger.exception('Task worker round failed')
+            close_old_connections()
+            ran = 0
+        if not ran:
+            stop.wait(poll_interval)
+
+
+class Command(BaseCommand):
+    help = "Run queued background tasks with a pool of worker processes."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--processes', type=int, default=2)
+        parser.add_argument('--batch-size', type=int, default=10, help="Tasks claimed per polling round.")
+        parser.add_argument('--poll-interval', type=float, default=1.0, help="Seconds to sleep when the queue is empty.")
+        parser.add_argument('--once', action='store_true', help="Run due tasks in this process until none are left, then exit.")
+
+    def handle(self, *args, **options):
+        if options['once']:
+            total = 0
+            while ran := work(limit=options['batch_size']):
+                total += ran
+            self.stdout.write(self.style.SUCCESS(f"Ran {total} tasks"))
+            return
+
+        context = multiprocessing.get_context('fork')
+        stop = context.Event()
+        args = (stop, options['batch_size'], options['poll_interval'])
+        connections.close_all()
+        pool = [context.Process(target=worker_loop, args=args, daemon=True) for _ in range(options['processes'])]
+        for process in pool:
+            process.start()
+
+        # Setting the shared Event from a signal handler can deadlock with a
+        # wait() on it in progress, so the parent watches a plain flag instead.
+        stopping = []
+
+        def shutdown(signum, frame):
+            stopping.append(signum)
+
+        signal.signal(signal.SIGINT, shutdown)
+        signal.signal(signal.SIGTERM, shutdown)
+        self.stdout.write(f"Started {len(pool)} task workers")
+
+        while not stopping:
+            time.sleep(1)
+            for index, process in enumerate(pool):
+                if not process.is_alive() and not stopping:
+                    logger.warning('Task worker %s exited with %s; restarting', process.pid, process.exitcode)
+                    pool[index] = context.Process(target=worker_loop, args=args, daemon=True)
+                    pool[index].start()
+
+        stop.set()
+        for process in pool:
+            process.join(timeout=30)
+        self.stdout.write("Task workers stopped")
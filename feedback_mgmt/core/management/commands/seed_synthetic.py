@@ -0,0 +1,46 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from core.models import User
+from core.synthetic import PASSWORD, SyntheticDataGenerator
+
+
+class Command(BaseCommand):
+    help = "Fill the database with skewed synthetic boards, users, feedback, votes, tags and comments."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--boards', type=int, default=20)
+        parser.add_argument('--users', type=int, default=500)
+        parser.add_argument('--feedback', type=int, default=10000)
+        parser.add_argument('--tags', type=int, default=50)
+        parser.add_argument('--comments', type=float, default=2.0, help="Mean comments per feedback item.")
+        parser.add_argument('--votes', type=float, default=20.0, help="Mean votes per feedback item.")
+        parser.add_argument('--exponent', type=float, default=1.1, help="Zipf exponent for popularity skew.")
+        parser.add_argument('--private-ratio', type=float, default=0.2)
+        parser.add_argument('--prefix', default='syn', help="Prefix for generated usernames, boards and tags.")
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--batch-size', type=int, default=2000)
+        parser.add_argument('--no-index', action='store_true', help="Skip building the search index.")
+
+    def handle(self, *args, **options):
+        prefix = options['prefix']
+        if User.objects.filter(username__startswith=f'{prefix}_user_').exists():
+            raise CommandError(f"Synthetic data with prefix {prefix!r} already exists; pass another --prefix.")
+
+        generator = SyntheticDataGenerator(
+            boards=options['boards'],
+            users=options['users'],
+            feedback=options['feedback'],
+            tags=options['tags'],
+            comments=options['comments'],
+            votes=options['votes'],
+            exponent=options['exponent'],
+            private_ratio=options['private_ratio'],
+            prefix=prefix,
+            seed=options['seed'],
+            batch_size=options['batch_size'],
+        )
+        counts = generator.run(index=not options['no_index'], log=self.stdout.write)
+        self.stdout.write(self.style.SUCCESS(
+            f"Created {counts['feedback']} feedback items on {counts['boards']} boards for {counts['users']} users "
+            f"(password {PASSWORD!r}, admin {prefix}_user_0)"
+        ))
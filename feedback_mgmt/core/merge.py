@@ -0,0 +1,57 @@
+from django.db import transaction
+from django.db.models import Min
+
+from .counters import reconcile_comment_counts
+from .deletion import soft_delete_feedback
+from .events import publish_event
+from .models import Comment, Feedback, Vote
+from .ranking import recompute_scores
+from .search import reindex_feedback
+from .signals import notify_boards_changed
+from .votes import reconcile_upvote_counts
+
+
+def merge_feedback(canonical, duplicate_ids, user=None):
+    """
+    Fold duplicates of `canonical` into it and soft-delete them (core.deletion,
+    on behalf of `user`): their comments move over, their tags are added, and
+    each voter keeps one vote on the canonical item (the earliest, so vote age
+    is preserved for trending).
+
+    Every step is a set-based statement, whatever the number of duplicates.
+    Returns the ids that were merged; ids not on the canonical item's board are ignored.
+    """
+    duplicate_ids = list(
+        Feedback.objects.filter(pk__in=duplicate_ids, board_id=canonical.board_id)
+        .exclude(pk=canonical.pk).values_list('pk', flat=True)
+    )
+    if not duplicate_ids:
+        return []
+
+    Link = Feedback.tags.through
+    this = Feedback.objects.filter(pk=canonical.pk)
+    with transaction.atomic():
+        moved_votes = Vote.objects.filter(feedback_id__in=duplicate_ids) \
+            .exclude(user_id__in=Vote.objects.filter(feedback_id=canonical.pk).values('user_id')) \
+            .order_by().values('user_id').annotate(first=Min('pk')).values_list('first', flat=True)
+        Vote.objects.filter(pk__in=list(moved_votes)).update(feedback_id=canonical.pk)
+
+        Comment.objects.filter(feedback_id__in=duplicate_ids).update(feedback_id=canonical.pk)
+
+        tag_ids = set(Link.objects.filter(feedback_id__in=duplicate_ids).values_list('tag_id', flat=True))
+        Link.objects.bulk_create(
+            [Link(feedback_id=canonical.pk, tag_id=tag_id) for tag_id in tag_ids],
+            ignore_conflicts=True,
+        )
+
+        # Votes left behind belong to users already counted on the canonical item;
+        # the purge job removes them with the duplicates.
+        soft_delete_feedback(duplicate_ids, user=user)
+
+        reconcile_upvote_counts(this)
+        reconcile_comment_counts(this)
+        recompute_scores(this)
+        reindex_feedback([canonical.pk])
+        notify_boards_changed([canonical.board_id])
+        publish_event(canonical.board_id, 'feedback.merged', {'id': canonical.pk, 'merged': duplicate_ids})
+    return duplicate_ids
@@ -0,0 +1,64 @@
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def copy_upvotes_to_votes(apps, schema_editor):
+    Feedback = apps.get_model('core', 'Feedback')
+    Vote = apps.get_model('core', 'Vote')
+    OldUpvote = Feedback.upvotes.through
+    db = schema_editor.connection.alias
+
+    batch = []
+    for row in OldUpvote.objects.using(db).values('feedback_id', 'user_id').iterator(chunk_size=2000):
+        batch.append(Vote(feedback_id=row['feedback_id'], user_id=row['user_id']))
+        if len(batch) >= 2000:
+            Vote.objects.using(db).bulk_create(batch, ignore_conflicts=True)
+            batch = []
+    if batch:
+        Vote.objects.using(db).bulk_create(batch, ignore_conflicts=True)
+
+    counts = Vote.objects.using(db).filter(feedback=OuterRef('pk')) \
+        .order_by().values('feedback').annotate(n=Count('pk')).values('n')
+    Feedback.objects.using(db).update(upvote_count=Coalesce(Subquery(counts), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='feedback',
+            name='upvote_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.CreateModel(
+            name='Vote',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('feedback', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='votes', to='core.feedback')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='votes', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('feedback', 'user'), name='unique_vote_per_user')],
+            },
+        ),
+        migrations.RunPython(copy_upvotes_to_votes, migrations.RunPython.noop),
+        # Django cannot alter an M2M to add `through`, so drop the auto table and
+        # re-add the field on top of the Vote table created above.
+        migrations.RemoveField(
+            model_name='feedback',
+            name='upvotes',
+        ),
+        migrations.AddField(
+            model_name='feedback',
+            name='upvotes',
+            field=models.ManyToManyField(blank=True, related_name='upvoted_feedbacks', through='core.Vote', to=settings.AUTH_USER_MODEL),
+        ),
+    ]
@@ -0,0 +1,103 @@
+# Generated by Django 5.2.4 on 2026-10-17 22:18
+
+import re
+import unicodedata
+from collections import Counter
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+# Frozen copy of core.search's tokenizer and weights as of this migration, so
+# later changes to the live module can't change what the backfill writes.
+TITLE_WEIGHT = 8
+TAG_WEIGHT = 4
+DESCRIPTION_WEIGHT = 2
+MAX_TERM_FREQUENCY = 3
+MIN_TERM_LENGTH = 2
+MAX_TERM_LENGTH = 64
+
+STOP_WORDS = frozenset("""
+    a an and are as at be but by for from has have i if in into is it its of on or
+    so that the their this to was we were what when which will with you your
+""".split())
+
+_WORD_RE = re.compile(r'[a-z0-9]+')
+
+
+def tokenize(text):
+    if not text:
+        return []
+    text = unicodedata.normalize('NFKD', text).encode('ascii', 'ignore').decode('ascii').lower()
+    return [
+        word[:MAX_TERM_LENGTH] for word in _WORD_RE.findall(text)
+        if len(word) >= MIN_TERM_LENGTH and word not in STOP_WORDS
+    ]
+
+
+def document_terms(title, description, tag_names):
+    weights = Counter()
+    fields = [(title, TITLE_WEIGHT), (description, DESCRIPTION_WEIGHT)]
+    fields += [(name, TAG_WEIGHT) for name in tag_names]
+    for text, weight in fields:
+        for term, frequency in Counter(tokenize(text)).items():
+            weights[term] += weight * min(frequency, MAX_TERM_FREQUENCY)
+    return weights
+
+
+def create_trigram_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    schema_editor.execute(
+        'CREATE INDEX IF NOT EXISTS searchterm_term_trgm ON core_searchterm USING gin (term gin_trgm_ops)'
+    )
+
+
+def drop_trigram_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute('DROP INDEX IF EXISTS searchterm_term_trgm')
+
+
+def build_index(apps, schema_editor):
+    Feedback = apps.get_model('core', 'Feedback')
+    SearchTerm = apps.get_model('core', 'SearchTerm')
+    db = schema_editor.connection.alias
+
+    rows = []
+    for item in Feedback.objects.using(db).prefetch_related('tags').iterator(chunk_size=500):
+        terms = document_terms(item.title, item.description, [tag.name for tag in item.tags.all()])
+        rows.extend(
+            SearchTerm(feedback_id=item.pk, board_id=item.board_id, term=term, weight=weight)
+            for term, weight in terms.items()
+        )
+        if len(rows) >= 2000:
+            SearchTerm.objects.using(db).bulk_create(rows)
+            rows = []
+    if rows:
+        SearchTerm.objects.using(db).bulk_create(rows)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_vote_upvote_count'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchTerm',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('term', models.CharField(max_length=64)),
+                ('weight', models.PositiveIntegerField()),
+                ('board', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='core.board')),
+                ('feedback', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='search_terms', to='core.feedback')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['board', 'term'], name='searchterm_board_term', opclasses=['int8_ops', 'varchar_pattern_ops'])],
+                'constraints': [models.UniqueConstraint(fields=('feedback', 'term'), name='unique_search_term_per_feedback')],
+            },
+        ),
+        migrations.RunPython(create_trigram_index, drop_trigram_index),
+        migrations.RunPython(build_index, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.4 on 2026-10-17 22:24
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_comment_count(apps, schema_editor):
+    Feedback = apps.get_model('core', 'Feedback')
+    Comment = apps.get_model('core', 'Comment')
+    db = schema_editor.connection.alias
+    counts = Comment.objects.using(db).filter(feedback=OuterRef('pk')) \
+        .order_by().values('feedback').annotate(n=Count('pk')).values('n')
+    Feedback.objects.using(db).update(comment_count=Coalesce(Subquery(counts), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_search_terms'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='feedback',
+            name='comment_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_comment_count, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,90 @@
+# Generated by Django 5.2.4 on 2026-10-17 22:44
+
+from collections import defaultdict
+from datetime import timedelta
+
+from django.db import migrations, models
+from django.utils import timezone
+
+# Frozen copy of core.ranking's formulas and defaults as of this migration, so
+# later changes to the live module can't change what the backfill writes.
+HOT_GRAVITY = 1.5
+COMMENT_WEIGHT = 0.5
+TRENDING_HALF_LIFE_HOURS = 6
+TRENDING_WINDOW_HOURS = 72
+BATCH_SIZE = 1000
+
+
+def _hours(delta):
+    return max(0.0, delta.total_seconds() / 3600)
+
+
+def hot_score(upvotes, comments, created_at, now):
+    return (upvotes + COMMENT_WEIGHT * comments) / (_hours(now - created_at) + 2) ** HOT_GRAVITY
+
+
+def recency_weight(at, now):
+    return 0.5 ** (_hours(now - at) / TRENDING_HALF_LIFE_HOURS)
+
+
+def backfill_scores(apps, schema_editor):
+    Feedback = apps.get_model('core', 'Feedback')
+    Vote = apps.get_model('core', 'Vote')
+    Comment = apps.get_model('core', 'Comment')
+    db = schema_editor.connection.alias
+    now = timezone.now()
+    since = now - timedelta(hours=TRENDING_WINDOW_HOURS)
+    last_pk = 0
+    while True:
+        rows = list(Feedback.objects.using(db).filter(pk__gt=last_pk).order_by('pk')
+                    .values_list('pk', 'created_at', 'upvote_count', 'comment_count')[:BATCH_SIZE])
+        if not rows:
+            break
+        last_pk = rows[-1][0]
+        ids = [row[0] for row in rows]
+
+        trending = defaultdict(float)
+        for model, weight in ((Vote, 1.0), (Comment, COMMENT_WEIGHT)):
+            recent = model.objects.using(db).filter(feedback_id__in=ids, created_at__gte=since) \
+                .values_list('feedback_id', 'created_at')
+            for feedback_id, at in recent:
+                trending[feedback_id] += weight * recency_weight(at, now)
+
+        Feedback.objects.using(db).bulk_update([
+            Feedback(pk=pk, hot_score=hot_score(upvotes, comments, created_at, now),
+                     trending_score=trending.get(pk, 0.0))
+            for pk, created_at, upvotes, comments in rows
+        ], ['hot_score', 'trending_score'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0006_task_outbox'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='feedback',
+            name='hot_score',
+            field=models.FloatField(default=0),
+        ),
+        migrations.AddField(
+            model_name='feedback',
+            name='trending_score',
+            field=models.FloatField(default=0),
+        ),
+        migrations.RunPython(backfill_scores, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='feedback',
+            index=models.Index(fields=['board', '-hot_score', '-id'], name='feedback_board_hot'),
+        ),
+        migrations.AddIndex(
+            model_name='feedback',
+            index=models.Index(fields=['board', '-trending_score', '-id'], name='feedback_board_trending'),
+        ),
+        migrations.AddIndex(
+            model_name='feedback',
+            index=models.Index(fields=['-hot_score', '-id'], name='feedback_hot'),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.4 on 2026-10-17 22:46
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0007_feedback_ranking_scores'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SimilarityBand',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('band', models.PositiveSmallIntegerField()),
+                ('bucket', models.BigIntegerField()),
+                ('board', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='core.board')),
+                ('feedback', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='similarity_bands', to='core.feedback')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['board', 'bucket', 'feedback'], name='similarity_board_bucket')],
+                'constraints': [models.UniqueConstraint(fields=('feedback', 'band'), name='unique_band_per_feedback')],
+            },
+        ),
+    ]
@@ -0,0 +1,66 @@
+# Generated by Django 5.2.4 on 2026-10-17 23:01
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+def create_tag_trigram_index(apps, schema_editor):
+    # `tags__name__icontains` compiles to UPPER(name::text) LIKE UPPER(...) on Postgres.
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    schema_editor.execute(
+        'CREATE INDEX IF NOT EXISTS tag_name_upper_trgm ON core_tag USING gin ((UPPER(name::text)) gin_trgm_ops)'
+    )
+
+
+def drop_tag_trigram_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute('DROP INDEX IF EXISTS tag_name_upper_trgm')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0009_soft_delete_jobs'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='boardmembership',
+            index=models.Index(fields=['board', 'user'], name='membership_board_user'),
+        ),
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(fields=['feedback', 'created_at', 'id'], name='comment_feedback_created'),
+        ),
+        migrations.AddIndex(
+            model_name='feedback',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', True)), fields=['board', '-upvote_count', '-id'], name='feedback_board_upvotes'),
+        ),
+        migrations.AddIndex(
+            model_name='feedback',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', True)), fields=['board', '-created_at', '-id'], name='feedback_board_created'),
+        ),
+        migrations.AddIndex(
+            model_name='feedback',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', True)), fields=['board', 'status', '-created_at'], name='feedback_board_status'),
+        ),
+        migrations.AddIndex(
+            model_name='feedback',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', True)), fields=['board', 'feedback_type'], name='feedback_board_type'),
+        ),
+        migrations.AddIndex(
+            model_name='feedback',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', True)), fields=['-upvote_count', '-id'], name='feedback_upvotes'),
+        ),
+        migrations.AddIndex(
+            model_name='tag',
+            index=models.Index(django.db.models.functions.text.Lower('name'), name='tag_name_lower'),
+        ),
+        migrations.AddIndex(
+            model_name='vote',
+            index=models.Index(fields=['user', 'feedback'], name='vote_user_feedback'),
+        ),
+        migrations.RunPython(create_tag_trigram_index, drop_tag_trigram_index),
+    ]
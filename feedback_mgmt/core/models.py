@@ -1,5 +1,7 @@
 from django.db import models
+from django.db.models.functions import Lower
 from django.contrib.auth.models import AbstractUser
+from django.utils import timezone
 
 class User(AbstractUser):
     # Add role choices: Admin, Moderator, Contributor
@@ -14,11 +16,27 @@ class User(AbstractUser):
     ]
 
     role = models.CharField(max_length=20, choices=ROLE_CHOICES, default=CONTRIBUTOR)
+    # Carried in JWTs as the `ver` claim; bumped on role or active changes to revoke issued tokens.
+    token_version = models.PositiveIntegerField(default=0)
 
     def __str__(self):
         return f"{self.username} ({self.role})"
 
 
+LIVE = models.Q(deleted_at__isnull=True)
+
+
+class LiveManager(models.Manager):
+    """
+    Default manager for soft-deletable models: rows with `deleted_at` set are
+    waiting for core.deletion to purge them and are invisible to the app.
+    Use `all_objects` to see them.
+    """
+
+    def get_queryset(self):
+        return super().get_queryset().filter(LIVE)
+
+
 class Board(models.Model):
     name = models.CharField(max_length=100)
     description = models.TextField(blank=True)
@@ -33,7 +51,11 @@ class Board(models.Model):
 
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
-  
+    deleted_at = models.DateTimeField(null=True, blank=True)
+
+    objects = LiveManager()
+    all_objects = models.Manager()
+
     def __str__(self):
         return self.name
 
@@ -48,6 +70,10 @@ class BoardMembership(models.Model):
 
     class Meta:
         unique_together = ('user', 'board')
+        indexes = [
+            # unique_together covers user -> boards; this serves board -> members.
+            models.Index(fields=['board', 'user'], name='membership_board_user'),
+        ]
 
 
 class Feedback(models.Model):
@@ -80,20 +106,63 @@ class Feedback(models.Model):
 
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=STATUS_OPEN)
 
-    upvotes = models.ManyToManyField(User, related_name='upvoted_feedbacks', blank=True)  # voters
+    upvotes = models.ManyToManyField(User, through='Vote', related_name='upvoted_feedbacks', blank=True)  # voters
+    upvote_count = models.PositiveIntegerField(default=0)  # denormalized, maintained by core.votes
+    comment_count = models.PositiveIntegerField(default=0)  # denormalized, maintained by core.counters
+    # Popularity decayed by age, and recent activity velocity; maintained by core.ranking.
+    hot_score = models.FloatField(default=0)
+    trending_score = models.FloatField(default=0)
 
     tags = models.ManyToManyField('Tag', blank=True, related_name='feedbacks')
 
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    deleted_at = models.DateTimeField(null=True, blank=True)
 
-    def upvote_count(self):
-        return self.upvotes.count()
+    objects = LiveManager()
+    all_objects = models.Manager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['board', '-hot_score', '-id'], name='feedback_board_hot'),
+            models.Index(fields=['board', '-trending_score', '-id'], name='feedback_board_trending'),
+            models.Index(fields=['-hot_score', '-id'], name='feedback_hot'),
+            # Partial on live rows: LiveManager adds `deleted_at IS NULL` to every query.
+            models.Index(fields=['board', '-upvote_count', '-id'], name='feedback_board_upvotes',
+                         condition=LIVE),
+            models.Index(fields=['board', '-created_at', '-id'], name='feedback_board_created',
+                         condition=LIVE),
+            models.Index(fields=['board', 'status', '-created_at'], name='feedback_board_status',
+                         condition=LIVE),
+            models.Index(fields=['board', 'feedback_type'], name='feedback_board_type', condition=LIVE),
+            models.Index(fields=['-upvote_count', '-id'], name='feedback_upvotes', condition=LIVE),
+        ]
 
     def __str__(self):
         return f"{self.title} ({self.get_status_display()})"
 
 
+class Vote(models.Model):
+    """
+    One row per (feedback, user) upvote. Feedback.upvote_count mirrors the number of rows.
+    """
+    feedback = models.ForeignKey(Feedback, on_delete=models.CASCADE, related_name='votes')
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='votes')
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['feedback', 'user'], name='unique_vote_per_user'),
+        ]
+        indexes = [
+            # "my votes": index-only on (user, feedback) instead of visiting every vote row.
+            models.Index(fields=['user', 'feedback'], name='vote_user_feedback'),
+        ]
+
+    def __str__(self):
+        return f"{self.user} -> {self.feedback_id}"
+
+
 class Comment(models.Model):
     feedback = models.ForeignKey(Feedback, on_delete=models.CASCADE, related_name='comments')
     created_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, related_name='comments')
@@ -103,6 +172,11 @@ class Comment(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['feedback', 'created_at', 'id'], name='comment_feedback_created'),
+        ]
+
     def __str__(self):
         return f"Comment by {self.created_by} on {self.feedback}"
 
@@ -110,5 +184,138 @@ class Comment(models.Model):
 class Tag(models.Model):
     name = models.CharField(max_length=50, unique=True)
 
+    class Meta:
+        indexes = [
+            # Case-insensitive lookups (core.tags); `tag_name` icontains uses a trigram index on Postgres.
+            models.Index(Lower('name'), name='tag_name_lower'),
+        ]
+
+    def __str__(self):
+        return self.name
+
+
+class SearchTerm(models.Model):
+    """
+    Posting list for feedback search: one row per (feedback, term) with the
+    term's weight in that item. Maintained by core.search.
+    """
+    feedback = models.ForeignKey(Feedback, on_delete=models.CASCADE, related_name='search_terms')
+    board = models.ForeignKey(Board, on_delete=models.CASCADE, related_name='+')
+    term = models.CharField(max_length=64)
+    weight = models.PositiveIntegerField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['feedback', 'term'], name='unique_search_term_per_feedback'),
+        ]
+        indexes = [
+            # opclasses only apply on Postgres, where they let `term LIKE 'abc%'` use the index.
+            models.Index(fields=['board', 'term'], name='searchterm_board_term',
+                         opclasses=['int8_ops', 'varchar_pattern_ops']),
+        ]
+
+    def __str__(self):
+        return f"{self.term} ({self.weight}) -> {self.feedback_id}"
+
+
+class SimilarityBand(models.Model):
+    """
+    LSH bucket for near-duplicate detection: one row per (feedback, band) with
+    the hash of that band of the item's MinHash signature. Maintained by core.similarity.
+    """
+    feedback = models.ForeignKey(Feedback, on_delete=models.CASCADE, related_name='similarity_bands')
+    board = models.ForeignKey(Board, on_delete=models.CASCADE, related_name='+')
+    band = models.PositiveSmallIntegerField()
+    bucket = models.BigIntegerField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['feedback', 'band'], name='unique_band_per_feedback'),
+        ]
+        indexes = [
+            # Covers the lookup, so candidates come from the index alone.
+            models.Index(fields=['board', 'bucket', 'feedback'], name='similarity_board_bucket'),
+        ]
+
+    def __str__(self):
+        return f"band {self.band}: {self.bucket} -> {self.feedback_id}"
+
+
+class DeletionJob(models.Model):
+    """
+    Background purge of soft-deleted boards or feedback, run in chunks by core.deletion.
+    """
+    BOARD = 'board'
+    FEEDBACK = 'feedback'
+
+    TARGET_CHOICES = [
+        (BOARD, 'Board'),
+        (FEEDBACK, 'Feedback'),
+    ]
+
+    PENDING = 'pending'
+    RUNNING = 'running'
+    DONE = 'done'
+
+    STATUS_CHOICES = [
+        (PENDING, 'Pending'),
+        (RUNNING, 'Running'),
+        (DONE, 'Done'),
+    ]
+
+    target = models.CharField(max_length=20, choices=TARGET_CHOICES)
+    target_ids = models.JSONField(default=list)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=PENDING)
+    total = models.PositiveIntegerField(default=0)  # feedback items to purge
+    deleted = models.PositiveIntegerField(default=0)
+    requested_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    error = models.TextField(blank=True, default='')  # last failed run; the task is retried
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"Delete {self.target} {self.target_ids} ({self.status})"
+
+
+class Task(models.Model):
+    """
+    Outbox row for a background job, run by `manage.py run_worker` (see core.tasks).
+    """
+    PENDING = 'pending'
+    RUNNING = 'running'
+    FAILED = 'failed'
+
+    STATUS_CHOICES = [
+        (PENDING, 'Pending'),
+        (RUNNING, 'Running'),
+        (FAILED, 'Failed'),
+    ]
+
+    name = models.CharField(max_length=100)
+    payload = models.JSONField(default=dict, blank=True)
+    # Non-empty keys are unique among pending tasks, so repeated enqueues collapse into one.
+    dedupe_key = models.CharField(max_length=200, blank=True, default='')
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=PENDING)
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=5)
+    run_after = models.DateTimeField(default=timezone.now)
+    locked_by = models.CharField(max_length=100, blank=True, default='')
+    locked_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True, default='')
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['dedupe_key'],
+                condition=models.Q(status='pending') & ~models.Q(dedupe_key=''),
+                name='unique_pending_task_key',
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['status', 'run_after'], name='task_status_run_after'),
+        ]
+
     def __str__(self):
-        return self.name
\ No newline at end of file
+        return f"{self.name} ({self.status}, attempt {self.attempts})"
@@ -0,0 +1,284 @@
+import base64
+import binascii
+import datetime
+import json
+from collections import OrderedDict
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError as DjangoValidationError
+from django.core.paginator import InvalidPage
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination, _positive_int
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class CursorJSONEncoder(DjangoJSONEncoder):
+    """
+    Keeps full microsecond precision on datetimes, which DjangoJSONEncoder
+    truncates to milliseconds; a truncated boundary would skip or repeat rows.
+    """
+    def default(self, o):
+        if isinstance(o, (datetime.datetime, datetime.time)):
+            return o.isoformat()
+        return super().default(o)
+
+
+class KeysetPagination(BasePagination):
+    """
+    Keyset (seek) pagination over whatever ordering the queryset already has.
+
+    The primary key is appended as a tiebreaker, and each page is fetched with a
+    `WHERE (a, b, id) > (x, y, z)` style predicate instead of an OFFSET, so deep
+    pages cost the same as the first one. Cursors are opaque base64 tokens holding
+    the boundary row's sort values; the total count is only computed on `?count=true`.
+    """
+    cursor_query_param = 'cursor'
+    count_query_param = 'count'
+    page_size = 10
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    invalid_cursor_message = 'Invalid cursor.'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        queryset, position, reverse = self._prepare(queryset, request)
+        self.count = queryset.count() if self.wants_count(request) else None
+        if position is not None:
+            queryset = queryset.filter(self.seek_filter(position, reverse))
+        return self._paginate(list(queryset[:self.page_size + 1]), position, reverse)
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        queryset, position, reverse = self._prepare(queryset, request)
+        self.count = await queryset.acount() if self.wants_count(request) else None
+        if position is not None:
+            queryset = queryset.filter(self.seek_filter(position, reverse))
+        return self._paginate(await _alist(queryset[:self.page_size + 1], self.page_size + 1), position, reverse)
+
+    def _prepare(self, queryset, request):
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+        self.ordering = self.get_ordering(queryset)
+
+        position, reverse = self.decode_cursor(request, queryset.model)
+        if reverse:
+            queryset = queryset.order_by(*[_flip(field) for field in self.ordering])
+        else:
+            queryset = queryset.order_by(*self.ordering)
+        return queryset, position, reverse
+
+    def _paginate(self, results, position, reverse):
+        has_more = len(results) > self.page_size
+        results = results[:self.page_size]
+        if reverse:
+            results.reverse()
+
+        if reverse:
+            self.has_next = position is not None
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = position is not None
+
+        self.page = results
+        return results
+
+    def get_paginated_response(self, data):
+        payload = OrderedDict([
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+        ])
+        if self.count is not None:
+            payload['count'] = self.count
+        payload['results'] = data
+        return Response(payload)
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'count': {'type': 'integer'},
+                'results': schema,
+            },
+        }
+
+    def get_page_size(self, request):
+        try:
+            return _positive_int(
+                request.query_params[self.page_size_query_param],
+                strict=True,
+                cutoff=self.max_page_size,
+            )
+        except (KeyError, ValueError):
+            return self.page_size
+
+    def wants_count(self, request):
+        return request.query_params.get(self.count_query_param, '').lower() in ('1', 'true', 'yes')
+
+    def get_ordering(self, queryset):
+        ordering = list(queryset.query.order_by or queryset.model._meta.ordering or [])
+        if any(not isinstance(field, str) for field in ordering):
+            raise TypeError('KeysetPagination only supports orderings given as field names.')
+
+        ordering = [_normalize_pk(field, queryset.model) for field in ordering]
+        if not any(field.lstrip('-') == 'pk' for field in ordering):
+            descending = bool(ordering) and ordering[0].startswith('-')
+            ordering.append('-pk' if descending else 'pk')
+        return ordering
+
+    def seek_filter(self, position, reverse):
+        """
+        Build `(f1 > v1) OR (f1 = v1 AND f2 > v2) OR ...` for the current ordering,
+        with each comparison flipped for descending fields and for backward pages.
+        """
+        condition = Q()
+        equal_so_far = Q()
+        for field, value in zip(self.ordering, position):
+            name = field.lstrip('-')
+            descending = field.startswith('-') != reverse
+            lookup = f'{name}__lt' if descending else f'{name}__gt'
+            condition |= equal_so_far & Q(**{lookup: value})
+            equal_so_far &= Q(**{name: value})
+        return condition
+
+    def decode_cursor(self, request, model):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None, False
+
+        try:
+            padded = encoded + '=' * (-len(encoded) % 4)
+            payload = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+            ordering, position, reverse = payload['o'], payload['p'], bool(payload.get('r'))
+        except (TypeError, ValueError, KeyError, UnicodeEncodeError, binascii.Error):
+            raise NotFound(self.invalid_cursor_message)
+
+        # A cursor is only meaningful for the ordering it was issued under.
+        if ordering != self.ordering or len(position) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+
+        try:
+            position = [_to_python(model, field.lstrip('-'), value) for field, value in zip(ordering, position)]
+        except DjangoValidationError:
+            raise NotFound(self.invalid_cursor_message)
+        return position, reverse
+
+    def encode_cursor(self, obj, reverse=False):
+        position = [_attribute(obj, field.lstrip('-')) for field in self.ordering]
+        payload = json.dumps({'o': self.ordering, 'p': position, 'r': int(reverse)},
+                             cls=CursorJSONEncoder, separators=(',', ':'))
+        encoded = base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.page[-1])
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.encode_cursor(self.page[0], reverse=True)
+
+
+async def apaginate_page_number(pagination, queryset, request, view=None):
+    """
+    PageNumberPagination.paginate_queryset() on the async ORM, leaving `pagination`
+    in the same state so its get_paginated_response() gives the same payload.
+    """
+    pagination.request = request
+    page_size = pagination.get_page_size(request)
+    if not page_size:
+        return None
+
+    paginator = pagination.django_paginator_class(queryset, page_size)
+    # Paginator.count is a cached_property; fill it so nothing below counts again.
+    paginator.count = await queryset.acount()
+    page_number = pagination.get_page_number(request, paginator)
+    try:
+        pagination.page = paginator.page(page_number)
+    except InvalidPage as exc:
+        raise NotFound(pagination.invalid_page_message.format(page_number=page_number, message=str(exc)))
+    pagination.page.object_list = await _alist(pagination.page.object_list, page_size)
+
+    if paginator.num_pages > 1 and pagination.template is not None:
+        pagination.display_page_controls = True
+    return list(pagination.page)
+
+
+async def _alist(queryset, chunk_size):
+    # aiterator() only applies prefetch_related() when given a chunk size.
+    return [obj async for obj in queryset.aiterator(chunk_size=max(chunk_size, 1))]
+
+
+class FeedbackPagination(PageNumberPagination):
+    """
+    Page-number pagination by default (what the frontend table uses), switching to
+    keyset pagination whenever the request carries a `cursor` parameter
+    (an empty `?cursor=` starts at the first page).
+    """
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    keyset_class = KeysetPagination
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.keyset = None
+        if self.keyset_class.cursor_query_param in request.query_params:
+            self.keyset = self.keyset_class()
+            return self.keyset.paginate_queryset(queryset, request, view)
+        return super().paginate_queryset(queryset, request, view)
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        self.keyset = None
+        if self.keyset_class.cursor_query_param in request.query_params:
+            self.keyset = self.keyset_class()
+            return await self.keyset.apaginate_queryset(queryset, request, view)
+        return await apaginate_page_number(self, queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.keyset is not None:
+            return self.keyset.get_paginated_response(data)
+        return super().get_paginated_response(data)
+
+
+def _flip(field):
+    return field[1:] if field.startswith('-') else f'-{field}'
+
+
+def _normalize_pk(field, model):
+    name = field.lstrip('-')
+    if name == model._meta.pk.name:
+        return field.replace(name, 'pk')
+    return field
+
+
+def _attribute(obj, path):
+    value = obj
+    for part in path.split('__'):
+        value = getattr(value, part)
+    return value
+
+
+def _to_python(model, path, value):
+    if value is None:
+        return value
+    if path == 'pk':
+        return model._meta.pk.to_python(value)
+
+    opts = model._meta
+    field = None
+    for part in path.split('__'):
+        try:
+            field = opts.get_field(part)
+        except FieldDoesNotExist:
+            # Annotations (e.g. computed ranks) are compared as raw JSON values.
+            return value
+        if field.is_relation and field.related_model is not None:
+            opts = field.related_model._meta
+    return field.to_python(value)
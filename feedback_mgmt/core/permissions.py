@@ -1,7 +1,8 @@
 #implemented role based user models
 
 from rest_framework import permissions
-from .models import Board, BoardMembership
+from .access import can_access_board
+from .models import Board, Comment
 
 from rest_framework import permissions
 
@@ -34,15 +35,15 @@ class IsBoardMemberOrPublic(permissions.BasePermission):
 
     def has_object_permission(self, request, view, obj):
         # Determine the board for this object
-        board = getattr(obj, 'board', None)
-        if board is None and isinstance(obj, Board):
-            board = obj
-
-        if board.is_public:
-            return True
-
-        # Check membership if board is private
-        return BoardMembership.objects.filter(board=board, user=request.user).exists()
+        if isinstance(obj, Board):
+            board_id = obj.pk
+        elif isinstance(obj, Comment):
+            board_id = obj.feedback.board_id
+        else:
+            board_id = obj.board_id
+
+        # Public boards and the user's memberships are both in the access set
+        return can_access_board(request, board_id)
 
     def has_permission(self, request, view):
         # For list views, permission is granted, filtering happens at queryset level
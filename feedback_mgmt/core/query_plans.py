@@ -0,0 +1,162 @@
+"""
+Query-plan regression checks.
+
+Every read scenario from core.benchmarks is requested once, and the SQL it
+sends is recorded. The endpoint's main query gets EXPLAINed: the first
+statement that reads the scenario's table, preferring one that fetches a page
+(has a LIMIT). A plan that reads any of the large tables (WATCHED_MODELS)
+with a sequential scan is a regression. Scans of small tables such as boards,
+users and tags are left to the planner.
+
+Run after `manage.py seed_synthetic`, so the planner sees realistic row
+counts. Statistics are refreshed with ANALYZE first. Supports Postgres
+(EXPLAIN FORMAT JSON) and SQLite (EXPLAIN QUERY PLAN).
+"""
+import json
+import re
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import connection
+from django.test.utils import override_settings
+
+from .benchmarks import api_client, build_scenarios, isolated_caches
+from .models import Board, BoardMembership, Comment, Feedback, SearchTerm, SimilarityBand, Vote
+
+WATCHED_MODELS = [Feedback, Comment, Vote, SearchTerm, SimilarityBand, BoardMembership, Feedback.tags.through]
+
+# Scenario -> the model its main query reads. Write scenarios are not checked.
+MAIN_MODELS = {
+    'feedback_list': Feedback,
+    'feedback_list_filtered': Feedback,
+    'feedback_list_ordered': Feedback,
+    'feedback_list_hot': Feedback,
+    'feedback_list_trending': Feedback,
+    'feedback_list_deep_page': Feedback,
+    'feedback_list_cursor': Feedback,
+    'feedback_search': Feedback,
+    'feedback_similar': SimilarityBand,
+    'my_votes': Vote,
+    'feedback_detail': Feedback,
+    'board_list': Board,
+    'board_kanban': Feedback,
+    'board_stats': Feedback,
+    'comments': Comment,
+}
+
+# Django gives subquery tables aliases (`"core_vote" U0`); SQLite's plan reports the alias.
+_ALIAS = re.compile(r'"(\w+)"\s+(?:AS\s+)?"?([A-Z]\d+)"?\b')
+_SQLITE_SCAN = re.compile(r'^SCAN (\w+)( USING (?:COVERING )?INDEX \w+)?$')
+
+
+class PlanCheck:
+
+    def __init__(self, scenario, table, sql, plan, seq_scans):
+        self.scenario = scenario
+        self.table = table
+        self.sql = sql
+        self.plan = plan
+        self.seq_scans = seq_scans
+
+    @property
+    def ok(self):
+        return not self.seq_scans
+
+
+class _Recorder:
+
+    def __init__(self):
+        self.statements = []
+
+    def __call__(self, execute, sql, params, many, context):
+        if not many:
+            self.statements.append((sql, params))
+        return execute(sql, params, many, context)
+
+
+def main_statement(statements, table):
+    """
+    The (sql, params) of the main query on `table`, or None.
+    """
+    marker = f'FROM "{table}"'
+    reads = [(sql, params) for sql, params in statements if sql.lstrip().startswith('SELECT') and marker in sql]
+    paged = [(sql, params) for sql, params in reads if ' LIMIT ' in sql]
+    return (paged or reads or [None])[0]
+
+
+def explain(sql, params):
+    """
+    (plan lines, names of watched tables read with a sequential scan) for one statement.
+    """
+    watched = {model._meta.db_table for model in WATCHED_MODELS}
+    vendor = connection.vendor
+    with connection.cursor() as cursor:
+        if vendor == 'postgresql':
+            cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+            document = cursor.fetchone()[0]
+            if isinstance(document, str):
+                document = json.loads(document)
+            lines, scanned = [], set()
+            _walk_postgres(document[0]['Plan'], 0, lines, scanned)
+        elif vendor == 'sqlite':
+            cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+            aliases = {alias: table for table, alias in _ALIAS.findall(sql)}
+            lines, scanned = [], set()
+            for row in cursor.fetchall():
+                detail = row[-1]
+                lines.append(detail)
+                match = _SQLITE_SCAN.match(detail)
+                # Walking a whole index in order is fine when a LIMIT stops it early.
+                if match and not (match.group(2) and ' LIMIT ' in sql):
+                    scanned.add(aliases.get(match.group(1), match.group(1)))
+        else:
+            raise NotImplementedError(f'No plan check for {vendor}.')
+    return lines, sorted(scanned & watched)
+
+
+def _walk_postgres(node, depth, lines, scanned):
+    relation = node.get('Relation Name')
+    index = node.get('Index Name')
+    label = node['Node Type'] + (f' on {relation}' if relation else '') + (f' using {index}' if index else '')
+    lines.append('  ' * depth + label)
+    if node['Node Type'] == 'Seq Scan' and relation:
+        scanned.add(relation)
+    for child in node.get('Plans', []):
+        _walk_postgres(child, depth + 1, lines, scanned)
+
+
+def analyze():
+    with connection.cursor() as cursor:
+        cursor.execute('ANALYZE')
+
+
+def check_plans(user, only=None):
+    """
+    EXPLAIN the main query of every checked scenario (or those named in `only`) as `user`.
+    Requests run against isolated_caches(), emptied before each one.
+    Returns a list of PlanCheck.
+    """
+    analyze()
+    client = api_client(user)
+    checks = []
+    with override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'testserver'],
+                           CACHES=isolated_caches('plan-check')):
+        for scenario in build_scenarios(user):
+            model = MAIN_MODELS.get(scenario.name)
+            if model is None or (only and scenario.name not in only):
+                continue
+            for cache in caches.all():
+                cache.clear()
+            recorder = _Recorder()
+            with connection.execute_wrapper(recorder):
+                response = scenario.request(client, 0)
+            if response.status_code >= 400:
+                raise RuntimeError(f'{scenario.name}: HTTP {response.status_code} for {scenario.path(0)}')
+
+            table = model._meta.db_table
+            statement = main_statement(recorder.statements, table)
+            if statement is None:
+                raise RuntimeError(f'{scenario.name}: no query on {table} was issued.')
+            plan, seq_scans = explain(*statement)
+            checks.append(PlanCheck(scenario.name, table, statement[0], plan, seq_scans))
+    return checks
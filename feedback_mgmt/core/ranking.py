@@ -0,0 +1,154 @@
+"""
+Hot and trending scores for feedback.
+
+hot_score is the item's activity (one point per vote, COMMENT_WEIGHT per
+comment) divided by (age in hours + 2) ** HOT_GRAVITY, so a fresh item with
+a handful of votes can outrank an old one with many. trending_score is
+recent velocity: every vote or comment from the last TRENDING_WINDOW_HOURS,
+its weight halved every TRENDING_HALF_LIFE_HOURS.
+
+Both are stored and indexed, which turns `?ordering=hot|trending` into an
+index scan. A vote or comment moves them with an F() increment folded into
+the UPDATE that already moves its counter; the decay that comes from time
+passing is applied in batches by recompute_scores(), on a schedule
+(`manage.py recompute_rankings --schedule` makes the task worker run it
+every RANKING_REFRESH_SECONDS). Between two batches new activity weighs a
+little more than it will after the next one, which only makes the ranking
+react faster.
+
+Decay alone moves almost every young row a little on each run, so a batch
+rewrites a row only once its stored scores are RANKING_TOLERANCE (relative)
+off, and the scheduled refresh doesn't invalidate cached responses: a list
+ordered by score catches up when its cache entry expires.
+"""
+import math
+from collections import defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import F, Value
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
+from .models import Comment, Feedback, Vote
+from .signals import notify_boards_changed
+from .tasks import enqueue, task
+
+HOT_GRAVITY = getattr(settings, 'RANKING_HOT_GRAVITY', 1.5)
+COMMENT_WEIGHT = getattr(settings, 'RANKING_COMMENT_WEIGHT', 0.5)
+TRENDING_HALF_LIFE_HOURS = getattr(settings, 'RANKING_TRENDING_HALF_LIFE_HOURS', 6)
+TRENDING_WINDOW_HOURS = getattr(settings, 'RANKING_TRENDING_WINDOW_HOURS', 72)
+REFRESH_SECONDS = getattr(settings, 'RANKING_REFRESH_SECONDS', 600)
+BATCH_SIZE = 1000
+# Rows whose scores moved less than this (relative) are not rewritten.
+TOLERANCE = getattr(settings, 'RANKING_TOLERANCE', 0.05)
+
+ORDERINGS = {
+    'hot': ['-hot_score', '-id'],
+    'trending': ['-trending_score', '-id'],
+}
+
+
+def _hours(delta):
+    return max(0.0, delta.total_seconds() / 3600)
+
+
+def age_decay(created_at, now):
+    return 1.0 / (_hours(now - created_at) + 2) ** HOT_GRAVITY
+
+
+def hot_score(upvotes, comments, created_at, now):
+    return (upvotes + COMMENT_WEIGHT * comments) * age_decay(created_at, now)
+
+
+def recency_weight(at, now):
+    return 0.5 ** (_hours(now - at) / TRENDING_HALF_LIFE_HOURS)
+
+
+def activity_update(feedback, weight):
+    """
+    Update kwargs moving `feedback`'s scores for activity happening now:
+    weight 1 for a vote, COMMENT_WEIGHT for a comment, negative when withdrawn.
+    """
+    decay = age_decay(feedback.created_at, timezone.now())
+    return {
+        'hot_score': Greatest(F('hot_score') + weight * decay, Value(0.0)),
+        # A withdrawn vote may have already decayed below 1; the next batch corrects it.
+        'trending_score': Greatest(F('trending_score') + weight, Value(0.0)),
+    }
+
+
+def _changed(old, new):
+    return not math.isclose(old, new, rel_tol=TOLERANCE, abs_tol=1e-9)
+
+
+def _trending_scores(ids, now):
+    since = now - timedelta(hours=TRENDING_WINDOW_HOURS)
+    scores = defaultdict(float)
+    for model, weight in ((Vote, 1.0), (Comment, COMMENT_WEIGHT)):
+        recent = model.objects.filter(feedback_id__in=ids, created_at__gte=since) \
+            .values_list('feedback_id', 'created_at')
+        for feedback_id, at in recent:
+            scores[feedback_id] += weight * recency_weight(at, now)
+    return scores
+
+
+def recompute_scores(queryset=None, now=None, notify=True):
+    """
+    Recompute both scores for every row in `queryset` (default: all feedback)
+    from the counters and recent activity, writing only rows that moved.
+    With `notify`, the boards of the rewritten rows are reported as changed.
+    Returns the number of rows updated.
+    """
+    now = now or timezone.now()
+    queryset = (queryset if queryset is not None else Feedback.objects.all()).order_by('pk')
+    updated, boards, last_pk = 0, set(), 0
+    while True:
+        rows = list(queryset.filter(pk__gt=last_pk).values_list(
+            'pk', 'board_id', 'created_at', 'upvote_count', 'comment_count', 'hot_score', 'trending_score',
+        )[:BATCH_SIZE])
+        if not rows:
+            break
+        last_pk = rows[-1][0]
+        trending = _trending_scores([row[0] for row in rows], now)
+
+        changed = []
+        for pk, board_id, created_at, upvotes, comments, old_hot, old_trending in rows:
+            hot = hot_score(upvotes, comments, created_at, now)
+            velocity = trending.get(pk, 0.0)
+            if _changed(old_hot, hot) or _changed(old_trending, velocity):
+                changed.append(Feedback(pk=pk, hot_score=hot, trending_score=velocity))
+                boards.add(board_id)
+        Feedback.objects.bulk_update(changed, ['hot_score', 'trending_score'])
+        updated += len(changed)
+
+    if notify and boards:
+        notify_boards_changed(boards)
+    return updated
+
+
+def rescore_feedback(ids):
+    """
+    Queue a score recompute for feedback written without going through the
+    vote and comment paths (imports, bulk loads).
+    """
+    ids = list(ids)
+    for start in range(0, len(ids), BATCH_SIZE):
+        enqueue('ranking.rescore', {'ids': ids[start:start + BATCH_SIZE]})
+
+
+def schedule_refresh(delay=0):
+    enqueue('ranking.refresh', key='ranking.refresh', delay=delay)
+
+
+@task('ranking.rescore')
+def rescore_task(payload):
+    recompute_scores(Feedback.objects.filter(pk__in=payload['ids']))
+
+
+@task('ranking.refresh')
+def refresh_task(payload):
+    # Queue the next run first, so a failing batch doesn't end the cycle.
+    schedule_refresh(delay=REFRESH_SECONDS)
+    # Only decay happened since the last run; not worth dropping every cached response.
+    recompute_scores(notify=False)
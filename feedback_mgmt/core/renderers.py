@@ -0,0 +1,105 @@
+"""
+Fast JSON rendering and parsing for the API.
+
+FastJSONRenderer and FastJSONParser are drop-in replacements for DRF's
+JSONRenderer and JSONParser, backed by orjson when it is installed. Output
+matches DRF's compact rendering: UTF-8, no whitespace, values orjson can't
+encode go through DRF's encoder, and U+2028/U+2029 are escaped. The one
+difference is float exponents (`1e-7` rather than `1e-07`), which parse to
+the same value. Without orjson, both fall back to the stdlib json module.
+
+iter_json_array() streams a JSON array in chunks, for export-sized lists
+that shouldn't be built in memory (core.transfer).
+"""
+import json
+
+from django.conf import settings
+from rest_framework import renderers
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.utils.encoders import JSONEncoder
+from rest_framework.utils.json import strict_constant
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+ARRAY_CHUNK_ITEMS = 100
+
+_encoder = JSONEncoder()
+# Datetimes go through DRF's encoder, which formats them differently from orjson.
+_ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME if orjson else 0
+
+
+def dumps(data):
+    """
+    `data` as compact UTF-8 JSON bytes, as DRF's JSONRenderer produces them.
+    """
+    if orjson is not None:
+        try:
+            ret = orjson.dumps(data, default=_encoder.default, option=_ORJSON_OPTIONS)
+        except orjson.JSONEncodeError:
+            # e.g. integers wider than 64 bits; the stdlib encoder decides.
+            ret = None
+    else:
+        ret = None
+    if ret is None:
+        ret = json.dumps(data, cls=JSONEncoder, ensure_ascii=False, allow_nan=False,
+                         separators=(',', ':')).encode('utf-8')
+    # Valid JSON but not valid JavaScript; DRF escapes them for JSONP-style consumers.
+    if b'\xe2\x80\xa8' in ret or b'\xe2\x80\xa9' in ret:
+        ret = ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+    return ret
+
+
+def loads(data):
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data, parse_constant=strict_constant)
+
+
+def iter_json_array(items, chunk_items=ARRAY_CHUNK_ITEMS):
+    """
+    Yield a JSON array of `items` as text chunks of up to `chunk_items` elements.
+    """
+    yield '['
+    chunk, first = [], True
+    for item in items:
+        chunk.append(dumps(item).decode('utf-8'))
+        if len(chunk) == chunk_items:
+            yield ('' if first else ',') + ','.join(chunk)
+            chunk, first = [], False
+    if chunk:
+        yield ('' if first else ',') + ','.join(chunk)
+    yield ']'
+
+
+class FastJSONRenderer(renderers.JSONRenderer):
+    """
+    JSONRenderer on dumps(). Indented output (`; indent=` in Accept, or the
+    browsable API) and non-default JSON settings are left to DRF.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        if self.ensure_ascii or not self.compact or \
+                self.get_indent(accepted_media_type, renderer_context or {}) is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+        return dumps(data)
+
+
+class FastJSONParser(JSONParser):
+    """
+    JSONParser on loads(), for UTF-8 request bodies.
+    """
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        encoding = (parser_context or {}).get('encoding', settings.DEFAULT_CHARSET)
+        if orjson is None or encoding.lower().replace('-', '') != 'utf8':
+            return super().parse(stream, media_type, parser_context)
+        try:
+            return loads(stream.read())
+        except ValueError as exc:
+            raise ParseError('JSON parse error - %s' % str(exc))
@@ -0,0 +1,201 @@
+"""
+Versioned response cache for the read endpoints.
+
+Every board has a version number in the cache that is bumped whenever its
+feedback, comments, tag links or votes change (through `board_data_changed`),
+plus two wider scopes: ALL_BOARDS, bumped by any board change, and BOARD_LIST,
+bumped by board and membership writes. A cached response is keyed on the
+request (host, path, sorted query params), a fingerprint of the user's access
+set (or the user itself, for payloads with per-user fields such as has_upvoted)
+and the versions of the scopes the view depends on, so a write never has to
+find and delete keys: it moves the version and old entries simply stop matching.
+
+Responses carry a strong ETag (a hash of the serialized body) and a matching
+`If-None-Match` is answered with 304. A warm hit costs two cache reads and no
+database queries.
+
+Entries live in the cache named by settings.FEEDBACK_CACHE_ALIAS ('default'
+unless configured), which should be a shared backend when running more than one
+process.
+"""
+import hashlib
+import json
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from django.utils.http import parse_etags
+from rest_framework import status
+from rest_framework.response import Response
+
+from .access import accessible_board_ids
+from .models import Board, BoardMembership
+from .renderers import dumps
+from .signals import board_data_changed
+
+CACHE_ALIAS = getattr(settings, 'FEEDBACK_CACHE_ALIAS', 'default')
+RESPONSE_CACHE_TIMEOUT = getattr(settings, 'RESPONSE_CACHE_TIMEOUT', 300)
+VERSION_PREFIX = 'version:'
+ALL_BOARDS = 'boards:all'
+BOARD_LIST = 'boards:list'
+
+
+def get_cache():
+    return caches[CACHE_ALIAS]
+
+
+def _version_key(scope):
+    return f'{VERSION_PREFIX}{scope}'
+
+
+def get_versions(scopes):
+    """
+    Current version of each scope (a board id, ALL_BOARDS or BOARD_LIST), in order.
+
+    A missing version is seeded from the clock rather than 0, so a version that
+    was evicted can't come back at a value some stale entry was stored under.
+    """
+    cache = get_cache()
+    keys = [_version_key(scope) for scope in scopes]
+    found = cache.get_many(keys)
+    for key in keys:
+        if key not in found:
+            cache.add(key, time.time_ns() // 1000, None)
+            found[key] = cache.get(key)
+    return [found[key] for key in keys]
+
+
+async def aget_versions(scopes):
+    cache = get_cache()
+    keys = [_version_key(scope) for scope in scopes]
+    found = await cache.aget_many(keys)
+    for key in keys:
+        if key not in found:
+            await cache.aadd(key, time.time_ns() // 1000, None)
+            found[key] = await cache.aget(key)
+    return [found[key] for key in keys]
+
+
+def bump_versions(scopes):
+    cache = get_cache()
+    for scope in scopes:
+        try:
+            cache.incr(_version_key(scope))
+        except ValueError:
+            # Never read, or evicted: the next get_versions() seeds a fresh one.
+            pass
+
+
+def access_fingerprint(request):
+    board_ids = ','.join(str(board_id) for board_id in sorted(accessible_board_ids(request)))
+    return hashlib.sha1(board_ids.encode('ascii')).hexdigest()
+
+
+def response_cache_key(request, scopes, per_user=False, versions=None):
+    params = sorted(
+        (name, value)
+        for name, values in request.query_params.lists()
+        for value in values
+    )
+    parts = [
+        request.get_host(),
+        request.path,
+        json.dumps(params, separators=(',', ':')),
+        access_fingerprint(request),
+        f'user:{request.user.pk}' if per_user else '',
+        ','.join(str(version) for version in (versions or get_versions(scopes))),
+    ]
+    digest = hashlib.sha1('\n'.join(parts).encode('utf-8')).hexdigest()
+    return f'response:{digest}'
+
+
+def compute_etag(data):
+    return '"%s"' % hashlib.sha1(dumps(data)).hexdigest()
+
+
+def cached_response(request, scopes, build, per_user=False):
+    """
+    Serve `build()` (a callable returning a Response) through the versioned cache.
+    Only 200 responses are stored; `per_user` keeps one entry per user.
+    """
+    cache = get_cache()
+    key = response_cache_key(request, scopes, per_user)
+    entry = cache.get(key)
+    if entry is not None:
+        etag, data = entry
+        response = Response(data)
+    else:
+        response = build()
+        if response.status_code != status.HTTP_200_OK:
+            return response
+        etag = compute_etag(response.data)
+        cache.set(key, (etag, response.data), RESPONSE_CACHE_TIMEOUT)
+
+    return _conditional(request, response, etag)
+
+
+async def acached_response(request, scopes, build, per_user=False):
+    """
+    cached_response() for async views; `build` is a coroutine function.
+    """
+    cache = get_cache()
+    key = response_cache_key(request, scopes, per_user, versions=await aget_versions(scopes))
+    entry = await cache.aget(key)
+    if entry is not None:
+        etag, data = entry
+        response = Response(data)
+    else:
+        response = await build()
+        if response.status_code != status.HTTP_200_OK:
+            return response
+        etag = compute_etag(response.data)
+        await cache.aset(key, (etag, response.data), RESPONSE_CACHE_TIMEOUT)
+    return _conditional(request, response, etag)
+
+
+def _conditional(request, response, etag):
+    # Weak comparison: core.compression marks the ETag of compressed bodies weak.
+    if etag in {tag.removeprefix('W/') for tag in parse_etags(request.headers.get('If-None-Match', ''))}:
+        response = Response(status=status.HTTP_304_NOT_MODIFIED)
+    response['ETag'] = etag
+    # Browsers revalidate with If-None-Match on every poll instead of reusing blindly.
+    patch_cache_control(response, private=True, no_cache=True)
+    patch_vary_headers(response, ['Authorization'])
+    return response
+
+
+class VersionedCacheMixin:
+    """
+    Cache list and retrieve responses of a viewset under `get_cache_scopes()`.
+    """
+    cache_per_user = False
+
+    def get_cache_scopes(self, request):
+        return [ALL_BOARDS]
+
+    def list(self, request, *args, **kwargs):
+        return cached_response(request, self.get_cache_scopes(request),
+                               lambda: super(VersionedCacheMixin, self).list(request, *args, **kwargs),
+                               per_user=self.cache_per_user)
+
+    def retrieve(self, request, *args, **kwargs):
+        return cached_response(request, self.get_cache_scopes(request),
+                               lambda: super(VersionedCacheMixin, self).retrieve(request, *args, **kwargs),
+                               per_user=self.cache_per_user)
+
+
+@receiver(board_data_changed)
+def board_data_written(sender, board_ids, **kwargs):
+    bump_versions([*board_ids, ALL_BOARDS])
+
+
+@receiver(post_save, sender=Board)
+@receiver(post_delete, sender=Board)
+@receiver(post_save, sender=BoardMembership)
+@receiver(post_delete, sender=BoardMembership)
+def board_list_written(sender, instance, **kwargs):
+    transaction.on_commit(lambda: bump_versions([BOARD_LIST]))
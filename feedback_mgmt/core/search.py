@@ -0,0 +1,303 @@
+"""
+Feedback search.
+
+Every feedback item has a precomputed, weighted term list stored in
+SearchTerm (title > tags > description > comments). Queries resolve against
+that posting table through the (board, term) index instead of running
+`icontains` scans over the feedback columns. Results are ranked by summed
+term weight, the last query word is matched as a prefix so results update
+while the user types, and `suggest()` offers a "did you mean" correction
+using trigram similarity over the indexed vocabulary.
+
+The default backend is portable (SQLite included) and does the trigram
+comparison in Python; on Postgres the pg_trgm extension does it in the database.
+"""
+import re
+import unicodedata
+from collections import Counter
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Case, IntegerField, Max, OuterRef, Q, Subquery, Sum, When
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+from django.utils.module_loading import import_string
+
+from .models import Comment, Feedback, SearchTerm, Tag
+from .tasks import enqueue, task
+
+TITLE_WEIGHT = 8
+TAG_WEIGHT = 4
+DESCRIPTION_WEIGHT = 2
+COMMENT_WEIGHT = 1
+# Repeating a word more than this many times in one field stops helping its rank.
+MAX_TERM_FREQUENCY = 3
+MIN_TERM_LENGTH = 2
+MAX_TERM_LENGTH = 64
+MAX_QUERY_TERMS = 8
+
+STOP_WORDS = frozenset("""
+    a an and are as at be but by for from has have i if in into is it its of on or
+    so that the their this to was we were what when which will with you your
+""".split())
+
+_WORD_RE = re.compile(r'[a-z0-9]+')
+
+
+def tokenize(text):
+    """
+    Lowercase, strip accents and split into indexable words.
+    """
+    if not text:
+        return []
+    text = unicodedata.normalize('NFKD', text).encode('ascii', 'ignore').decode('ascii').lower()
+    return [
+        word[:MAX_TERM_LENGTH] for word in _WORD_RE.findall(text)
+        if len(word) >= MIN_TERM_LENGTH and word not in STOP_WORDS
+    ]
+
+
+def document_terms(title='', description='', tag_names=(), comments=()):
+    """
+    Build the weighted term map {term: weight} for one feedback item.
+    """
+    weights = Counter()
+    fields = [(title, TITLE_WEIGHT), (description, DESCRIPTION_WEIGHT)]
+    fields += [(name, TAG_WEIGHT) for name in tag_names]
+    fields += [(content, COMMENT_WEIGHT) for content in comments]
+    for text, weight in fields:
+        for term, frequency in Counter(tokenize(text)).items():
+            weights[term] += weight * min(frequency, MAX_TERM_FREQUENCY)
+    return weights
+
+
+def trigrams(word):
+    padded = f'  {word} '
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def trigram_similarity(a, b):
+    """
+    Same measure as pg_trgm's similarity(): shared trigrams over total distinct trigrams.
+    """
+    ta, tb = trigrams(a), trigrams(b)
+    if not ta or not tb:
+        return 0.0
+    return len(ta & tb) / len(ta | tb)
+
+
+class DatabaseSearchBackend:
+    """
+    Portable backend: postings live in SearchTerm and are queried with the ORM.
+    """
+    suggest_threshold = 0.3
+    suggest_candidate_limit = 5000
+
+    def include_comments(self):
+        return getattr(settings, 'FEEDBACK_SEARCH_INCLUDE_COMMENTS', False)
+
+    def index(self, feedback_ids):
+        """
+        Rebuild the postings of the given feedback ids (missing ids are simply dropped).
+        """
+        feedback_ids = list(feedback_ids)
+        if not feedback_ids:
+            return
+
+        items = Feedback.objects.filter(pk__in=feedback_ids) \
+            .only('id', 'board_id', 'title', 'description') \
+            .prefetch_related('tags')
+        comments = {}
+        if self.include_comments():
+            for feedback_id, content in Comment.objects.filter(feedback_id__in=feedback_ids) \
+                    .values_list('feedback_id', 'content'):
+                comments.setdefault(feedback_id, []).append(content)
+
+        rows = []
+        for item in items:
+            terms = document_terms(
+                item.title, item.description,
+                [tag.name for tag in item.tags.all()],
+                comments.get(item.pk, ()),
+            )
+            rows.extend(
+                SearchTerm(feedback_id=item.pk, board_id=item.board_id, term=term, weight=weight)
+                for term, weight in terms.items()
+            )
+
+        with transaction.atomic():
+            SearchTerm.objects.filter(feedback_id__in=feedback_ids).delete()
+            SearchTerm.objects.bulk_create(rows, batch_size=1000)
+
+    def parse(self, query):
+        terms = tokenize(query)[:MAX_QUERY_TERMS]
+        # Treat the last word as a prefix unless the user has finished typing it.
+        prefix = bool(terms) and not query[-1:].isspace()
+        return terms, prefix
+
+    def hits(self, query, board_ids):
+        """
+        Grouped SearchTerm rows (feedback_id, rank) for items matching every query word.
+        """
+        terms, prefix = self.parse(query)
+
+        conditions = [
+            Q(term__startswith=term) if prefix and i == len(terms) - 1 else Q(term=term)
+            for i, term in enumerate(terms)
+        ]
+        any_condition = Q()
+        for condition in conditions:
+            any_condition |= condition
+
+        matched = sum(
+            Max(Case(When(condition, then=1), default=0, output_field=IntegerField()))
+            for condition in conditions
+        )
+        return SearchTerm.objects.filter(any_condition, board_id__in=board_ids) \
+            .order_by() \
+            .values('feedback_id') \
+            .annotate(rank=Sum('weight'), matched=matched) \
+            .filter(matched=len(conditions))
+
+    def filter_queryset(self, queryset, query, board_ids):
+        """
+        Restrict a Feedback queryset to search matches and annotate `search_rank`.
+        A query made only of stop words or one-letter words matches nothing.
+        """
+        if not self.parse(query)[0]:
+            return queryset.none()
+        hits = self.hits(query, board_ids)
+        rank = hits.filter(feedback_id=OuterRef('pk')).values('rank')[:1]
+        return queryset.filter(pk__in=hits.values('feedback_id')) \
+            .annotate(search_rank=Subquery(rank, output_field=IntegerField()))
+
+    def suggest(self, query, board_ids):
+        """
+        Return a corrected query when some words are not in the index, else None.
+        """
+        words = tokenize(query)[:MAX_QUERY_TERMS]
+        if not words:
+            return None
+
+        known = set(
+            SearchTerm.objects.filter(board_id__in=board_ids, term__in=words)
+            .values_list('term', flat=True).distinct()
+        )
+        corrected = []
+        changed = False
+        for word in words:
+            replacement = word if word in known else (self.closest_term(word, board_ids) or word)
+            changed = changed or replacement != word
+            corrected.append(replacement)
+        return ' '.join(corrected) if changed else None
+
+    def closest_term(self, word, board_ids):
+        candidates = SearchTerm.objects.filter(board_id__in=board_ids, term__startswith=word[0]) \
+            .order_by().values_list('term', flat=True).distinct()[:self.suggest_candidate_limit]
+        best, best_score = None, self.suggest_threshold
+        for candidate in candidates:
+            score = trigram_similarity(word, candidate)
+            if score > best_score:
+                best, best_score = candidate, score
+        return best
+
+
+class PostgresSearchBackend(DatabaseSearchBackend):
+    """
+    Same postings, with "did you mean" served by pg_trgm's GIN index on SearchTerm.term.
+    """
+
+    def closest_term(self, word, board_ids):
+        board_ids = list(board_ids)
+        if not board_ids:
+            return None
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT term, similarity(term, %s) AS score FROM {SearchTerm._meta.db_table} "
+                "WHERE term %% %s AND board_id = ANY(%s) "
+                "GROUP BY term ORDER BY score DESC LIMIT 1",
+                [word, word, board_ids],
+            )
+            row = cursor.fetchone()
+        if row and row[1] > self.suggest_threshold:
+            return row[0]
+        return None
+
+
+_backend = None
+
+
+def get_search_backend():
+    """
+    The backend named by settings.FEEDBACK_SEARCH_BACKEND, or one picked for the database vendor.
+    """
+    global _backend
+    if _backend is None:
+        path = getattr(settings, 'FEEDBACK_SEARCH_BACKEND', None)
+        if path:
+            _backend = import_string(path)()
+        elif connection.vendor == 'postgresql':
+            _backend = PostgresSearchBackend()
+        else:
+            _backend = DatabaseSearchBackend()
+    return _backend
+
+
+REINDEX_CHUNK = 1000
+
+
+def reindex_feedback(feedback_ids):
+    """
+    Queue a reindex of the given feedback ids as a background task.
+    """
+    feedback_ids = sorted(set(feedback_ids))
+    for start in range(0, len(feedback_ids), REINDEX_CHUNK):
+        chunk = feedback_ids[start:start + REINDEX_CHUNK]
+        # Single-item reindexes (the common edit case) collapse while one is pending.
+        key = f'search.reindex:{chunk[0]}' if len(chunk) == 1 else ''
+        enqueue('search.reindex', {'ids': chunk}, key=key)
+
+
+@task('search.reindex')
+def reindex_task(payload):
+    get_search_backend().index(payload['ids'])
+
+
+@task('search.reindex_tag')
+def reindex_tag_task(payload):
+    ids = list(Feedback.objects.filter(tags=payload['tag_id']).values_list('pk', flat=True))
+    for start in range(0, len(ids), REINDEX_CHUNK):
+        get_search_backend().index(ids[start:start + REINDEX_CHUNK])
+
+
+SEARCHED_FIELDS = {'title', 'description'}
+
+
+@receiver(post_save, sender=Feedback)
+def feedback_saved(sender, instance, created, update_fields=None, **kwargs):
+    if update_fields is not None and not SEARCHED_FIELDS.intersection(update_fields):
+        return
+    reindex_feedback([instance.pk])
+
+
+@receiver(m2m_changed, sender=Feedback.tags.through)
+def feedback_tags_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if not reverse:
+        reindex_feedback([instance.pk])
+    elif pk_set:
+        reindex_feedback(pk_set)
+
+
+@receiver(post_save, sender=Tag)
+def tag_saved(sender, instance, created, **kwargs):
+    if not created:
+        enqueue('search.reindex_tag', {'tag_id': instance.pk}, key=f'search.reindex_tag:{instance.pk}')
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def comment_written(sender, instance, **kwargs):
+    if get_search_backend().include_comments():
+        reindex_feedback([instance.feedback_id])
@@ -1,6 +1,9 @@
 from rest_framework import serializers
 from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
-from .models import User, Board, Feedback, Comment, Tag, BoardMembership
+from .models import User, Board, Feedback, Comment, Tag, BoardMembership, DeletionJob
+from .serializers_common import DynamicFieldsMixin, UserMiniSerializer
+from .similarity import index_feedback
+from .tags import resolve_tag_names
 
 
 class UserSerializer(serializers.ModelSerializer):
@@ -26,12 +29,31 @@ class TagSerializer(serializers.ModelSerializer):
         fields = ['id', 'name']
 
 
-class BoardSerializer(serializers.ModelSerializer):
+class TagIdsField(serializers.ListField):
+    """
+    List of existing tag ids, checked with a single query.
+    """
+    child = serializers.IntegerField()
+
+    def to_internal_value(self, data):
+        ids = list(dict.fromkeys(super().to_internal_value(data)))
+        missing = set(ids) - set(Tag.objects.filter(pk__in=ids).values_list('pk', flat=True))
+        if missing:
+            raise serializers.ValidationError(f'Unknown tag ids: {sorted(missing)}')
+        return ids
+
+
+class BoardSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    # Lists carry only the count (annotated by BoardViewSet) unless ?expand=members.
     members = UserSerializer(many=True, read_only=True)
+    member_count = serializers.IntegerField(read_only=True, required=False)
+
+    list_fields = {'members': None}
+    expandable_fields = {'members': (UserSerializer, {'many': True})}
 
     class Meta:
         model = Board
-        fields = ['id', 'name', 'description', 'is_public', 'members', 'created_at', 'updated_at']
+        fields = ['id', 'name', 'description', 'is_public', 'members', 'member_count', 'created_at', 'updated_at']
 
     def create(self, validated_data):
         board = Board.objects.create(**validated_data)
@@ -40,10 +62,17 @@ class BoardSerializer(serializers.ModelSerializer):
         return board
 
 
-class FeedbackSerializer(serializers.ModelSerializer):
+# Fields that feed the near-duplicate index (core.similarity).
+SIMILARITY_FIELDS = {'title', 'description', 'board'}
+
+
+class FeedbackSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     created_by = UserSerializer(read_only=True)
     created_by_username = serializers.CharField(source='created_by.username', read_only=True)
-    upvote_count = serializers.SerializerMethodField()
+    upvote_count = serializers.IntegerField(read_only=True)
+    comment_count = serializers.IntegerField(read_only=True)
+    # Annotated by the views (core.votes.annotate_has_upvoted) for the whole page at once.
+    has_upvoted = serializers.SerializerMethodField()
 
     tags = TagSerializer(many=True, read_only=True)
 
@@ -53,9 +82,7 @@ class FeedbackSerializer(serializers.ModelSerializer):
         required=False,
         help_text="List of new tag names to create or reuse"
     )
-    tag_ids = serializers.PrimaryKeyRelatedField(
-        queryset=Tag.objects.all(),
-        many=True,
+    tag_ids = TagIdsField(
         write_only=True,
         required=False,
         help_text="List of existing tag IDs to link"
@@ -63,32 +90,30 @@ class FeedbackSerializer(serializers.ModelSerializer):
 
     board = serializers.PrimaryKeyRelatedField(queryset=Board.objects.all())
 
+    list_fields = {'created_by': UserMiniSerializer}
+    expandable_fields = {'created_by': UserSerializer}
+
     class Meta:
         model = Feedback
         fields = [
             'id', 'title', 'description', 'status', 'feedback_type',
             'created_at', 'created_by', 'created_by_username',
-            'board', 'tags', 'tag_ids', 'tag_names', 'upvote_count'
+            'board', 'tags', 'tag_ids', 'tag_names', 'upvote_count', 'comment_count', 'has_upvoted'
         ]
 
-    def get_upvote_count(self, obj):
-        return obj.upvotes.count()
-
-    def _process_tags(self, instance, tag_names=None, tag_ids=None):
-        all_tags = list(tag_ids) if tag_ids else []
+    def get_has_upvoted(self, obj):
+        # Rows that weren't annotated are new ones (create responses), with no votes yet.
+        return getattr(obj, 'has_upvoted', False)
 
-        if tag_names:
-            for name in tag_names:
-                clean_name = name.strip()
-                if clean_name:
-                    tag, _ = Tag.objects.get_or_create(
-                        name__iexact=clean_name,
-                        defaults={'name': clean_name}
-                    )
-                    if tag not in all_tags:
-                        all_tags.append(tag)
+    def _process_tags(self, instance, tag_names=None, tag_ids=None, created=False):
+        all_tags = list(dict.fromkeys(list(tag_ids or []) + resolve_tag_names(tag_names or [])))
 
-        instance.tags.set(all_tags)
+        if created:
+            # Nothing to diff against on a new row
+            if all_tags:
+                instance.tags.add(*all_tags)
+        else:
+            instance.tags.set(all_tags)
 
     def create(self, validated_data):
         tag_names = validated_data.pop('tag_names', [])
@@ -100,7 +125,8 @@ class FeedbackSerializer(serializers.ModelSerializer):
         user = self.context['request'].user
         feedback = Feedback.objects.create(created_by=user, **validated_data)
 
-        self._process_tags(feedback, tag_names, tag_ids)
+        self._process_tags(feedback, tag_names, tag_ids, created=True)
+        index_feedback([feedback])
         return feedback
 
     def update(self, instance, validated_data):
@@ -110,6 +136,8 @@ class FeedbackSerializer(serializers.ModelSerializer):
         for attr, value in validated_data.items():
             setattr(instance, attr, value)
         instance.save()
+        if SIMILARITY_FIELDS.intersection(validated_data):
+            index_feedback([instance])
 
         if tag_names is not None or tag_ids is not None:
             self._process_tags(instance, tag_names or [], tag_ids or [])
@@ -117,9 +145,52 @@ class FeedbackSerializer(serializers.ModelSerializer):
         return instance
 
 
-class CommentSerializer(serializers.ModelSerializer):
+class FeedbackBulkSerializer(serializers.Serializer):
+    ACTION_CHOICES = ['move', 'tag', 'untag', 'delete']
+
+    action = serializers.ChoiceField(choices=ACTION_CHOICES)
+    ids = serializers.ListField(child=serializers.IntegerField(), allow_empty=False, max_length=5000)
+    status = serializers.ChoiceField(choices=Feedback.STATUS_CHOICES, required=False)
+    tag_ids = TagIdsField(required=False, max_length=100)
+    tag_names = serializers.ListField(child=serializers.CharField(), required=False, max_length=100)
+
+    def validate(self, attrs):
+        if attrs['action'] == 'move' and not attrs.get('status'):
+            raise serializers.ValidationError({'status': 'This field is required for move.'})
+        if attrs['action'] in ('tag', 'untag') and not (attrs.get('tag_ids') or attrs.get('tag_names')):
+            raise serializers.ValidationError({'tag_ids': f"tag_ids or tag_names is required for {attrs['action']}."})
+        return attrs
+
+
+class CommentImportSerializer(serializers.Serializer):
+    author = serializers.CharField(required=False, allow_blank=True, allow_null=True)
+    content = serializers.CharField()
+    created_at = serializers.DateTimeField(required=False, allow_null=True)
+
+
+class FeedbackImportRowSerializer(serializers.Serializer):
+    """
+    One row of a feedback import (see core.transfer). Users and tags are given by
+    name and resolved in bulk for the whole batch, not per row.
+    """
+    board = serializers.IntegerField()
+    title = serializers.CharField(max_length=255)
+    description = serializers.CharField(required=False, allow_blank=True, default='')
+    status = serializers.ChoiceField(choices=Feedback.STATUS_CHOICES, default=Feedback.STATUS_OPEN)
+    feedback_type = serializers.ChoiceField(choices=Feedback.TYPE_CHOICES, default=Feedback.TYPE_FEATURE)
+    created_by = serializers.CharField(required=False, allow_blank=True, allow_null=True)
+    created_at = serializers.DateTimeField(required=False, allow_null=True)
+    tags = serializers.ListField(child=serializers.CharField(), required=False, default=list)
+    voters = serializers.ListField(child=serializers.CharField(), required=False, default=list)
+    comments = CommentImportSerializer(many=True, required=False, default=list)
+
+
+class CommentSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     created_by = UserSerializer(read_only=True)
 
+    list_fields = {'created_by': UserMiniSerializer}
+    expandable_fields = {'created_by': UserSerializer}
+
     class Meta:
         model = Comment
         fields = ['id', 'content', 'feedback', 'created_by', 'created_at']
@@ -132,6 +203,22 @@ class CommentSerializer(serializers.ModelSerializer):
         return super().create(validated_data)
 
 
+class DeletionJobSerializer(serializers.ModelSerializer):
+    requested_by = UserMiniSerializer(read_only=True)
+    progress = serializers.SerializerMethodField()
+
+    class Meta:
+        model = DeletionJob
+        fields = ['id', 'target', 'target_ids', 'status', 'total', 'deleted', 'progress', 'error',
+                  'requested_by', 'created_at', 'updated_at', 'finished_at']
+        read_only_fields = fields
+
+    def get_progress(self, obj):
+        if obj.status == DeletionJob.DONE or not obj.total:
+            return 1.0 if obj.status == DeletionJob.DONE else 0.0
+        return round(min(obj.deleted / obj.total, 1.0), 3)
+
+
 class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
     @classmethod
     def get_token(cls, user):
@@ -139,4 +226,5 @@ class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
         token['username'] = user.username
         token['role'] = user.role
         token['is_superuser'] = user.is_superuser
+        token['ver'] = user.token_version
         return token
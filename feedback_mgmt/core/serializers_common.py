@@ -5,3 +5,73 @@ class UserMiniSerializer(serializers.ModelSerializer):
     class Meta:
         model = User
         fields = ['id', 'username']
+
+
+def requested_expansions(request):
+    """
+    Names passed in `?expand=a,b` (also used by viewsets to decide what to prefetch).
+    """
+    if request is None:
+        return set()
+    return {name.strip() for name in request.query_params.get('expand', '').split(',') if name.strip()}
+
+
+def field_requested(request, name):
+    """
+    Whether `name` is part of the response under `?fields=` (so views can skip work for dropped fields).
+    """
+    requested = request.query_params.get('fields') if request is not None else None
+    return not requested or name in {field.strip() for field in requested.split(',')}
+
+
+class DynamicFieldsMixin:
+    """
+    Sparse fieldsets for read requests:
+    - `?fields=id,title` keeps only the listed fields.
+    - Lists (many=True) swap the fields in `list_fields` for a compact form
+      (name -> serializer class, or None to drop the field). Single objects
+      keep the full representation.
+    - `?expand=created_by` restores the full form declared in
+      `expandable_fields` (name -> serializer class, or (class, kwargs)), or adds
+      it if it is not part of the representation.
+    Writes always see the full field set.
+    """
+    expandable_fields = {}
+    list_fields = {}
+
+    @classmethod
+    def many_init(cls, *args, **kwargs):
+        list_serializer = super().many_init(*args, **kwargs)
+        list_serializer.child._use_list_fields()
+        return list_serializer
+
+    def _use_list_fields(self):
+        request = self.context.get('request')
+        if request is None or request.method not in ('GET', 'HEAD', 'OPTIONS'):
+            return
+        expanded = requested_expansions(request)
+        for name, serializer_class in self.list_fields.items():
+            if name not in self.fields or name in expanded:
+                continue
+            if serializer_class is None:
+                self.fields.pop(name)
+            else:
+                self.fields[name] = serializer_class(read_only=True)
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        request = self.context.get('request')
+        if request is None or request.method not in ('GET', 'HEAD', 'OPTIONS'):
+            return
+
+        for name in requested_expansions(request) & set(self.expandable_fields):
+            serializer_class, field_kwargs = self.expandable_fields[name], {}
+            if isinstance(serializer_class, tuple):
+                serializer_class, field_kwargs = serializer_class
+            self.fields[name] = serializer_class(read_only=True, **field_kwargs)
+
+        requested = request.query_params.get('fields')
+        if requested:
+            keep = {name.strip() for name in requested.split(',')}
+            for name in set(self.fields) - keep:
+                self.fields.pop(name)
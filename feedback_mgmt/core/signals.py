@@ -0,0 +1,78 @@
+from contextvars import ContextVar
+from functools import partial
+
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import Signal, receiver
+
+from .models import Comment, Feedback, Tag
+
+# Sent (after commit) whenever feedback data on a board changes.
+# Receivers get `board_ids`, an iterable of affected board ids.
+board_data_changed = Signal()
+
+# {database alias: feedback ids of the comments written since the last flush}.
+_comment_feedback_ids = ContextVar('comment_feedback_ids', default=None)
+
+
+def notify_boards_changed(board_ids):
+    board_ids = {board_id for board_id in board_ids if board_id is not None}
+    if board_ids:
+        transaction.on_commit(lambda: board_data_changed.send(sender=Feedback, board_ids=board_ids))
+
+
+@receiver(post_save, sender=Feedback)
+@receiver(post_delete, sender=Feedback)
+def feedback_written(sender, instance, **kwargs):
+    notify_boards_changed([instance.board_id])
+
+
+@receiver(m2m_changed, sender=Feedback.tags.through)
+def feedback_tags_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ('post_add', 'post_remove', 'post_clear', 'pre_clear'):
+        return
+    if not reverse:
+        if action != 'pre_clear':
+            notify_boards_changed([instance.board_id])
+        return
+
+    # tag.feedbacks.add(...) and friends: pk_set holds feedback ids.
+    if action in ('post_add', 'post_remove') and pk_set:
+        notify_boards_changed(Feedback.objects.filter(pk__in=pk_set).values_list('board_id', flat=True).distinct())
+    elif action == 'pre_clear':
+        notify_boards_changed(instance.feedbacks.values_list('board_id', flat=True).distinct())
+
+
+@receiver(post_save, sender=Tag)
+@receiver(pre_delete, sender=Tag)
+def tag_written(sender, instance, created=False, **kwargs):
+    if created:
+        return
+    notify_boards_changed(Feedback.objects.filter(tags=instance).values_list('board_id', flat=True).distinct())
+
+
+def _flush_comment_boards(using):
+    """
+    Notify the boards of the comments written since the last flush. They are
+    looked up in one query, so cascade and bulk comment deletes don't load each
+    comment's feedback.
+    """
+    pending = _comment_feedback_ids.get()
+    feedback_ids = pending.pop(using, None) if pending else None
+    if feedback_ids:
+        notify_boards_changed(Feedback.all_objects.filter(pk__in=feedback_ids)
+                              .values_list('board_id', flat=True).distinct())
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def comment_written(sender, instance, using=None, **kwargs):
+    pending = _comment_feedback_ids.get()
+    if pending is None:
+        pending = {}
+        _comment_feedback_ids.set(pending)
+    pending.setdefault(using, set()).add(instance.feedback_id)
+    # Every write queues the same flush; the first to run after commit takes the
+    # whole batch and the others find it empty. A rollback drops its callbacks,
+    # and the ids it left behind go out with the next commit's flush.
+    transaction.on_commit(partial(_flush_comment_boards, using), using=using)
@@ -0,0 +1,157 @@
+"""
+Near-duplicate detection for feedback.
+
+Each item is reduced to a set of shingles (title words and their trigrams,
+so typos and plurals still overlap, plus the leading description words) and
+summarised by a MinHash signature of NUM_BANDS * BAND_ROWS values. The
+signature is cut into bands and each band hashed to a bucket, stored in
+SimilarityBand. Two items land in a common bucket with probability
+1 - (1 - J**BAND_ROWS)**NUM_BANDS for Jaccard similarity J (about 0.9 at
+J=0.5 and 0.15 at J=0.2), so a lookup is one indexed `bucket IN (...)`
+query on the board however many items it holds. The few candidates found
+are then scored exactly on their shingles.
+
+Bands are written inline by FeedbackSerializer, so an item can be found
+as a duplicate right after it is submitted.
+"""
+import hashlib
+import random
+from collections import Counter
+
+from django.db import transaction
+from django.db.models import Count
+
+from .models import Feedback, SimilarityBand
+from .search import tokenize, trigrams
+from .tasks import enqueue, task
+
+NUM_BANDS = 20
+BAND_ROWS = 3
+DESCRIPTION_WORDS = 30
+CANDIDATE_LIMIT = 50
+MIN_SIMILARITY = 0.3
+INDEX_CHUNK = 1000
+
+_PRIME = (1 << 61) - 1
+_rng = random.Random(0x5eed)
+# Fixed seeds: signatures stored by one process must match those computed by another.
+_PERMUTATIONS = [
+    (_rng.randrange(1, _PRIME), _rng.randrange(0, _PRIME))
+    for _ in range(NUM_BANDS * BAND_ROWS)
+]
+
+
+def _hash64(text):
+    return int.from_bytes(hashlib.blake2b(text.encode(), digest_size=8).digest(), 'little')
+
+
+def shingles(title='', description=''):
+    words = tokenize(title)
+    result = set(words)
+    for word in words:
+        result.update(trigrams(word))
+    result.update(tokenize(description)[:DESCRIPTION_WORDS])
+    return result
+
+
+def signature(shingle_set):
+    hashes = [_hash64(shingle) for shingle in shingle_set]
+    return [min((a * h + b) % _PRIME for h in hashes) for a, b in _PERMUTATIONS]
+
+
+def band_buckets(values):
+    """
+    [(band, bucket)] for a signature; the band number is hashed in, so one
+    `bucket IN (...)` condition covers every band.
+    """
+    buckets = []
+    for band in range(NUM_BANDS):
+        rows = values[band * BAND_ROWS:(band + 1) * BAND_ROWS]
+        digest = hashlib.blake2b(f'{band}:{rows}'.encode(), digest_size=8).digest()
+        buckets.append((band, int.from_bytes(digest, 'little', signed=True)))
+    return buckets
+
+
+def similarity(query_shingles, item_shingles):
+    """
+    Share of the query's shingles found in the item: a partial title typed so
+    far scores high against the full item it duplicates.
+    """
+    if not query_shingles:
+        return 0.0
+    return len(query_shingles & item_shingles) / len(query_shingles)
+
+
+def index_feedback(items):
+    """
+    Rewrite the bands of the given Feedback instances (id, board_id, title and description loaded).
+    """
+    items = list(items)
+    if not items:
+        return
+    rows = []
+    for item in items:
+        item_shingles = shingles(item.title, item.description)
+        if not item_shingles:
+            continue
+        rows.extend(
+            SimilarityBand(feedback_id=item.pk, board_id=item.board_id, band=band, bucket=bucket)
+            for band, bucket in band_buckets(signature(item_shingles))
+        )
+    with transaction.atomic():
+        SimilarityBand.objects.filter(feedback_id__in=[item.pk for item in items]).delete()
+        SimilarityBand.objects.bulk_create(rows, batch_size=1000)
+
+
+def index_ids(feedback_ids):
+    feedback_ids = list(feedback_ids)
+    for start in range(0, len(feedback_ids), INDEX_CHUNK):
+        index_feedback(
+            Feedback.objects.filter(pk__in=feedback_ids[start:start + INDEX_CHUNK])
+            .only('id', 'board_id', 'title', 'description')
+        )
+
+
+def reindex_similarity(feedback_ids):
+    """
+    Queue band rebuilds for feedback written in bulk, outside the serializer.
+    """
+    feedback_ids = sorted(set(feedback_ids))
+    for start in range(0, len(feedback_ids), INDEX_CHUNK):
+        enqueue('similarity.index', {'ids': feedback_ids[start:start + INDEX_CHUNK]})
+
+
+@task('similarity.index')
+def index_task(payload):
+    index_ids(payload['ids'])
+
+
+def find_similar(board_id, title, description='', limit=5, exclude=None):
+    """
+    Feedback on `board_id` resembling the given text, best first, each with a
+    `similarity` attribute in [0, 1]. Items scoring under MIN_SIMILARITY are dropped.
+    """
+    query_shingles = shingles(title, description)
+    if not query_shingles:
+        return []
+    buckets = [bucket for _, bucket in band_buckets(signature(query_shingles))]
+
+    candidates = SimilarityBand.objects.filter(board_id=board_id, bucket__in=buckets)
+    if exclude:
+        candidates = candidates.exclude(feedback_id=exclude)
+    hits = Counter(dict(
+        candidates.order_by().values('feedback_id').annotate(hits=Count('pk'))
+        .order_by('-hits').values_list('feedback_id', 'hits')[:CANDIDATE_LIMIT]
+    ))
+    if not hits:
+        return []
+
+    items = Feedback.objects.filter(pk__in=hits) \
+        .only('id', 'board_id', 'title', 'description', 'status', 'upvote_count')
+    results = []
+    for item in items:
+        item.similarity = round(similarity(query_shingles, shingles(item.title, item.description)), 3)
+        if item.similarity >= MIN_SIMILARITY:
+            results.append(item)
+    results.sort(key=lambda item: (-item.similarity, -hits[item.pk], -item.upvote_count, item.pk))
+    return results[:limit]
@@ -0,0 +1,69 @@
+from datetime import timedelta
+
+from django.db.models import Count, Q, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from .models import Feedback, Tag
+
+STATS_DAYS = 30
+STATS_TOP_CREATORS = 20
+
+
+def compute_board_stats(board):
+    """
+    The dashboard numbers for a board. BoardViewSet.stats serves them through
+    the versioned response cache, so they are only recomputed after a write.
+    """
+    feedbacks = Feedback.objects.filter(board_id=board.pk).order_by()
+
+    by_status = {key: 0 for key, _ in Feedback.STATUS_CHOICES}
+    by_type = {key: 0 for key, _ in Feedback.TYPE_CHOICES}
+    total = 0
+    upvotes = 0
+    # One grouped pass gives status, type, total and vote totals together.
+    for row in feedbacks.values('status', 'feedback_type').annotate(n=Count('id'), votes=Sum('upvote_count')):
+        by_status[row['status']] = by_status.get(row['status'], 0) + row['n']
+        by_type[row['feedback_type']] = by_type.get(row['feedback_type'], 0) + row['n']
+        total += row['n']
+        upvotes += row['votes'] or 0
+
+    by_tag = list(
+        Tag.objects.filter(feedbacks__board_id=board.pk, feedbacks__deleted_at__isnull=True)
+        .values('id', 'name')
+        .annotate(count=Count('feedbacks', filter=Q(feedbacks__deleted_at__isnull=True)))
+        .order_by('-count', 'name')
+    )
+
+    by_creator = [
+        {'id': row['created_by'], 'username': row['created_by__username'], 'count': row['count']}
+        for row in feedbacks.values('created_by', 'created_by__username')
+        .annotate(count=Count('id'))
+        .order_by('-count')[:STATS_TOP_CREATORS]
+    ]
+
+    since = timezone.now() - timedelta(days=STATS_DAYS - 1)
+    by_day = [
+        {'date': row['day'].isoformat(), 'count': row['count']}
+        for row in feedbacks.filter(created_at__gte=since)
+        .annotate(day=TruncDate('created_at'))
+        .values('day')
+        .annotate(count=Count('id'))
+        .order_by('day')
+    ]
+
+    top = feedbacks.order_by('-upvote_count', '-id') \
+        .values('id', 'title', 'description', 'status', 'upvote_count').first()
+
+    return {
+        'board': board.pk,
+        'total': total,
+        'upvotes': upvotes,
+        'by_status': by_status,
+        'by_type': by_type,
+        'by_tag': by_tag,
+        'by_creator': by_creator,
+        'by_day': by_day,
+        'top_voted': top,
+    }
+
@@ -0,0 +1,170 @@
+"""
+Synthetic data for load tests and benchmarks.
+
+Popularity is skewed the way real boards are: a few boards get most of the
+feedback, a few items get most of the votes and comments, and titles draw
+from a Zipf-weighted vocabulary so search terms have realistic frequencies.
+Everything is written with bulk_create and the denormalized counters are
+filled in up front, so a hundred thousand rows take seconds, not minutes.
+"""
+import random
+from datetime import timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+from django.utils import timezone
+
+from .models import Board, BoardMembership, Comment, Feedback, Tag, User, Vote
+from .ranking import recompute_scores
+from .search import get_search_backend
+from .similarity import index_ids
+from .signals import notify_boards_changed
+
+WORDS = """
+    login signup password export import dashboard report chart filter search sort
+    notification email mobile android ios dark theme layout sidebar kanban board
+    comment upvote tag status slow crash error timeout upload download csv pdf
+    calendar reminder integration slack github api webhook token permission role
+    admin invite team workspace billing invoice plan trial onboarding tutorial
+    shortcut keyboard accessibility contrast font language translation timezone
+""".split()
+STATUSES = [key for key, _ in Feedback.STATUS_CHOICES]
+STATUS_WEIGHTS = [6, 3, 1]
+TYPES = [key for key, _ in Feedback.TYPE_CHOICES]
+PASSWORD = 'synthetic'
+
+
+def zipf_weights(n, exponent):
+    return [1.0 / (rank ** exponent) for rank in range(1, n + 1)]
+
+
+class SyntheticDataGenerator:
+
+    def __init__(self, boards=20, users=500, feedback=10000, tags=50, comments=2.0, votes=20.0,
+                 exponent=1.1, private_ratio=0.2, days=180, prefix='syn', seed=0, batch_size=2000):
+        self.counts = {'boards': boards, 'users': users, 'feedback': feedback, 'tags': tags}
+        self.mean_comments = comments
+        self.mean_votes = votes
+        self.exponent = exponent
+        self.private_ratio = private_ratio
+        self.days = days
+        self.prefix = prefix
+        self.batch_size = batch_size
+        self.random = random.Random(seed)
+        self.word_weights = zipf_weights(len(WORDS), exponent)
+
+    def run(self, index=True, log=None):
+        log = log or (lambda message: None)
+        with transaction.atomic():
+            users = self.create_users()
+            log(f'{len(users)} users')
+            boards = self.create_boards()
+            memberships = self.create_memberships(users, boards)
+            log(f'{len(boards)} boards, {memberships} memberships')
+            tags = self.create_tags()
+            log(f'{len(tags)} tags')
+            feedback_ids = self.create_feedback(users, boards, tags, log)
+            notify_boards_changed([board.pk for board in boards])
+        recompute_scores(Feedback.objects.filter(board__in=boards))
+        log('rankings computed')
+        if index:
+            backend = get_search_backend()
+            for start in range(0, len(feedback_ids), self.batch_size):
+                backend.index(feedback_ids[start:start + self.batch_size])
+            log('search index built')
+            index_ids(feedback_ids)
+            log('similarity index built')
+        return {'users': len(users), 'boards': len(boards), 'feedback': len(feedback_ids)}
+
+    def create_users(self):
+        password = make_password(PASSWORD)
+        users = [
+            User(username=f'{self.prefix}_user_{i}', password=password,
+                 role=User.ADMIN if i == 0 else User.CONTRIBUTOR)
+            for i in range(self.counts['users'])
+        ]
+        return User.objects.bulk_create(users, batch_size=self.batch_size)
+
+    def create_boards(self):
+        boards = [
+            Board(name=f'{self.prefix} board {i}', description=self.sentence(12),
+                  is_public=self.random.random() >= self.private_ratio)
+            for i in range(self.counts['boards'])
+        ]
+        return Board.objects.bulk_create(boards, batch_size=self.batch_size)
+
+    def create_memberships(self, users, boards):
+        weights = zipf_weights(len(boards), self.exponent)
+        rows = set()
+        for user in users:
+            for board in self.random.choices(boards, weights, k=self.random.randint(1, 4)):
+                rows.add((user.pk, board.pk))
+        BoardMembership.objects.bulk_create(
+            [BoardMembership(user_id=user_id, board_id=board_id) for user_id, board_id in rows],
+            batch_size=self.batch_size,
+        )
+        return len(rows)
+
+    def create_tags(self):
+        names = [f'{self.prefix}-{word}' for word in self.random.sample(WORDS, min(self.counts['tags'], len(WORDS)))]
+        names += [f'{self.prefix}-tag-{i}' for i in range(self.counts['tags'] - len(names))]
+        Tag.objects.bulk_create([Tag(name=name) for name in names], ignore_conflicts=True)
+        return list(Tag.objects.filter(name__in=names))
+
+    def sentence(self, words):
+        return ' '.join(self.random.choices(WORDS, self.word_weights, k=words))
+
+    def create_feedback(self, users, boards, tags, log):
+        board_weights = zipf_weights(len(boards), self.exponent)
+        tag_weights = zipf_weights(len(tags), self.exponent)
+        total = self.counts['feedback']
+        # Popularity rank is shuffled so the most voted items aren't also the oldest ones.
+        ranks = list(range(1, total + 1))
+        self.random.shuffle(ranks)
+        norm = sum(zipf_weights(total, self.exponent)) / total if total else 1
+        now = timezone.now()
+        feedback_ids = []
+
+        for start in range(0, total, self.batch_size):
+            items, plans = [], []
+            for rank in ranks[start:start + self.batch_size]:
+                popularity = (1.0 / rank ** self.exponent) / norm
+                voters = self.random.sample(users, min(len(users), int(self.mean_votes * popularity)))
+                comment_count = min(200, int(self.random.expovariate(1.0) * self.mean_comments * popularity ** 0.5))
+                items.append(Feedback(
+                    board=self.random.choices(boards, board_weights)[0],
+                    created_by=self.random.choice(users),
+                    title=self.sentence(self.random.randint(3, 8)).capitalize(),
+                    description=self.sentence(self.random.randint(10, 40)),
+                    feedback_type=self.random.choice(TYPES),
+                    status=self.random.choices(STATUSES, STATUS_WEIGHTS)[0],
+                    upvote_count=len(voters),
+                    comment_count=comment_count,
+                ))
+                plans.append((voters, comment_count))
+
+            Feedback.objects.bulk_create(items, batch_size=self.batch_size)
+            # auto_now_add ignores values given to bulk_create; spread creation dates afterwards.
+            for item in items:
+                item.created_at = now - timedelta(seconds=self.random.randint(0, self.days * 86400))
+            Feedback.objects.bulk_update(items, ['created_at'], batch_size=self.batch_size)
+
+            links, votes, comments = [], [], []
+            Link = Feedback.tags.through
+            for item, (voters, comment_count) in zip(items, plans):
+                for tag in set(self.random.choices(tags, tag_weights, k=self.random.randint(0, 3))):
+                    links.append(Link(feedback_id=item.pk, tag_id=tag.pk))
+                votes.extend(Vote(feedback_id=item.pk, user_id=user.pk) for user in voters)
+                comments.extend(
+                    Comment(feedback_id=item.pk, created_by=self.random.choice(users),
+                            content=self.sentence(self.random.randint(5, 25)))
+                    for _ in range(comment_count)
+                )
+            Link.objects.bulk_create(links, batch_size=self.batch_size)
+            Vote.objects.bulk_create(votes, batch_size=self.batch_size)
+            Comment.objects.bulk_create(comments, batch_size=self.batch_size)
+
+            feedback_ids.extend(item.pk for item in items)
+            log(f'{len(feedback_ids)}/{total} feedback')
+        return feedback_ids
+
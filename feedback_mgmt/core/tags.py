@@ -0,0 +1,135 @@
+import threading
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models.functions import Lower
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Tag
+
+TAG_NAME_MAX_LENGTH = Tag._meta.get_field('name').max_length
+GENERATION_KEY = 'tags:generation'
+
+
+class TagIdCache:
+    """
+    Process-local LRU of lowercased tag name -> tag id.
+
+    Renames and deletes bump a generation number in the shared cache; every
+    lookup compares it with the generation the local entries were filled under,
+    so other processes drop stale names on their next resolve.
+    """
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.generation = None
+        self.lock = threading.Lock()
+
+    def sync(self):
+        generation = cache.get(GENERATION_KEY, 0)
+        with self.lock:
+            if generation != self.generation:
+                self.entries.clear()
+                self.generation = generation
+
+    def get_many(self, keys):
+        found = {}
+        with self.lock:
+            for key in keys:
+                if key in self.entries:
+                    self.entries.move_to_end(key)
+                    found[key] = self.entries[key]
+        return found
+
+    def set_many(self, mapping):
+        with self.lock:
+            for key, value in mapping.items():
+                self.entries[key] = value
+                self.entries.move_to_end(key)
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+
+tag_id_cache = TagIdCache(getattr(settings, 'TAG_ID_CACHE_SIZE', 4096))
+
+
+def normalize_tag_name(name):
+    """
+    Trim and collapse whitespace; names longer than the column allows are cut.
+    """
+    return ' '.join(str(name).split())[:TAG_NAME_MAX_LENGTH]
+
+
+def resolve_tag_names(names, create=True):
+    """
+    Map tag names to tag ids, creating the missing tags (unless `create` is False,
+    in which case unknown names are skipped).
+
+    Matching is case-insensitive and the first spelling seen wins for new tags.
+    Costs at most one lookup, one bulk insert and one re-read, whatever the
+    number of names, and nothing at all for names already in the local cache.
+    Returns ids in the order the names were given, without duplicates.
+    """
+    mapping = resolve_tag_map(names, create=create)
+    return list(dict.fromkeys(mapping.values()))
+
+
+def resolve_tag_map(names, create=True):
+    """
+    Like resolve_tag_names(), but returns {lowercased normalized name: tag id}.
+    """
+    spellings = OrderedDict()
+    for name in names:
+        name = normalize_tag_name(name)
+        if name:
+            spellings.setdefault(name.lower(), name)
+    if not spellings:
+        return {}
+
+    tag_id_cache.sync()
+    resolved = tag_id_cache.get_many(spellings)
+
+    missing = [key for key in spellings if key not in resolved]
+    if missing:
+        found = _lookup(missing)
+        to_create = [Tag(name=spellings[key]) for key in missing if key not in found] if create else []
+        if to_create:
+            # Another request may create the same names concurrently; the unique
+            # constraint turns that into a no-op and the re-read picks up its rows.
+            Tag.objects.bulk_create(to_create, ignore_conflicts=True)
+            found.update(_lookup([key for key in missing if key not in found]))
+        tag_id_cache.set_many(found)
+        resolved.update(found)
+
+    return OrderedDict((key, resolved[key]) for key in spellings if key in resolved)
+
+
+def _lookup(keys):
+    found = {}
+    rows = Tag.objects.annotate(lower_name=Lower('name')) \
+        .filter(lower_name__in=keys) \
+        .order_by('pk') \
+        .values_list('lower_name', 'pk')
+    for key, pk in rows:
+        found.setdefault(key, pk)
+    return found
+
+
+@receiver(post_save, sender=Tag)
+@receiver(post_delete, sender=Tag)
+def tag_written(sender, instance, created=False, **kwargs):
+    if created:
+        return
+    # A rename or delete can make cached names point at the wrong (or no) tag.
+    tag_id_cache.clear()
+    try:
+        cache.incr(GENERATION_KEY)
+    except ValueError:
+        cache.set(GENERATION_KEY, 1, None)
@@ -0,0 +1,157 @@
+"""
+Background tasks through a transactional outbox.
+
+`enqueue()` writes a Task row in the caller's transaction, so the job exists
+if and only if the write that caused it commits, and the request pays for one
+INSERT. Workers (`manage.py run_worker`) claim due rows, run the registered
+handler and delete the row on success. A failed run is retried with
+exponential backoff until max_attempts, then left as FAILED for inspection.
+
+Claims use SELECT ... FOR UPDATE SKIP LOCKED where the database supports it
+(Postgres); elsewhere each row is claimed by a conditional UPDATE on its
+status, which SQLite's single writer makes safe. A RUNNING row whose worker
+died is released again after settings.TASK_LOCK_TIMEOUT seconds, so a
+handler must tolerate running twice.
+
+With settings.TASKS_EAGER the handler runs in-process on commit instead,
+for development without a worker.
+"""
+import logging
+import os
+import random
+import socket
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, connection, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import Task
+
+logger = logging.getLogger(__name__)
+
+LOCK_TIMEOUT = getattr(settings, 'TASK_LOCK_TIMEOUT', 300)
+BACKOFF_BASE = getattr(settings, 'TASK_BACKOFF_SECONDS', 5)
+BACKOFF_MAX = 3600
+
+_handlers = {}
+
+
+def task(name):
+    """
+    Register `func(payload)` as the handler for tasks called `name`.
+    """
+    def register(func):
+        _handlers[name] = func
+        return func
+    return register
+
+
+def get_handler(name):
+    return _handlers[name]
+
+
+def tasks_eager():
+    return getattr(settings, 'TASKS_EAGER', False)
+
+
+def enqueue(name, payload=None, key='', delay=0, max_attempts=5):
+    """
+    Schedule handler `name` with a JSON payload. A non-empty `key` makes the
+    call a no-op while a pending task with the same key is waiting.
+    """
+    if name not in _handlers:
+        raise KeyError(f'No task handler registered for {name!r}')
+    payload = payload or {}
+
+    if tasks_eager():
+        transaction.on_commit(lambda: _handlers[name](payload))
+        return
+
+    Task.objects.bulk_create([Task(
+        name=name,
+        payload=payload,
+        dedupe_key=key,
+        max_attempts=max_attempts,
+        run_after=timezone.now() + timedelta(seconds=delay),
+    )], ignore_conflicts=bool(key))
+
+
+def _requeue(pk, **fields):
+    try:
+        with transaction.atomic():
+            Task.objects.filter(pk=pk).update(status=Task.PENDING, locked_by='', locked_at=None, **fields)
+    except IntegrityError:
+        # A pending task with the same key was queued meanwhile; it covers this work.
+        Task.objects.filter(pk=pk).delete()
+
+
+def release_stale(now=None):
+    """
+    Put back RUNNING tasks locked for longer than LOCK_TIMEOUT (worker crashed or killed mid-run).
+    """
+    now = now or timezone.now()
+    stale = Task.objects.filter(status=Task.RUNNING, locked_at__lt=now - timedelta(seconds=LOCK_TIMEOUT))
+    pks = list(stale.values_list('pk', flat=True))
+    for pk in pks:
+        _requeue(pk)
+    return len(pks)
+
+
+def claim(worker, limit=10):
+    """
+    Mark up to `limit` due tasks as RUNNING for `worker` and return them.
+    """
+    now = timezone.now()
+    due = Task.objects.filter(status=Task.PENDING, run_after__lte=now).order_by('run_after', 'pk')
+    claimed = {'status': Task.RUNNING, 'locked_by': worker, 'locked_at': now, 'attempts': F('attempts') + 1}
+
+    if connection.features.has_select_for_update_skip_locked:
+        with transaction.atomic():
+            ids = list(due.select_for_update(skip_locked=True).values_list('pk', flat=True)[:limit])
+            Task.objects.filter(pk__in=ids).update(**claimed)
+    else:
+        ids = []
+        for pk in due.values_list('pk', flat=True)[:limit]:
+            if Task.objects.filter(pk=pk, status=Task.PENDING).update(**claimed):
+                ids.append(pk)
+    return list(Task.objects.filter(pk__in=ids).order_by('run_after', 'pk'))
+
+
+def backoff(attempts):
+    delay = min(BACKOFF_MAX, BACKOFF_BASE * 2 ** (attempts - 1))
+    return delay * random.uniform(0.8, 1.2)
+
+
+def execute(task_row):
+    """
+    Run one claimed task and record the outcome. Returns True on success.
+    """
+    try:
+        get_handler(task_row.name)(task_row.payload)
+    except Exception:
+        error = traceback.format_exc()
+        logger.warning('Task %s #%s failed (attempt %s/%s)', task_row.name, task_row.pk,
+                       task_row.attempts, task_row.max_attempts)
+        if task_row.attempts >= task_row.max_attempts:
+            Task.objects.filter(pk=task_row.pk).update(status=Task.FAILED, last_error=error, locked_by='')
+        else:
+            retry_at = timezone.now() + timedelta(seconds=backoff(task_row.attempts))
+            _requeue(task_row.pk, run_after=retry_at, last_error=error)
+        return False
+    Task.objects.filter(pk=task_row.pk).delete()
+    return True
+
+
+def work(worker=None, limit=10):
+    """
+    One polling round: release stale locks, claim, run. Returns the number of tasks run.
+    """
+    worker = worker or f'{socket.gethostname()}:{os.getpid()}'
+    release_stale()
+    claimed = claim(worker, limit)
+    for task_row in claimed:
+        execute(task_row)
+    return len(claimed)
@@ -0,0 +1,60 @@
+"""
+Helpers for tests that pin the number of queries an endpoint may run.
+
+    class FeedbackQueryTests(QueryBudgetMixin, APITestCase):
+        def test_list(self):
+            self.assertEndpointBudget('get', '/api/feedback/?board=1', 5)
+
+A failing budget reports the statements that ran, most repeated first, so an
+N+1 shows up in the assertion message rather than in production.
+"""
+from collections import Counter
+from contextlib import contextmanager
+
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.test.utils import CaptureQueriesContext
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+def describe_queries(queries, limit=10):
+    counts = Counter(query['sql'] for query in queries)
+    return '\n'.join(f'  {count}x {sql}' for sql, count in counts.most_common(limit))
+
+
+@contextmanager
+def query_budget(limit, using=DEFAULT_DB_ALIAS, label='block'):
+    """
+    Fail if the wrapped block runs more than `limit` queries on `using`.
+    """
+    with CaptureQueriesContext(connections[using]) as context:
+        yield context
+    if len(context) > limit:
+        raise QueryBudgetExceeded(
+            f'{label} ran {len(context)} queries, budget is {limit}:\n{describe_queries(context.captured_queries)}'
+        )
+
+
+class QueryBudgetMixin:
+    """
+    For TestCase subclasses with a DRF APIClient in `self.client`.
+    """
+
+    def assertQueryBudget(self, limit, using=DEFAULT_DB_ALIAS):
+        return query_budget(limit, using=using)
+
+    def assertEndpointBudget(self, method, path, limit, expected_status=None, **kwargs):
+        with query_budget(limit, label=f'{method.upper()} {path}'):
+            response = getattr(self.client, method.lower())(path, **kwargs)
+        if expected_status is not None:
+            self.assertEqual(response.status_code, expected_status)
+        return response
+
+    def assertEndpointBudgets(self, budgets, **kwargs):
+        """
+        budgets: {(method, path): max_queries}
+        """
+        for (method, path), limit in budgets.items():
+            self.assertEndpointBudget(method, path, limit, **kwargs)
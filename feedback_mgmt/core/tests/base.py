@@ -0,0 +1,45 @@
+from django.core.cache import caches
+from rest_framework.test import APITestCase
+
+from core import tasks
+from core.models import Board, BoardMembership, Feedback, User
+from core.serializers import CustomTokenObtainPairSerializer
+from core.tags import tag_id_cache
+from core.testing import QueryBudgetMixin
+
+
+class CoreAPITestCase(QueryBudgetMixin, APITestCase):
+    """
+    Clears the caches between tests (access sets, cached responses and tag ids
+    would otherwise outlive the rolled-back rows) and has small fixture helpers.
+    """
+
+    def setUp(self):
+        super().setUp()
+        for cache in caches.all():
+            cache.clear()
+        tag_id_cache.clear()
+
+    def make_user(self, username, role=User.CONTRIBUTOR, **fields):
+        return User.objects.create_user(username, password='pass', role=role, **fields)
+
+    def make_board(self, name='Board', is_public=True, members=()):
+        board = Board.objects.create(name=name, is_public=is_public)
+        for user in members:
+            BoardMembership.objects.create(board=board, user=user)
+        return board
+
+    def make_feedback(self, board, user, title='Feedback', **fields):
+        return Feedback.objects.create(board=board, created_by=user, title=title, **fields)
+
+    def login(self, user):
+        """
+        Authenticate with a real access token, so CachedJWTAuthentication runs.
+        """
+        token = CustomTokenObtainPairSerializer.get_token(user).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+        return token
+
+    def run_tasks(self):
+        while tasks.work():
+            pass
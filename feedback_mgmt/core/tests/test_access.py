@@ -0,0 +1,76 @@
+from core.models import Board, BoardMembership, User
+
+from .base import CoreAPITestCase
+
+
+class AccessSetInvalidationTests(CoreAPITestCase):
+    """
+    The cached access set follows membership, visibility and role changes as
+    soon as they commit.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.admin = self.make_user('admin', role=User.ADMIN)
+        self.alice = self.make_user('alice')
+        self.public = self.make_board('Public')
+        self.private = self.make_board('Private', is_public=False, members=[self.alice, self.admin])
+        self.feedback = self.make_feedback(self.private, self.alice)
+        self.login(self.alice)
+
+    def board_names(self):
+        return [board['name'] for board in self.client.get('/api/boards/').data['results']]
+
+    def can_read_private(self):
+        return self.client.get(f'/api/feedback/{self.feedback.pk}/').status_code == 200
+
+    def test_removed_members_lose_the_board(self):
+        self.assertEqual(self.board_names(), ['Public', 'Private'])
+        self.assertTrue(self.can_read_private())
+
+        with self.captureOnCommitCallbacks(execute=True):
+            BoardMembership.objects.get(user=self.alice, board=self.private).delete()
+
+        self.assertEqual(self.board_names(), ['Public'])
+        self.assertFalse(self.can_read_private())
+
+    def test_added_members_gain_the_board(self):
+        bob = self.make_user('bob')
+        self.login(bob)
+        self.assertEqual(self.board_names(), ['Public'])
+
+        self.login(self.admin)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(f'/api/boards/{self.private.pk}/add-member/', {'username': 'bob'})
+        self.assertEqual(response.status_code, 200)
+
+        self.login(bob)
+        self.assertEqual(self.board_names(), ['Public', 'Private'])
+
+    def test_visibility_flips_apply_to_non_members(self):
+        self.login(self.make_user('bob'))
+        self.assertFalse(self.can_read_private())
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.private.is_public = True
+            self.private.save()
+        self.assertTrue(self.can_read_private())
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.private.is_public = False
+            self.private.save()
+        self.assertFalse(self.can_read_private())
+
+    def test_role_changes_apply_to_the_next_request(self):
+        self.login(self.admin)
+        self.assertEqual(self.client.post('/api/boards/', {'name': 'New'}).status_code, 201)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.admin.role = User.CONTRIBUTOR
+            self.admin.save()
+
+        # The role is part of the token state, so the old token is revoked outright.
+        self.assertEqual(self.client.post('/api/boards/', {'name': 'Newer'}).status_code, 401)
+        self.login(self.admin)
+        self.assertEqual(self.client.post('/api/boards/', {'name': 'Newer'}).status_code, 403)
+        self.assertEqual(self.board_names(), ['Public', 'Private', 'New'])
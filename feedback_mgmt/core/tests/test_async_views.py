@@ -0,0 +1,81 @@
+import asyncio
+import json
+
+from asgiref.sync import sync_to_async
+from django.core.cache import caches
+from django.test import override_settings
+from django.urls import resolve
+
+from core.benchmarks import _urlconf
+from core.models import Comment, Tag
+
+from .base import CoreAPITestCase
+
+ASYNC_URLS = _urlconf(async_reads=True)
+SYNC_URLS = _urlconf(async_reads=False)
+
+
+class AsyncReadPathTests(CoreAPITestCase):
+    """
+    The async list/detail routes answer exactly as the sync viewsets do.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.alice = self.make_user('alice')
+        self.bob = self.make_user('bob')
+        self.board = self.make_board()
+        self.private = self.make_board('Private', is_public=False, members=[self.bob])
+        self.items = [self.make_feedback(self.board, self.alice, title=f'Item {n}', upvote_count=n) for n in range(4)]
+        self.items[0].tags.add(Tag.objects.create(name='ui'))
+        self.hidden = self.make_feedback(self.private, self.bob, title='Hidden')
+        Comment.objects.create(feedback=self.items[0], created_by=self.alice, content='First')
+        self.token = self.login(self.alice)
+
+    async def assertSame(self, url, auth=True, **headers):
+        """
+        GET `url` through the sync and the async routes, each on a cold cache, and
+        compare status, ETag and body. Returns the async response.
+        """
+        if auth:
+            headers['Authorization'] = f'Bearer {self.token}'
+        responses = []
+        for urlconf in (SYNC_URLS, ASYNC_URLS):
+            await sync_to_async(caches['default'].clear)()
+            with override_settings(ROOT_URLCONF=urlconf):
+                responses.append(await self.async_client.get(url, headers=headers))
+        sync, async_ = responses
+
+        self.assertEqual(async_.status_code, sync.status_code, url)
+        self.assertEqual(async_.get('ETag'), sync.get('ETag'), url)
+        if sync.content:
+            self.assertEqual(json.loads(async_.content), json.loads(sync.content), url)
+        return async_
+
+    def test_routes_are_async(self):
+        self.assertTrue(asyncio.iscoroutinefunction(resolve('/api/feedback/', urlconf=ASYNC_URLS).func))
+
+    async def test_lists_match(self):
+        for url in ['/api/feedback/', '/api/feedback/?ordering=-upvote_count&page_size=2&page=2',
+                    '/api/feedback/?cursor=&page_size=3', f'/api/feedback/?board={self.board.pk}&tag_name=ui',
+                    '/api/feedback/?fields=id,title', '/api/boards/', '/api/comments/', '/api/tags/']:
+            response = await self.assertSame(url)
+            self.assertEqual(response.status_code, 200, url)
+
+    async def test_details_match(self):
+        for url, status in [(f'/api/feedback/{self.items[0].pk}/', 200), (f'/api/boards/{self.board.pk}/', 200),
+                            (f'/api/feedback/{self.hidden.pk}/', 404), ('/api/feedback/0/', 404)]:
+            response = await self.assertSame(url)
+            self.assertEqual(response.status_code, status, url)
+
+    async def test_errors_match(self):
+        self.assertEqual((await self.assertSame('/api/feedback/', auth=False)).status_code, 401)
+        self.assertEqual((await self.assertSame('/api/feedback/?cursor=garbage')).status_code, 404)
+
+    async def test_conditional_requests_match(self):
+        url = f'/api/feedback/{self.items[1].pk}/'
+        etag = (await self.assertSame(url))['ETag']
+
+        response = await self.assertSame(url, **{'If-None-Match': etag})
+
+        self.assertEqual(response.status_code, 304)
@@ -0,0 +1,59 @@
+from django.core.cache import cache
+from rest_framework.test import APIRequestFactory
+
+from core.authentication import CachedJWTAuthentication, _state_key
+from core.models import User
+
+from .base import CoreAPITestCase
+
+
+class CachedJWTAuthenticationTests(CoreAPITestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.user = self.make_user('alice')
+        self.board = self.make_board()
+
+    def test_valid_token_authenticates_without_a_user_query_once_cached(self):
+        self.login(self.user)
+        self.assertEqual(self.client.get('/api/boards/').status_code, 200)
+        with self.assertNumQueries(0):
+            # The board list is cached too, so a warm request touches neither table.
+            self.assertEqual(self.client.get('/api/boards/').status_code, 200)
+
+    def test_role_change_revokes_issued_tokens(self):
+        self.login(self.user)
+        self.user.role = User.MODERATOR
+        self.user.save()
+        self.assertEqual(self.client.get('/api/boards/').status_code, 401)
+
+        self.login(User.objects.get(pk=self.user.pk))
+        self.assertEqual(self.client.get('/api/boards/').status_code, 200)
+
+    def test_deactivation_revokes_issued_tokens(self):
+        self.login(self.user)
+        self.user.is_active = False
+        self.user.save(update_fields=['is_active'])
+        response = self.client.get('/api/boards/')
+        self.assertEqual(response.status_code, 401)
+
+    def test_losing_superuser_revokes_issued_tokens(self):
+        self.user.is_superuser = True
+        self.user.save()
+        self.login(self.user)
+        self.user.is_superuser = False
+        self.user.save(update_fields=['is_superuser'])
+        self.assertEqual(self.client.get('/api/boards/').status_code, 401)
+
+    def test_request_user_comes_from_the_row_not_the_claims(self):
+        self.user.is_superuser = True
+        self.user.save()
+        token = self.login(self.user)
+        self.assertTrue(token['is_superuser'])
+        # update() skips the version bump, so the token stays valid but its claims are stale.
+        User.objects.filter(pk=self.user.pk).update(username='alice2', is_superuser=False, role=User.ADMIN)
+        cache.delete(_state_key(self.user.pk))
+
+        request = APIRequestFactory().get('/api/boards/', HTTP_AUTHORIZATION=f'Bearer {token}')
+        user, _ = CachedJWTAuthentication().authenticate(request)
+        self.assertEqual((user.username, user.role, user.is_superuser), ('alice2', User.ADMIN, False))
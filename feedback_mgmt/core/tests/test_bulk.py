@@ -0,0 +1,73 @@
+from core.models import DeletionJob, Feedback, Tag, User
+
+from .base import CoreAPITestCase
+
+
+class BulkActionTests(CoreAPITestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.alice = self.make_user('alice')
+        self.bob = self.make_user('bob')
+        self.board = self.make_board()
+        self.mine = self.make_feedback(self.board, self.alice, title='Mine')
+        self.theirs = self.make_feedback(self.board, self.bob, title='Theirs')
+        self.login(self.alice)
+
+    def bulk(self, **body):
+        return self.client.post('/api/feedback/bulk/', body, format='json')
+
+    def results(self, response):
+        return {row['id']: row['result'] for row in response.data['results']}
+
+    def test_results_per_item(self):
+        private = self.make_feedback(self.make_board('Private', is_public=False), self.bob)
+
+        response = self.bulk(action='tag', ids=[self.mine.pk, self.theirs.pk, private.pk, 0], tag_names=['ui'])
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.results(response), {
+            self.mine.pk: 'ok', self.theirs.pk: 'forbidden', private.pk: 'not_found', 0: 'not_found',
+        })
+        self.assertEqual(list(Tag.objects.get(name='ui').feedbacks.all()), [self.mine])
+
+    def test_only_admins_move(self):
+        response = self.bulk(action='move', ids=[self.mine.pk], status=Feedback.STATUS_COMPLETED)
+        self.assertEqual(self.results(response), {self.mine.pk: 'forbidden'})
+
+        self.login(self.make_user('admin', role=User.ADMIN))
+        response = self.bulk(action='move', ids=[self.mine.pk, self.theirs.pk], status=Feedback.STATUS_COMPLETED)
+        self.assertEqual(set(self.results(response).values()), {'ok'})
+        self.assertEqual(Feedback.objects.filter(status=Feedback.STATUS_COMPLETED).count(), 2)
+
+    def test_delete_returns_the_deletion_job(self):
+        response = self.bulk(action='delete', ids=[self.mine.pk, self.theirs.pk])
+
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(self.results(response), {self.mine.pk: 'ok', self.theirs.pk: 'forbidden'})
+        job = DeletionJob.objects.get(pk=response.data['job']['id'])
+        self.assertEqual((job.target_ids, job.requested_by), ([self.mine.pk], self.alice))
+        self.assertEqual(list(Feedback.objects.all()), [self.theirs])
+
+        self.run_tasks()
+        self.assertEqual(self.client.get(f'/api/deletions/{job.pk}/').data['status'], DeletionJob.DONE)
+        self.assertFalse(Feedback.all_objects.filter(pk=self.mine.pk).exists())
+
+    def test_denied_requests_create_no_tags(self):
+        response = self.bulk(action='tag', ids=[self.theirs.pk], tag_names=['spam'])
+
+        self.assertEqual(self.results(response), {self.theirs.pk: 'forbidden'})
+        self.assertFalse(Tag.objects.filter(name='spam').exists())
+
+        response = self.bulk(action='tag', ids=[0], tag_names=['spam'])
+        self.assertEqual(self.results(response), {0: 'not_found'})
+        self.assertFalse(Tag.objects.exists())
+
+    def test_untag_by_name_does_not_create_tags(self):
+        ui = Tag.objects.create(name='ui')
+        self.mine.tags.add(ui)
+
+        self.bulk(action='untag', ids=[self.mine.pk], tag_names=['UI', 'new'])
+
+        self.assertEqual(list(self.mine.tags.all()), [])
+        self.assertEqual(list(Tag.objects.values_list('name', flat=True)), ['ui'])
@@ -0,0 +1,48 @@
+from core.counters import reconcile_comment_counts
+from core.models import Comment, Feedback
+
+from .base import CoreAPITestCase
+
+
+class CommentCountTests(CoreAPITestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.alice = self.make_user('alice')
+        self.board = self.make_board()
+        self.feedback = self.make_feedback(self.board, self.alice)
+        self.login(self.alice)
+
+    def count(self):
+        return Feedback.objects.values_list('comment_count', flat=True).get(pk=self.feedback.pk)
+
+    def comment(self, content):
+        return self.client.post('/api/comments/', {'feedback': self.feedback.pk, 'content': content}, format='json')
+
+    def test_counter_follows_creates_and_deletes(self):
+        first = self.comment('First').data
+        self.comment('Second')
+        self.assertEqual(self.count(), 2)
+
+        self.assertEqual(self.client.delete(f"/api/comments/{first['id']}/").status_code, 204)
+        self.assertEqual(self.count(), 1)
+        self.assertEqual(self.count(), Comment.objects.filter(feedback=self.feedback).count())
+
+    def test_thread_route_matches_the_counter(self):
+        for n in range(3):
+            self.comment(f'Comment {n}')
+
+        response = self.client.get(f'/api/feedback/{self.feedback.pk}/')
+        thread = self.client.get(f'/api/feedback/{self.feedback.pk}/comments/')
+
+        self.assertEqual(response.data['comment_count'], 3)
+        self.assertEqual([item['content'] for item in thread.data['results']],
+                         ['Comment 0', 'Comment 1', 'Comment 2'])
+
+    def test_reconcile_fixes_drift(self):
+        self.comment('Only')
+        Feedback.objects.filter(pk=self.feedback.pk).update(comment_count=5)
+
+        self.assertEqual(reconcile_comment_counts(), 1)
+        self.assertEqual(self.count(), 1)
+        self.assertEqual(reconcile_comment_counts(), 0)
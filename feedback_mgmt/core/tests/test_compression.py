@@ -0,0 +1,76 @@
+import gzip
+import zlib
+from unittest import skipIf
+
+from django.test import SimpleTestCase
+
+from core import compression
+from core.compression import negotiate
+
+from .base import CoreAPITestCase
+
+
+class NegotiationTests(SimpleTestCase):
+
+    def test_preference_and_q_values(self):
+        self.assertEqual(negotiate('gzip, br', ['br', 'gzip']), 'br')
+        self.assertEqual(negotiate('br;q=0.5, gzip', ['br', 'gzip']), 'gzip')
+        self.assertEqual(negotiate('br;q=0, *', ['br', 'gzip']), 'gzip')
+        self.assertEqual(negotiate('identity', ['br', 'gzip']), None)
+        self.assertEqual(negotiate('', ['gzip']), None)
+        self.assertEqual(negotiate('gzip;q=bogus', ['gzip']), None)
+
+
+class CompressionMiddlewareTests(CoreAPITestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.alice = self.make_user('alice')
+        self.board = self.make_board()
+        for n in range(30):
+            self.make_feedback(self.board, self.alice, title=f'Feedback item {n}', description='Details ' * 10)
+        self.login(self.alice)
+
+    def get(self, url, encoding):
+        return self.client.get(url, HTTP_ACCEPT_ENCODING=encoding)
+
+    def test_large_json_is_gzipped(self):
+        plain = self.get('/api/feedback/?page_size=30', 'identity')
+        zipped = self.get('/api/feedback/?page_size=30', 'gzip')
+
+        self.assertEqual(zipped['Content-Encoding'], 'gzip')
+        self.assertIn('Accept-Encoding', zipped['Vary'])
+        self.assertEqual(gzip.decompress(zipped.content), plain.content)
+        self.assertEqual(int(zipped['Content-Length']), len(zipped.content))
+        self.assertEqual(zipped['ETag'], f"W/{plain['ETag']}")
+
+    @skipIf(compression.brotli is None, 'brotli is not installed')
+    def test_brotli_is_preferred(self):
+        plain = self.get('/api/feedback/?page_size=30', 'identity')
+        response = self.get('/api/feedback/?page_size=30', 'gzip, br')
+
+        self.assertEqual(response['Content-Encoding'], 'br')
+        self.assertEqual(compression.brotli.decompress(response.content), plain.content)
+
+    def test_small_responses_are_sent_as_they_are(self):
+        response = self.get('/api/feedback/?page_size=1&fields=id', 'gzip')
+        self.assertFalse(response.has_header('Content-Encoding'))
+
+    def test_weak_etag_still_revalidates(self):
+        etag = self.get('/api/feedback/?page_size=30', 'gzip')['ETag']
+        response = self.client.get('/api/feedback/?page_size=30', HTTP_ACCEPT_ENCODING='gzip',
+                                   HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+    def test_exports_stream_compressed(self):
+        plain = b''.join(self.get('/api/feedback/export/', 'identity').streaming_content)
+        response = self.get('/api/feedback/export/', 'gzip')
+
+        self.assertTrue(response.streaming)
+        self.assertFalse(response.has_header('Content-Length'))
+        chunks = list(response.streaming_content)
+        self.assertGreater(len(chunks), 1)
+        # Each chunk is flushed, so a client can decode what has arrived so far.
+        partial = zlib.decompressobj(31).decompress(b''.join(chunks[:2]))
+        self.assertTrue(plain.startswith(partial) and partial)
+        self.assertEqual(gzip.decompress(b''.join(chunks)), plain)
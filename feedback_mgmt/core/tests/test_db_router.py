@@ -0,0 +1,77 @@
+import time
+
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from core.db_router import PIN_COOKIE, PrimaryReplicaRouter, ReplicaRoutingMiddleware, _pin_key
+from core.models import Feedback, User
+
+
+class ViewSet:
+    use_primary_db = {'stats'}
+
+
+def view(request):
+    return HttpResponse()
+
+
+view.cls = ViewSet
+
+
+@override_settings(REPLICA_DATABASES=['replica'])
+class ReplicaRoutingTests(SimpleTestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.factory = RequestFactory()
+        self.middleware = ReplicaRoutingMiddleware(lambda request: HttpResponse())
+        self.router = PrimaryReplicaRouter()
+
+    def route(self, request, actions=None, user=None):
+        """
+        The alias a read resolves to while `request` is being served.
+        """
+        self.middleware.process_request(request)
+        view.actions = actions or {}
+        self.middleware.process_view(request, view, (), {})
+        if user is not None:
+            request.user = user
+        try:
+            return self.router.db_for_read(Feedback)
+        finally:
+            self.middleware.process_response(request, HttpResponse())
+
+    def test_safe_reads_go_to_a_replica(self):
+        self.assertEqual(self.route(self.factory.get('/')), 'replica')
+
+    def test_reads_outside_requests_and_in_writes_use_the_primary(self):
+        self.assertEqual(self.router.db_for_read(Feedback), 'default')
+        self.assertEqual(self.route(self.factory.post('/')), 'default')
+        self.assertEqual(self.router.db_for_write(Feedback), 'default')
+
+    def test_views_can_opt_out_per_action(self):
+        self.assertEqual(self.route(self.factory.get('/'), actions={'get': 'stats'}), 'default')
+        self.assertEqual(self.route(self.factory.get('/'), actions={'get': 'list'}), 'replica')
+
+    def test_writes_pin_the_browser_and_the_user(self):
+        user = User(pk=7, username='alice')
+        request = self.factory.post('/')
+        request.user = user
+        self.middleware.process_request(request)
+        response = self.middleware.process_response(request, HttpResponse())
+
+        self.assertGreater(float(response.cookies[PIN_COOKIE].value), time.time())
+        self.assertIsNotNone(cache.get(_pin_key(user.pk)))
+
+        pinned_browser = self.factory.get('/')
+        pinned_browser.COOKIES[PIN_COOKIE] = response.cookies[PIN_COOKIE].value
+        self.assertEqual(self.route(pinned_browser), 'default')
+        self.assertEqual(self.route(self.factory.get('/'), user=user), 'default')
+        self.assertEqual(self.route(self.factory.get('/'), user=User(pk=8)), 'replica')
+
+    def test_failed_writes_do_not_pin(self):
+        request = self.factory.post('/')
+        self.middleware.process_request(request)
+        response = self.middleware.process_response(request, HttpResponse(status=400))
+        self.assertNotIn(PIN_COOKIE, response.cookies)
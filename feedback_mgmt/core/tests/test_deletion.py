@@ -0,0 +1,65 @@
+from core.deletion import BOARD_CHILDREN, FEEDBACK_CHILDREN
+from core.models import Board, Comment, DeletionJob, Feedback, Tag, User, Vote
+
+from .base import CoreAPITestCase
+
+
+class SoftDeleteTests(CoreAPITestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.admin = self.make_user('admin', role=User.ADMIN)
+        self.alice = self.make_user('alice')
+        self.board = self.make_board()
+        self.feedback = self.make_feedback(self.board, self.alice)
+        Vote.objects.create(feedback=self.feedback, user=self.alice)
+        Comment.objects.create(feedback=self.feedback, created_by=self.alice, content='First')
+        self.feedback.tags.add(Tag.objects.create(name='ui'))
+
+    def test_feedback_is_hidden_at_once_and_purged_by_the_job(self):
+        self.login(self.alice)
+
+        response = self.client.delete(f'/api/feedback/{self.feedback.pk}/')
+
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual((response.data['status'], response.data['progress']), (DeletionJob.PENDING, 0.0))
+        self.assertEqual(self.client.get(f'/api/feedback/{self.feedback.pk}/').status_code, 404)
+        self.assertTrue(Feedback.all_objects.filter(pk=self.feedback.pk).exists())
+
+        self.run_tasks()
+        job = self.client.get(f"/api/deletions/{response.data['id']}/").data
+        self.assertEqual((job['status'], job['deleted'], job['progress']), (DeletionJob.DONE, 1, 1.0))
+        self.assertFalse(Feedback.all_objects.filter(pk=self.feedback.pk).exists())
+        self.assertFalse(Vote.objects.exists())
+        self.assertFalse(Comment.objects.exists())
+        self.assertFalse(Feedback.tags.through.objects.exists())
+        self.assertTrue(Tag.objects.exists())
+
+    def test_board_and_its_feedback_are_purged(self):
+        self.make_feedback(self.board, self.alice, title='Second')
+        self.login(self.admin)
+
+        # The access and response caches are invalidated on commit.
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.delete(f'/api/boards/{self.board.pk}/')
+
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response.data['total'], 2)
+        self.assertEqual(self.client.get(f'/api/boards/{self.board.pk}/').status_code, 404)
+        self.assertEqual(self.client.get('/api/feedback/').data['count'], 0)
+
+        self.run_tasks()
+        self.assertFalse(Board.all_objects.filter(pk=self.board.pk).exists())
+        self.assertFalse(Feedback.all_objects.exists())
+        self.assertEqual(DeletionJob.objects.get().status, DeletionJob.DONE)
+
+    def test_child_tables_cover_every_cascading_relation(self):
+        for model, children in ((Feedback, FEEDBACK_CHILDREN), (Board, BOARD_CHILDREN)):
+            related = {
+                (relation.related_model, relation.field.name)
+                for relation in model._meta.get_fields(include_hidden=True)
+                if relation.auto_created and not relation.concrete and (relation.one_to_many or relation.one_to_one)
+            }
+            # A board's feedback is purged chunk by chunk before the board itself.
+            related.discard((Feedback, 'board'))
+            self.assertEqual(related, set(children), model.__name__)
@@ -0,0 +1,101 @@
+import asyncio
+
+from django.test import SimpleTestCase, TestCase
+
+from core import events
+from core.events import RESET, InProcessBroker, publish_event
+
+from .base import CoreAPITestCase
+
+
+async def take(stream, n):
+    return [await asyncio.wait_for(anext(stream), 1) for _ in range(n)]
+
+
+class InProcessBrokerTests(SimpleTestCase):
+
+    def setUp(self):
+        self.broker = InProcessBroker(buffer_size=3)
+
+    async def test_subscribers_get_events_for_their_board(self):
+        stream = self.broker.subscribe(1)
+        self.broker.publish(2, 'feedback.created', {'id': 9})
+        published = self.broker.publish(1, 'feedback.created', {'id': 7})
+
+        self.assertEqual(await take(stream, 1), [published])
+        await stream.aclose()
+        self.assertFalse(self.broker.channel(1).subscribers)
+
+    async def test_reconnect_replays_missed_events(self):
+        first = self.broker.publish(1, 'a', {})
+        missed = [self.broker.publish(1, 'b', {}), self.broker.publish(1, 'c', {})]
+
+        stream = self.broker.subscribe(1, last_event_id=first['id'])
+
+        self.assertEqual(await take(stream, 2), missed)
+        await stream.aclose()
+
+    async def test_gap_beyond_the_buffer_resets(self):
+        first = self.broker.publish(1, 'a', {})
+        for _ in range(3):
+            last = self.broker.publish(1, 'b', {})
+
+        for last_event_id in (first['id'] - 1, last['id'] + 100):
+            stream = self.broker.subscribe(1, last_event_id=last_event_id)
+            self.assertEqual(await take(stream, 1), [{'id': last['id'], 'type': RESET, 'board': 1, 'data': {}}])
+            await stream.aclose()
+
+    async def test_idle_streams_get_heartbeats(self):
+        stream = self.broker.subscribe(1, heartbeat=0.01)
+        self.assertEqual(await take(stream, 1), [None])
+        await stream.aclose()
+
+
+class PublishEventTests(TestCase):
+
+    def setUp(self):
+        self.broker = InProcessBroker()
+        self.addCleanup(setattr, events, '_broker', events._broker)
+        events._broker = self.broker
+
+    def test_events_go_out_on_commit(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            publish_event(1, 'feedback.moved', {'id': 3})
+            self.assertFalse(self.broker.channel(1).buffer)
+
+        for callback in callbacks:
+            callback()
+        self.assertEqual([event['data'] for event in self.broker.channel(1).buffer], [{'id': 3}])
+
+
+class BoardEventStreamTests(CoreAPITestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.addCleanup(setattr, events, '_broker', events._broker)
+        events._broker = self.broker = InProcessBroker()
+        self.alice = self.make_user('alice')
+        self.board = self.make_board(is_public=False, members=[self.alice])
+        self.outsider_token = self.login(self.make_user('bob'))
+        self.token = self.login(self.alice)
+
+    async def test_stream_replays_from_last_event_id(self):
+        first = self.broker.publish(self.board.pk, 'feedback.created', {'id': 1})
+        self.broker.publish(self.board.pk, 'feedback.moved', {'id': 1, 'status': 'completed'})
+
+        response = await self.async_client.get(f'/api/boards/{self.board.pk}/events/?token={self.token}',
+                                               headers={'Last-Event-ID': str(first['id'])})
+
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        chunks = response.streaming_content
+        self.assertEqual(await anext(chunks), b'retry: 3000\n\n')
+        self.assertEqual(await anext(chunks), f"id: {first['id'] + 1}\nevent: feedback.moved\n"
+                                              'data: {"id": 1, "status": "completed"}\n\n'.encode())
+        await chunks.aclose()
+
+    async def test_needs_a_token_and_board_access(self):
+        response = await self.async_client.get(f'/api/boards/{self.board.pk}/events/')
+        self.assertEqual(response.status_code, 401)
+
+        response = await self.async_client.get(f'/api/boards/{self.board.pk}/events/?token={self.outsider_token}')
+        self.assertEqual(response.status_code, 403)
@@ -0,0 +1,42 @@
+from core.models import User
+
+from .base import CoreAPITestCase
+
+
+class SparseFieldsetTests(CoreAPITestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.alice = self.make_user('alice', email='alice@example.com')
+        self.board = self.make_board(is_public=False, members=[self.alice])
+        self.feedback = self.make_feedback(self.board, self.alice)
+        self.login(self.alice)
+
+    def test_fields_keeps_only_the_listed_fields(self):
+        response = self.client.get('/api/feedback/?fields=id,title')
+        self.assertEqual(response.data['results'], [{'id': self.feedback.pk, 'title': 'Feedback'}])
+
+    def test_created_by_is_compact_in_lists_unless_expanded(self):
+        compact = self.client.get('/api/feedback/').data['results'][0]['created_by']
+        self.assertEqual(compact, {'id': self.alice.pk, 'username': 'alice'})
+
+        expanded = self.client.get('/api/feedback/?expand=created_by').data['results'][0]['created_by']
+        self.assertEqual(expanded['email'], 'alice@example.com')
+
+    def test_detail_keeps_the_full_created_by(self):
+        created_by = self.client.get(f'/api/feedback/{self.feedback.pk}/').data['created_by']
+        self.assertEqual(created_by, {'id': self.alice.pk, 'username': 'alice',
+                                      'email': 'alice@example.com', 'role': User.CONTRIBUTOR})
+
+    def test_boards_list_member_count_and_members_on_expand(self):
+        listed = self.client.get('/api/boards/').data['results'][0]
+        self.assertEqual(listed['member_count'], 1)
+        self.assertNotIn('members', listed)
+
+        expanded = self.client.get('/api/boards/?expand=members').data['results'][0]
+        self.assertEqual([member['username'] for member in expanded['members']], ['alice'])
+
+    def test_board_detail_lists_members(self):
+        detail = self.client.get(f'/api/boards/{self.board.pk}/').data
+        self.assertEqual(detail['members'], [{'id': self.alice.pk, 'username': 'alice',
+                                              'email': 'alice@example.com', 'role': User.CONTRIBUTOR}])
@@ -0,0 +1,33 @@
+import json
+
+from core.models import Tag
+
+from .base import CoreAPITestCase
+
+
+class TagNameFilterTests(CoreAPITestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.user = self.make_user('alice')
+        self.board = self.make_board()
+        self.feedback = self.make_feedback(self.board, self.user, title='Crash on save')
+        self.feedback.tags.add(Tag.objects.create(name='bug'), Tag.objects.create(name='bugfix'))
+        self.other = self.make_feedback(self.board, self.user, title='Dark mode')
+        self.other.tags.add(Tag.objects.create(name='ui'))
+        self.login(self.user)
+
+    def test_item_with_several_matching_tags_is_listed_once(self):
+        response = self.client.get('/api/feedback/?tag_name=bug')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['count'], 1)
+        self.assertEqual([item['id'] for item in response.data['results']], [self.feedback.pk])
+
+    def test_match_is_case_insensitive(self):
+        response = self.client.get('/api/feedback/?tag_name=UI')
+        self.assertEqual([item['id'] for item in response.data['results']], [self.other.pk])
+
+    def test_export_has_no_duplicate_rows(self):
+        response = self.client.get('/api/feedback/export/?tag_name=bug&type=json')
+        rows = json.loads(b''.join(response.streaming_content))
+        self.assertEqual([row['id'] for row in rows], [self.feedback.pk])
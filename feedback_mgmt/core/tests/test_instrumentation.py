@@ -0,0 +1,100 @@
+from django.core.cache import caches
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+
+from core.instrumentation import registry
+from core.testing import QueryBudgetExceeded, query_budget
+
+from .base import CoreAPITestCase
+
+
+class InstrumentationTests(CoreAPITestCase):
+
+    def setUp(self):
+        super().setUp()
+        registry.reset()
+        self.addCleanup(registry.reset)
+        self.user = self.make_user('alice')
+        self.board = self.make_board(members=[self.user])
+        for i in range(5):
+            self.make_feedback(self.board, self.user, title=f'Item {i}')
+        self.login(self.user)
+
+    def test_list_records_db_serialize_and_render_time(self):
+        self.client.get(f'/api/feedback/?board={self.board.pk}')
+        for metric in ('http_request_duration_seconds', 'http_request_db_seconds', 'http_request_db_queries',
+                       'http_request_serialize_seconds', 'http_request_render_seconds', 'http_response_size_bytes'):
+            histogram = registry.get(metric, 'feedback-list', 'GET')
+            self.assertIsNotNone(histogram, metric)
+            self.assertEqual(histogram.count, 1, metric)
+
+    def test_metrics_endpoint_exposes_serialize_histogram(self):
+        self.client.get('/api/boards/')
+        admin = self.make_user('root', role='admin')
+        self.login(admin)
+        response = self.client.get('/api/metrics/')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('http_request_serialize_seconds_count{view="boards-list",method="GET"} 1', response.content.decode())
+
+    def test_streamed_responses_count_the_queries_made_while_streaming(self):
+        response = self.client.get('/api/feedback/export/')
+        self.assertIsNone(registry.get('http_request_db_queries', 'feedback-export', 'GET'))
+
+        # The test client closes the response once the body is consumed.
+        self.assertEqual(len(b''.join(response.streaming_content).splitlines()), 5)
+
+        histogram = registry.get('http_request_db_queries', 'feedback-export', 'GET')
+        self.assertEqual(histogram.count, 1)
+        # The export rows are read while the body streams.
+        self.assertGreater(histogram.sum, 1)
+
+    @override_settings(METRICS_TOKEN='scrape-me')
+    def test_metrics_token_is_only_read_from_the_authorization_header(self):
+        self.client.credentials()
+        self.assertEqual(self.client.get('/api/metrics/?token=scrape-me').status_code, 403)
+        self.assertEqual(self.client.get('/api/metrics/', HTTP_X_METRICS_TOKEN='scrape-me').status_code, 403)
+        self.assertEqual(self.client.get('/api/metrics/', HTTP_AUTHORIZATION='Bearer wrong').status_code, 403)
+        self.assertEqual(self.client.get('/api/metrics/', HTTP_AUTHORIZATION='Bearer scrape-me').status_code, 200)
+
+
+class QueryBudgetTests(CoreAPITestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.user = self.make_user('alice')
+        self.board = self.make_board(members=[self.user])
+        self.login(self.user)
+
+    def list_queries(self, url):
+        # on_commit invalidation doesn't run inside a test transaction; start cold.
+        caches['default'].clear()
+        with CaptureQueriesContext(connection) as captured:
+            self.assertEqual(self.client.get(url).status_code, 200)
+        return len(captured)
+
+    def test_feedback_list_query_count_does_not_grow_with_the_page(self):
+        url = f'/api/feedback/?board={self.board.pk}&page_size=50&fields=id,title,tags,created_by,has_upvoted'
+        for i in range(3):
+            self.make_feedback(self.board, self.user, title=f'Item {i}')
+        few = self.list_queries(url)
+        for i in range(30):
+            self.make_feedback(self.board, self.user, title=f'More {i}')
+        self.assertEqual(self.list_queries(url), few)
+
+    def test_read_endpoint_budgets(self):
+        for i in range(10):
+            self.make_feedback(self.board, self.user, title=f'Item {i}')
+        self.assertEndpointBudgets({
+            ('get', f'/api/feedback/?board={self.board.pk}'): 8,
+            ('get', f'/api/feedback/?board={self.board.pk}&cursor='): 7,
+            ('get', '/api/boards/'): 6,
+            ('get', f'/api/boards/{self.board.pk}/stats/'): 10,
+            ('get', f'/api/boards/{self.board.pk}/kanban/'): 7,
+        }, expected_status=200)
+
+    def test_budget_failure_lists_the_statements(self):
+        with self.assertRaises(QueryBudgetExceeded) as raised:
+            with query_budget(0):
+                list(self.board.feedbacks.all())
+        self.assertIn('core_feedback', str(raised.exception))
@@ -0,0 +1,55 @@
+from unittest import mock
+
+from django.db import connection
+
+from core.kanban import column_heads
+from core.models import Feedback
+
+from .base import CoreAPITestCase
+
+
+class KanbanTests(CoreAPITestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.alice = self.make_user('alice')
+        self.board = self.make_board()
+        self.open = [self.make_feedback(self.board, self.alice, title=f'Open {n}', upvote_count=n) for n in range(5)]
+        self.done = self.make_feedback(self.board, self.alice, title='Done', status=Feedback.STATUS_COMPLETED)
+        self.make_feedback(self.make_board('Other'), self.alice, title='Elsewhere')
+        self.login(self.alice)
+
+    def kanban(self, query=''):
+        response = self.client.get(f'/api/boards/{self.board.pk}/kanban/{query}')
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def test_columns_hold_the_first_items_and_totals(self):
+        columns = {column['status']: column for column in self.kanban('?per_column=2')['columns']}
+
+        self.assertEqual(list(columns), [key for key, _ in Feedback.STATUS_CHOICES])
+        self.assertEqual(columns['open']['count'], 5)
+        self.assertEqual([item['title'] for item in columns['open']['results']], ['Open 4', 'Open 3'])
+        self.assertEqual((columns['completed']['count'], columns['completed']['next']), (1, None))
+        self.assertEqual((columns['in_progress']['count'], columns['in_progress']['results']), (0, []))
+
+    def test_next_link_pages_one_column(self):
+        url = self.kanban('?per_column=2')['columns'][0]['next']
+
+        titles = []
+        while url:
+            response = self.client.get(url)
+            titles += [item['title'] for item in response.data['results']]
+            url = response.data['next']
+
+        self.assertEqual(titles, ['Open 2', 'Open 1', 'Open 0'])
+
+    def test_fallback_without_window_functions_matches(self):
+        queryset = Feedback.objects.filter(board=self.board)
+        ordering = ['-upvote_count', '-pk']
+        windowed = column_heads(queryset, ordering, 2)
+
+        with mock.patch.object(connection.features, 'supports_over_clause', False):
+            fallback = column_heads(queryset, ordering, 2)
+
+        self.assertEqual(fallback, windowed)
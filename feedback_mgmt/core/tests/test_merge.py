@@ -0,0 +1,63 @@
+from core.models import Comment, DeletionJob, Feedback, Tag, User, Vote
+from core.votes import reconcile_upvote_counts
+
+from .base import CoreAPITestCase
+
+
+class MergeTests(CoreAPITestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.admin = self.make_user('admin', role=User.ADMIN)
+        self.alice = self.make_user('alice')
+        self.bob = self.make_user('bob')
+        self.board = self.make_board()
+        self.canonical = self.make_feedback(self.board, self.alice, title='Dark mode')
+        self.duplicate = self.make_feedback(self.board, self.bob, title='Night theme')
+        Vote.objects.create(feedback=self.canonical, user=self.alice)
+        Vote.objects.create(feedback=self.duplicate, user=self.alice)
+        Vote.objects.create(feedback=self.duplicate, user=self.bob)
+        reconcile_upvote_counts()
+        Comment.objects.create(feedback=self.duplicate, created_by=self.bob, content='Please')
+        self.duplicate.tags.add(Tag.objects.create(name='ui'))
+        self.login(self.admin)
+
+    def merge(self, ids):
+        return self.client.post(f'/api/feedback/{self.canonical.pk}/merge/', {'ids': ids}, format='json')
+
+    def test_votes_comments_and_tags_move_to_the_canonical_item(self):
+        response = self.merge([self.duplicate.pk])
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['merged'], [self.duplicate.pk])
+        self.canonical.refresh_from_db()
+        self.assertEqual(self.canonical.upvote_count, 2)
+        self.assertEqual(self.canonical.comment_count, 1)
+        self.assertEqual(set(Vote.objects.filter(feedback=self.canonical).values_list('user__username', flat=True)),
+                         {'alice', 'bob'})
+        self.assertEqual([tag.name for tag in self.canonical.tags.all()], ['ui'])
+
+    def test_duplicate_is_soft_deleted_then_purged(self):
+        self.merge([self.duplicate.pk])
+
+        self.assertFalse(Feedback.objects.filter(pk=self.duplicate.pk).exists())
+        self.assertIsNotNone(Feedback.all_objects.get(pk=self.duplicate.pk).deleted_at)
+        job = DeletionJob.objects.get()
+        self.assertEqual((job.target, job.target_ids, job.requested_by), (DeletionJob.FEEDBACK,
+                                                                          [self.duplicate.pk], self.admin))
+
+        self.run_tasks()
+        job.refresh_from_db()
+        self.assertEqual(job.status, DeletionJob.DONE)
+        self.assertFalse(Feedback.all_objects.filter(pk=self.duplicate.pk).exists())
+        # Alice's vote on the duplicate went with it; the canonical item keeps its own.
+        self.assertEqual(Vote.objects.filter(feedback=self.canonical).count(), 2)
+
+    def test_items_on_other_boards_are_ignored(self):
+        other = self.make_feedback(self.make_board('Other'), self.bob)
+
+        response = self.merge([other.pk])
+
+        self.assertEqual(response.data['merged'], [])
+        self.assertTrue(Feedback.objects.filter(pk=other.pk).exists())
+        self.assertFalse(DeletionJob.objects.exists())
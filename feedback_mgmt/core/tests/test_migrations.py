@@ -0,0 +1,68 @@
+from datetime import timedelta
+
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.test import TransactionTestCase
+from django.utils import timezone
+
+from core import ranking
+
+
+class MigrationTestCase(TransactionTestCase):
+    """
+    Migrates back to `migrate_from`, lets setUpBeforeMigration() write rows
+    with the historical models, then migrates forward to `migrate_to`.
+    """
+    migrate_from = None
+    migrate_to = None
+
+    def setUp(self):
+        executor = MigrationExecutor(connection)
+        self.latest = executor.loader.graph.leaf_nodes()
+        executor.migrate([self.migrate_from])
+        self.setUpBeforeMigration(executor.loader.project_state([self.migrate_from]).apps)
+        executor = MigrationExecutor(connection)
+        executor.loader.build_graph()
+        executor.migrate([self.migrate_to])
+        self.apps = executor.loader.project_state([self.migrate_to]).apps
+
+    def tearDown(self):
+        executor = MigrationExecutor(connection)
+        executor.loader.build_graph()
+        executor.migrate(self.latest)
+
+    def setUpBeforeMigration(self, apps):
+        pass
+
+
+class RankingScoreBackfillTests(MigrationTestCase):
+    migrate_from = ('core', '0006_task_outbox')
+    migrate_to = ('core', '0007_feedback_ranking_scores')
+
+    def setUpBeforeMigration(self, apps):
+        User = apps.get_model('core', 'User')
+        Board = apps.get_model('core', 'Board')
+        Feedback = apps.get_model('core', 'Feedback')
+        Vote = apps.get_model('core', 'Vote')
+        Comment = apps.get_model('core', 'Comment')
+
+        user = User.objects.create(username='voter')
+        board = Board.objects.create(name='Board')
+        self.now = timezone.now()
+        self.active = Feedback.objects.create(board=board, created_by=user, title='Active',
+                                              upvote_count=1, comment_count=1)
+        self.quiet = Feedback.objects.create(board=board, created_by=user, title='Quiet')
+        Feedback.objects.filter(pk=self.active.pk).update(created_at=self.now - timedelta(hours=10))
+        Vote.objects.create(feedback=self.active, user=user)
+        Comment.objects.create(feedback=self.active, created_by=user, content='Me too')
+
+    def test_scores_are_computed_for_existing_rows(self):
+        Feedback = self.apps.get_model('core', 'Feedback')
+        active = Feedback.objects.get(pk=self.active.pk)
+
+        self.assertAlmostEqual(active.hot_score,
+                               ranking.hot_score(1, 1, active.created_at, self.now), places=3)
+        self.assertAlmostEqual(active.trending_score, 1 + ranking.COMMENT_WEIGHT, places=2)
+        quiet = Feedback.objects.get(pk=self.quiet.pk)
+        self.assertEqual(quiet.trending_score, 0)
+        self.assertGreater(active.hot_score, quiet.hot_score)
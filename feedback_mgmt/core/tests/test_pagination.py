@@ -0,0 +1,71 @@
+from core.models import Comment, Feedback
+
+from .base import CoreAPITestCase
+
+
+class KeysetPaginationTests(CoreAPITestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.alice = self.make_user('alice')
+        self.board = self.make_board()
+        # Ties on upvote_count, so the pk tiebreaker decides the order within them.
+        self.items = [self.make_feedback(self.board, self.alice, title=f'Item {n}', upvote_count=n % 3)
+                      for n in range(7)]
+        self.expected = [item.pk for item in sorted(self.items, key=lambda item: (-item.upvote_count, -item.pk))]
+        self.login(self.alice)
+
+    def walk(self, url, direction='next'):
+        pages = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            pages.append([item['id'] for item in response.data['results']])
+            url = response.data[direction]
+        return pages, response
+
+    def test_forward_pages_cover_every_row_once_in_order(self):
+        pages, _ = self.walk('/api/feedback/?cursor=&page_size=3')
+
+        self.assertEqual([len(page) for page in pages], [3, 3, 1])
+        self.assertEqual(sum(pages, []), self.expected)
+
+    def test_previous_links_walk_back(self):
+        _, last = self.walk('/api/feedback/?cursor=&page_size=3')
+
+        pages, _ = self.walk(last.data['previous'], direction='previous')
+
+        self.assertEqual(sum(reversed(pages), []), self.expected[:6])
+
+    def test_rows_inserted_ahead_of_the_cursor_are_not_repeated(self):
+        first = self.client.get('/api/feedback/?cursor=&page_size=3')
+        self.make_feedback(self.board, self.alice, title='Top', upvote_count=9)
+
+        second = self.client.get(first.data['next'])
+
+        self.assertEqual([item['id'] for item in second.data['results']], self.expected[3:6])
+
+    def test_count_only_on_request(self):
+        self.assertNotIn('count', self.client.get('/api/feedback/?cursor=').data)
+        self.assertEqual(self.client.get('/api/feedback/?cursor=&count=true').data['count'], 7)
+
+    def test_bad_or_foreign_cursor_is_not_found(self):
+        self.assertEqual(self.client.get('/api/feedback/?cursor=garbage').status_code, 404)
+
+        cursor = self.client.get('/api/feedback/?cursor=&page_size=3').data['next'].split('cursor=')[1]
+        response = self.client.get(f'/api/feedback/?ordering=title&cursor={cursor}')
+        self.assertEqual(response.status_code, 404)
+
+    def test_page_numbers_stay_the_default(self):
+        response = self.client.get('/api/feedback/?page=2&page_size=3')
+        self.assertEqual(response.data['count'], 7)
+        self.assertEqual([item['id'] for item in response.data['results']], self.expected[3:6])
+
+    def test_comment_thread_pages_oldest_first(self):
+        feedback = Feedback.objects.get(pk=self.expected[0])
+        comments = [Comment.objects.create(feedback=feedback, created_by=self.alice, content=str(n))
+                    for n in range(5)]
+
+        pages, _ = self.walk(f'/api/feedback/{feedback.pk}/comments/?page_size=2')
+
+        self.assertEqual(sum(pages, []), [comment.pk for comment in comments])
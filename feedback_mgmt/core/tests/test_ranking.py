@@ -0,0 +1,88 @@
+from datetime import timedelta
+
+from django.utils import timezone
+
+from core.models import Comment, Feedback, Vote
+from core.ranking import COMMENT_WEIGHT, hot_score, recompute_scores, refresh_task
+from core.signals import board_data_changed
+from core.votes import toggle_upvote
+
+from .base import CoreAPITestCase
+
+
+class RankingTests(CoreAPITestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.alice = self.make_user('alice')
+        self.voters = [self.make_user(f'voter{n}') for n in range(3)]
+        self.board = self.make_board()
+        self.login(self.alice)
+
+    def aged(self, title, hours, votes):
+        feedback = self.make_feedback(self.board, self.alice, title=title)
+        Feedback.objects.filter(pk=feedback.pk).update(created_at=timezone.now() - timedelta(hours=hours))
+        feedback.refresh_from_db()
+        for user in self.voters[:votes]:
+            toggle_upvote(feedback, user)
+        return feedback
+
+    def titles(self, ordering):
+        response = self.client.get(f'/api/feedback/?ordering={ordering}')
+        return [item['title'] for item in response.data['results']]
+
+    def test_fresh_items_outrank_old_popular_ones_on_hot(self):
+        self.aged('Old', hours=200, votes=3)
+        self.aged('Fresh', hours=1, votes=1)
+        self.aged('Quiet', hours=1, votes=0)
+
+        self.assertEqual(self.titles('hot'), ['Fresh', 'Old', 'Quiet'])
+        self.assertEqual(self.titles('-upvote_count'), ['Old', 'Fresh', 'Quiet'])
+
+    def test_trending_counts_only_recent_activity(self):
+        old = self.aged('Old', hours=1, votes=3)
+        Vote.objects.filter(feedback=old).update(created_at=timezone.now() - timedelta(days=10))
+        recent = self.aged('Recent', hours=1, votes=1)
+        Comment.objects.create(feedback=recent, created_by=self.alice, content='Yes')
+
+        recompute_scores()
+
+        recent.refresh_from_db()
+        self.assertAlmostEqual(recent.trending_score, 1 + COMMENT_WEIGHT, places=2)
+        self.assertEqual(self.titles('trending'), ['Recent', 'Old'])
+
+    def test_recompute_applies_decay_and_skips_unchanged_rows(self):
+        feedback = self.aged('Item', hours=30, votes=2)
+        Feedback.objects.filter(pk=feedback.pk).update(hot_score=100)
+
+        self.assertEqual(recompute_scores(), 1)
+        feedback.refresh_from_db()
+        self.assertAlmostEqual(feedback.hot_score, hot_score(2, 0, feedback.created_at, timezone.now()), places=4)
+        self.assertEqual(recompute_scores(), 0)
+
+    def test_small_decay_is_not_rewritten(self):
+        feedback = self.aged('Item', hours=30, votes=2)
+        recompute_scores()
+
+        # Ten minutes of decay on a 30-hour-old item is well under the tolerance.
+        self.assertEqual(recompute_scores(now=timezone.now() + timedelta(minutes=10)), 0)
+        self.assertEqual(recompute_scores(now=timezone.now() + timedelta(hours=3)), 1)
+        feedback.refresh_from_db()
+        self.assertLess(feedback.hot_score, hot_score(2, 0, feedback.created_at, timezone.now()))
+
+    def test_scheduled_refresh_does_not_invalidate_cached_responses(self):
+        feedback = self.aged('Item', hours=30, votes=2)
+        Feedback.objects.filter(pk=feedback.pk).update(hot_score=100)
+        received = []
+
+        def record(sender, board_ids, **kwargs):
+            received.append(set(board_ids))
+
+        board_data_changed.connect(record)
+        self.addCleanup(board_data_changed.disconnect, record)
+        with self.captureOnCommitCallbacks(execute=True):
+            refresh_task({})
+
+        feedback.refresh_from_db()
+        self.assertLess(feedback.hot_score, 100)
+        self.assertEqual(received, [])
@@ -0,0 +1,70 @@
+import datetime
+import decimal
+import io
+import json
+import uuid
+
+from django.test import SimpleTestCase
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from core.renderers import FastJSONParser, FastJSONRenderer, dumps, iter_json_array
+
+
+class FastJSONRendererTests(SimpleTestCase):
+
+    payloads = [
+        {'id': 1, 'title': 'Ünïcode — ✓', 'tags': [], 'nested': {'ok': True, 'none': None}},
+        {'separators': 'line\u2028paragraph\u2029end', 'quote': '"\\'},
+        {'when': datetime.datetime(2025, 1, 2, 3, 4, 5, 678901, tzinfo=datetime.timezone.utc),
+         'naive': datetime.datetime(2025, 1, 2, 3, 4, 5), 'day': datetime.date(2025, 1, 2),
+         'time': datetime.time(3, 4, 5, 600000), 'span': datetime.timedelta(hours=1, seconds=3)},
+        {'price': decimal.Decimal('1.10'), 'uuid': uuid.UUID(int=1), 'floats': [0.5, -1.25, 123456.789]},
+        # Too wide for orjson; the stdlib encoder takes the whole payload.
+        {'wide': 2 ** 70, 'float': 1e20},
+        {1: 'int keys', 'set': ['a']},
+        [],
+        'plain',
+    ]
+
+    def test_output_matches_drf(self):
+        drf, fast = JSONRenderer(), FastJSONRenderer()
+        for data in self.payloads:
+            self.assertEqual(fast.render(data), drf.render(data), data)
+
+    def test_float_exponents_differ_only_in_spelling(self):
+        data = {'small': 1e-7, 'large': 1e20}
+        self.assertEqual(json.loads(FastJSONRenderer().render(data)), json.loads(JSONRenderer().render(data)))
+
+    def test_indented_output_goes_through_drf(self):
+        data = {'a': [1, 2]}
+        rendered = FastJSONRenderer().render(data, 'application/json; indent=2')
+        self.assertEqual(rendered, JSONRenderer().render(data, 'application/json; indent=2'))
+        self.assertEqual(FastJSONRenderer().render(None), b'')
+
+    def test_json_array_chunks_join_to_the_whole_array(self):
+        for count in (0, 1, 5, 12):
+            items = [{'id': n, 'title': f'Item {n}'} for n in range(count)]
+            chunks = list(iter_json_array(items, chunk_items=5))
+            self.assertEqual(json.loads(''.join(chunks)), items)
+            self.assertEqual(''.join(chunks).encode(), dumps(items))
+
+
+class FastJSONParserTests(SimpleTestCase):
+
+    def parse(self, parser, body, encoding='utf-8'):
+        return parser.parse(io.BytesIO(body), 'application/json', {'encoding': encoding})
+
+    def test_parses_like_drf(self):
+        body = '{"title": "Ünïcode", "ids": [1, 2], "n": 1.5, "ok": null}'.encode()
+        self.assertEqual(self.parse(FastJSONParser(), body), self.parse(JSONParser(), body))
+
+    def test_invalid_bodies_are_parse_errors(self):
+        for body in (b'{"a": ', b'{"a": NaN}'):
+            with self.assertRaises(ParseError):
+                self.parse(FastJSONParser(), body)
+
+    def test_other_encodings_go_through_drf(self):
+        body = '{"title": "café"}'.encode('latin-1')
+        self.assertEqual(self.parse(FastJSONParser(), body, 'latin-1'), {'title': 'café'})
@@ -0,0 +1,70 @@
+from core.votes import toggle_upvote
+
+from .base import CoreAPITestCase
+
+
+class ResponseCacheTests(CoreAPITestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.alice = self.make_user('alice')
+        self.bob = self.make_user('bob')
+        self.board = self.make_board()
+        self.feedback = self.make_feedback(self.board, self.alice)
+        self.url = f'/api/feedback/{self.feedback.pk}/'
+        self.login(self.alice)
+
+    def test_matching_etag_gets_304(self):
+        response = self.client.get(self.url)
+        etag = response['ETag']
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('no-cache', response['Cache-Control'])
+
+        for tag in (etag, f'W/{etag}', f'"other", {etag}'):
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=tag)
+            self.assertEqual(response.status_code, 304)
+            self.assertEqual((response.content, response['ETag']), (b'', etag))
+
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH='"other"').status_code, 200)
+
+    def test_warm_hit_costs_no_queries(self):
+        self.client.get(self.url)
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get(self.url).status_code, 200)
+
+    def test_writes_move_the_etag(self):
+        etag = self.client.get(self.url)['ETag']
+
+        with self.captureOnCommitCallbacks(execute=True):
+            toggle_upvote(self.feedback, self.bob)
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['upvote_count'], 1)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_board_lists_survive_writes_on_other_boards(self):
+        other = self.make_feedback(self.make_board('Other'), self.bob)
+        url = f'/api/feedback/?board={self.board.pk}'
+        etag = self.client.get(url)['ETag']
+
+        with self.captureOnCommitCallbacks(execute=True):
+            toggle_upvote(other, self.bob)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+    def test_per_user_fields_are_not_shared(self):
+        toggle_upvote(self.feedback, self.alice)
+        self.assertTrue(self.client.get(self.url).data['has_upvoted'])
+
+        self.login(self.bob)
+        self.assertFalse(self.client.get(self.url).data['has_upvoted'])
+
+    def test_private_boards_are_not_shared(self):
+        private = self.make_board('Private', is_public=False, members=[self.alice])
+        self.make_feedback(private, self.alice, title='Secret')
+        self.assertEqual(self.client.get('/api/feedback/').data['count'], 2)
+
+        self.login(self.bob)
+        self.assertEqual(self.client.get('/api/feedback/').data['count'], 1)
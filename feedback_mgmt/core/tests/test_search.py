@@ -0,0 +1,60 @@
+from django.test import override_settings
+
+from core.models import Comment, Tag
+from core.search import tokenize
+
+from .base import CoreAPITestCase
+
+
+class SearchTests(CoreAPITestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.alice = self.make_user('alice')
+        self.board = self.make_board()
+        self.in_title = self.make_feedback(self.board, self.alice, title='Export to spreadsheet')
+        self.in_description = self.make_feedback(self.board, self.alice, title='Reports',
+                                                 description='An export button on every report')
+        self.tagged = self.make_feedback(self.board, self.alice, title='Dark mode')
+        self.tagged.tags.add(Tag.objects.create(name='accessibility'))
+        self.run_tasks()
+        self.login(self.alice)
+
+    def search(self, query):
+        response = self.client.get('/api/feedback/', {'search': query})
+        self.assertEqual(response.status_code, 200)
+        return [item['id'] for item in response.data['results']]
+
+    def test_title_matches_rank_first(self):
+        self.assertEqual(self.search('export'), [self.in_title.pk, self.in_description.pk])
+
+    def test_every_word_must_match(self):
+        self.assertEqual(self.search('export report '), [self.in_description.pk])
+
+    def test_last_word_matches_as_a_prefix(self):
+        self.assertEqual(self.search('spread'), [self.in_title.pk])
+        self.assertEqual(self.search('spread '), [])
+
+    @override_settings(FEEDBACK_SEARCH_INCLUDE_COMMENTS=True)
+    def test_tags_and_comments_are_indexed(self):
+        Comment.objects.create(feedback=self.in_description, created_by=self.alice, content='Needs accessibility')
+        self.run_tasks()
+        self.assertEqual(self.search('accessibility'), [self.tagged.pk, self.in_description.pk])
+
+    def test_edits_are_reindexed(self):
+        self.in_title.title = 'Import from spreadsheet'
+        self.in_title.save()
+        self.run_tasks()
+        self.assertEqual(self.search('export'), [self.in_description.pk])
+
+    def test_stop_words_alone_match_nothing(self):
+        self.assertEqual(self.search('the and'), [])
+
+    def test_suggest_corrects_typos(self):
+        response = self.client.get('/api/feedback/suggest/', {'q': 'exporr'})
+        self.assertEqual(response.data['suggestion'], 'export')
+        response = self.client.get('/api/feedback/suggest/', {'q': 'export'})
+        self.assertIsNone(response.data['suggestion'])
+
+    def test_tokenize_folds_case_and_accents(self):
+        self.assertEqual(tokenize('Café au LAIT, a x'), ['cafe', 'au', 'lait'])
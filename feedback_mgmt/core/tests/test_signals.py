@@ -0,0 +1,57 @@
+from django.db import IntegrityError, connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from core.models import Comment
+from core.signals import board_data_changed
+
+from .base import CoreAPITestCase
+
+
+class CommentSignalTests(CoreAPITestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.user = self.make_user('alice')
+        self.boards = [self.make_board('One'), self.make_board('Two')]
+        self.items = [self.make_feedback(board, self.user) for board in self.boards]
+        self.received = []
+        board_data_changed.connect(self.record)
+        self.addCleanup(board_data_changed.disconnect, self.record)
+
+    def record(self, sender, board_ids, **kwargs):
+        self.received.append(set(board_ids))
+
+    def test_bulk_delete_looks_up_boards_once(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            Comment.objects.bulk_create([
+                Comment(feedback=item, created_by=self.user, content=str(i))
+                for i in range(20) for item in self.items
+            ])
+        self.received.clear()
+
+        with CaptureQueriesContext(connection) as captured:
+            with self.captureOnCommitCallbacks(execute=True):
+                Comment.objects.all().delete()
+
+        self.assertEqual(self.received, [{board.pk for board in self.boards}])
+        feedback_reads = [query for query in captured.captured_queries
+                          if query['sql'].startswith('SELECT') and 'FROM "core_feedback"' in query['sql']]
+        self.assertEqual(len(feedback_reads), 1)
+
+    def test_comment_save_notifies_its_board(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            Comment.objects.create(feedback=self.items[1], created_by=self.user, content='hi')
+        self.assertIn({self.boards[1].pk}, self.received)
+
+    def test_comments_after_a_rollback_still_notify(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            try:
+                with transaction.atomic():
+                    Comment.objects.create(feedback=self.items[0], created_by=self.user, content='lost')
+                    raise IntegrityError
+            except IntegrityError:
+                pass
+            Comment.objects.create(feedback=self.items[1], created_by=self.user, content='kept')
+
+        self.assertEqual(len(self.received), 1)
+        self.assertIn(self.boards[1].pk, self.received[0])
@@ -0,0 +1,47 @@
+from .base import CoreAPITestCase
+
+
+class SimilarFeedbackTests(CoreAPITestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.alice = self.make_user('alice')
+        self.board = self.make_board()
+        self.login(self.alice)
+        self.dark = self.create('Add a dark mode to the dashboard', 'The white background hurts at night')
+        self.export = self.create('Export feedback to CSV files')
+
+    def create(self, title, description='', board=None):
+        response = self.client.post('/api/feedback/', {
+            'title': title, 'description': description, 'board': (board or self.board).pk,
+        }, format='json')
+        self.assertEqual(response.status_code, 201)
+        return response.data['id']
+
+    def similar(self, q, **params):
+        response = self.client.get('/api/feedback/similar/', {'board': self.board.pk, 'q': q, **params})
+        self.assertEqual(response.status_code, 200)
+        return response.data['results']
+
+    def test_near_duplicates_are_found_best_first(self):
+        results = self.similar('Add dark mode to the dashboard please')
+
+        self.assertEqual([item['id'] for item in results], [self.dark])
+        self.assertTrue(0 < results[0]['similarity'] <= 1)
+
+    def test_other_boards_and_the_excluded_item_are_skipped(self):
+        self.create('Add a dark mode to the dashboard', board=self.make_board('Other'))
+
+        self.assertEqual(len(self.similar('Add a dark mode to the dashboard')), 1)
+        self.assertEqual(self.similar('Add a dark mode to the dashboard', exclude=self.dark), [])
+
+    def test_edits_are_reindexed(self):
+        self.client.patch(f'/api/feedback/{self.export}/', {'title': 'Add a dark mode to the dashboard'},
+                          format='json')
+
+        self.assertIn(self.export, [item['id'] for item in self.similar('Add a dark mode to the dashboard')])
+
+    def test_private_boards_need_access(self):
+        private = self.make_board('Private', is_public=False)
+        response = self.client.get('/api/feedback/similar/', {'board': private.pk, 'q': 'dark mode'})
+        self.assertEqual(response.status_code, 404)
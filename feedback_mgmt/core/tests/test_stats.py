@@ -0,0 +1,54 @@
+from core.models import Tag, Vote
+from core.stats import compute_board_stats
+from core.votes import reconcile_upvote_counts
+
+from .base import CoreAPITestCase
+
+
+class BoardStatsTests(CoreAPITestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.alice = self.make_user('alice')
+        self.board = self.make_board()
+        self.ui = Tag.objects.create(name='ui')
+        self.bug = Tag.objects.create(name='bug')
+        self.live = self.make_feedback(self.board, self.alice, title='Live')
+        self.live.tags.add(self.ui)
+        self.deleted = self.make_feedback(self.board, self.alice, title='Deleted')
+        self.deleted.tags.add(self.ui, self.bug)
+        Vote.objects.create(feedback=self.live, user=self.alice)
+        reconcile_upvote_counts()
+
+    def test_counts_cover_live_feedback_only(self):
+        self.login(self.alice)
+        self.client.delete(f'/api/feedback/{self.deleted.pk}/')
+
+        stats = compute_board_stats(self.board)
+
+        self.assertEqual((stats['total'], stats['upvotes']), (1, 1))
+        self.assertEqual(stats['by_tag'], [{'id': self.ui.pk, 'name': 'ui', 'count': 1}])
+        self.assertEqual(stats['by_creator'], [{'id': self.alice.pk, 'username': 'alice', 'count': 1}])
+
+    def test_endpoint(self):
+        self.login(self.alice)
+        response = self.client.get(f'/api/boards/{self.board.pk}/stats/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['total'], 2)
+        self.assertEqual({row['name']: row['count'] for row in response.data['by_tag']}, {'ui': 2, 'bug': 1})
+
+    def test_endpoint_is_served_from_the_response_cache(self):
+        self.login(self.alice)
+        url = f'/api/boards/{self.board.pk}/stats/'
+        etag = self.client.get(url)['ETag']
+
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.make_feedback(self.board, self.alice, title='New')
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual((response.status_code, response.data['total']), (200, 3))
+
+    def test_private_boards_need_access(self):
+        self.login(self.make_user('bob'))
+        private = self.make_board('Private', is_public=False, members=[self.alice])
+        self.assertEqual(self.client.get(f'/api/boards/{private.pk}/stats/').status_code, 404)
@@ -0,0 +1,68 @@
+import json
+import os
+import tempfile
+from io import StringIO
+
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+
+from core.benchmarks import compare
+from core.counters import reconcile_comment_counts
+from core.models import Board, Feedback, SearchTerm, User
+from core.votes import reconcile_upvote_counts
+
+
+class SeedAndBenchmarkTests(TestCase):
+
+    def seed(self, **options):
+        options = {'boards': 3, 'users': 10, 'feedback': 40, 'tags': 5, 'votes': 3, 'comments': 1, **options}
+        call_command('seed_synthetic', stdout=StringIO(), **options)
+
+    def test_seeded_data_is_consistent(self):
+        self.seed()
+
+        self.assertEqual((Board.objects.count(), User.objects.count(), Feedback.objects.count()), (3, 10, 40))
+        self.assertEqual(User.objects.get(role=User.ADMIN).username, 'syn_user_0')
+        # Denormalized counters already match the ledgers, and the search index is built.
+        self.assertEqual((reconcile_upvote_counts(), reconcile_comment_counts()), (0, 0))
+        self.assertTrue(SearchTerm.objects.exists())
+
+    def test_prefix_must_be_new(self):
+        self.seed(feedback=1, no_index=True)
+        with self.assertRaises(CommandError):
+            self.seed(feedback=1, no_index=True)
+
+    def test_benchmark_saves_and_checks_a_baseline(self):
+        self.seed(no_index=True)
+        path = self.write({})
+        cache.set('unrelated', 'kept')
+
+        call_command('benchmark', iterations=2, warmup=0, scenario=['feedback_list'],
+                     save_baseline=path, stdout=StringIO())
+        # Cold runs clear caches of their own, never the configured one.
+        self.assertEqual(cache.get('unrelated'), 'kept')
+        with open(path) as stream:
+            baseline = json.load(stream)
+        self.assertEqual(list(baseline), ['feedback_list'])
+
+        regressed = {'feedback_list': dict(baseline['feedback_list'], queries=0, p95_ms=0.001)}
+        with self.assertRaisesMessage(CommandError, 'Regressions against baseline'):
+            call_command('benchmark', iterations=2, warmup=0, scenario=['feedback_list'],
+                         baseline=self.write(regressed), stdout=StringIO())
+
+    def write(self, data):
+        fd, path = tempfile.mkstemp(suffix='.json')
+        with os.fdopen(fd, 'w') as stream:
+            json.dump(data, stream)
+        self.addCleanup(os.remove, path)
+        return path
+
+    def test_compare_reports_query_and_latency_growth(self):
+        baseline = {'list': {'queries': 3, 'p95_ms': 10.0}, 'gone': {'queries': 1, 'p95_ms': 1.0}}
+        results = {'list': {'queries': 4, 'p95_ms': 16.0}, 'new': {'queries': 9, 'p95_ms': 99.0}}
+
+        self.assertEqual(compare(results, baseline, tolerance=0.5), [
+            'list: 4 queries (baseline 3)', 'list: p95 16.0 ms (baseline 10.0 ms)',
+        ])
+        self.assertEqual(compare({'list': {'queries': 3, 'p95_ms': 14.0}}, baseline, tolerance=0.5), [])
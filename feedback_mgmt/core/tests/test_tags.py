@@ -0,0 +1,52 @@
+from core.models import Tag
+from core.tags import resolve_tag_names
+
+from .base import CoreAPITestCase
+
+
+class TagResolutionTests(CoreAPITestCase):
+
+    def test_names_resolve_case_insensitively_in_input_order(self):
+        ui = Tag.objects.create(name='UI')
+
+        ids = resolve_tag_names(['  new   tag ', 'ui', 'New Tag', 'other'])
+
+        self.assertEqual(Tag.objects.count(), 3)
+        self.assertEqual(ids[1], ui.pk)
+        self.assertEqual([Tag.objects.get(pk=pk).name for pk in ids], ['new tag', 'UI', 'other'])
+
+    def test_batch_costs_a_fixed_number_of_queries(self):
+        Tag.objects.create(name='existing')
+        names = ['existing'] + [f'tag {n}' for n in range(20)]
+
+        with self.assertNumQueries(3):
+            resolve_tag_names(names)
+        # Everything is in the local cache now.
+        with self.assertNumQueries(0):
+            self.assertEqual(len(resolve_tag_names(names)), 21)
+
+    def test_unknown_names_are_skipped_without_create(self):
+        self.assertEqual(resolve_tag_names(['missing'], create=False), [])
+        self.assertFalse(Tag.objects.exists())
+
+    def test_renamed_tags_drop_out_of_the_cache(self):
+        tag = Tag.objects.create(name='old')
+        resolve_tag_names(['old'])
+        tag.name = 'new'
+        tag.save()
+
+        self.assertEqual(resolve_tag_names(['old'], create=False), [])
+        self.assertEqual(resolve_tag_names(['new']), [tag.pk])
+
+    def test_feedback_create_links_named_and_existing_tags(self):
+        alice = self.make_user('alice')
+        board = self.make_board()
+        ui = Tag.objects.create(name='ui')
+        self.login(alice)
+
+        response = self.client.post('/api/feedback/', {
+            'title': 'Tags', 'board': board.pk, 'tag_ids': [ui.pk], 'tag_names': ['UI', 'bug'],
+        }, format='json')
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(sorted(tag['name'] for tag in response.data['tags']), ['bug', 'ui'])
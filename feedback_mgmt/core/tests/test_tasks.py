@@ -0,0 +1,78 @@
+from datetime import timedelta
+
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from core import tasks
+from core.models import Task
+
+
+class TaskQueueTests(TestCase):
+
+    def setUp(self):
+        self.calls = []
+        self.register('test.record', self.calls.append)
+        self.register('test.fail', self.fail_task)
+
+    def register(self, name, func):
+        self.addCleanup(tasks._handlers.pop, name, None)
+        tasks.task(name)(func)
+
+    def fail_task(self, payload):
+        raise RuntimeError('boom')
+
+    def test_enqueued_tasks_run_once_and_are_removed(self):
+        tasks.enqueue('test.record', {'n': 1})
+
+        self.assertEqual(tasks.work(), 1)
+        self.assertEqual(self.calls, [{'n': 1}])
+        self.assertFalse(Task.objects.exists())
+        self.assertEqual(tasks.work(), 0)
+
+    def test_pending_tasks_with_a_key_collapse(self):
+        tasks.enqueue('test.record', {'n': 1}, key='same')
+        tasks.enqueue('test.record', {'n': 2}, key='same')
+
+        tasks.work()
+        self.assertEqual(self.calls, [{'n': 1}])
+
+    def test_delayed_tasks_wait(self):
+        tasks.enqueue('test.record', delay=60)
+        self.assertEqual(tasks.work(), 0)
+
+    def test_failures_back_off_then_stop(self):
+        tasks.enqueue('test.fail', max_attempts=2)
+
+        with self.assertLogs('core.tasks', 'WARNING'):
+            tasks.work()
+        row = Task.objects.get()
+        self.assertEqual((row.status, row.attempts), (Task.PENDING, 1))
+        self.assertGreater(row.run_after, timezone.now())
+        self.assertIn('boom', row.last_error)
+
+        Task.objects.update(run_after=timezone.now())
+        with self.assertLogs('core.tasks', 'WARNING'):
+            tasks.work()
+        row.refresh_from_db()
+        self.assertEqual((row.status, row.attempts), (Task.FAILED, 2))
+        self.assertEqual(tasks.work(), 0)
+
+    def test_tasks_of_dead_workers_are_released(self):
+        tasks.enqueue('test.record')
+        tasks.claim('dead-worker')
+        Task.objects.update(locked_at=timezone.now() - timedelta(seconds=tasks.LOCK_TIMEOUT + 1))
+
+        self.assertEqual(tasks.work('live-worker'), 1)
+        self.assertEqual(len(self.calls), 1)
+
+    def test_unknown_tasks_are_rejected(self):
+        with self.assertRaises(KeyError):
+            tasks.enqueue('test.missing')
+
+    @override_settings(TASKS_EAGER=True)
+    def test_eager_mode_runs_on_commit(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            tasks.enqueue('test.record', {'n': 1})
+            self.assertEqual(self.calls, [])
+        self.assertEqual(self.calls, [{'n': 1}])
+        self.assertFalse(Task.objects.exists())
@@ -0,0 +1,74 @@
+import csv
+import io
+import json
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+
+from core.models import Comment, Feedback, User, Vote
+
+from .base import CoreAPITestCase
+
+
+class ImportExportTests(CoreAPITestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.admin = self.make_user('admin', role=User.ADMIN)
+        self.bob = self.make_user('bob')
+        self.board = self.make_board()
+        self.login(self.admin)
+
+    def upload(self, content, name='feedback.ndjson'):
+        upload = SimpleUploadedFile(name, content.encode('utf-8'))
+        return self.client.post('/api/feedback/import/', {'file': upload}, format='multipart')
+
+    def export(self, fmt):
+        response = self.client.get(f'/api/feedback/export/?type={fmt}')
+        self.assertEqual(response.status_code, 200)
+        return b''.join(response.streaming_content).decode('utf-8')
+
+    def test_ndjson_import_writes_rows_and_reports_bad_lines(self):
+        lines = [
+            {'board': self.board.pk, 'title': 'Imported', 'created_by': 'bob', 'tags': ['ui', 'UI'],
+             'voters': ['bob', 'admin'], 'comments': [{'author': 'bob', 'content': '+1'}]},
+            {'board': self.board.pk, 'title': 'Ghost', 'voters': ['nobody']},
+            {'board': 0, 'title': 'Nowhere'},
+        ]
+        content = '\n'.join(json.dumps(line) for line in lines) + '\n{not json\n'
+
+        response = self.upload(content)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['created'], 1)
+        self.assertEqual([error['line'] for error in response.data['errors']], [2, 3, 4])
+        feedback = Feedback.objects.get()
+        self.assertEqual((feedback.created_by, feedback.upvote_count, feedback.comment_count), (self.bob, 2, 1))
+        self.assertEqual([tag.name for tag in feedback.tags.all()], ['ui'])
+        self.assertEqual((Vote.objects.count(), Comment.objects.count()), (2, 1))
+
+    def test_csv_export_imports_back(self):
+        feedback = self.make_feedback(self.board, self.bob, title='Round trip', description='Line one, "two"')
+        Vote.objects.create(feedback=feedback, user=self.bob)
+
+        exported = self.export('csv')
+        rows = list(csv.DictReader(io.StringIO(exported)))
+        self.assertEqual([(row['title'], row['voters']) for row in rows], [('Round trip', 'bob')])
+
+        response = self.upload(exported, name='feedback.csv')
+
+        self.assertEqual((response.data['created'], response.data['errors']), (1, []))
+        copy = Feedback.objects.exclude(pk=feedback.pk).get()
+        self.assertEqual((copy.description, copy.upvote_count), ('Line one, "two"', 1))
+
+    def test_ndjson_and_json_exports_hold_the_same_rows(self):
+        for n in range(3):
+            self.make_feedback(self.board, self.bob, title=f'Item {n}')
+
+        ndjson = [json.loads(line) for line in self.export('ndjson').splitlines()]
+
+        self.assertEqual([row['title'] for row in ndjson], ['Item 0', 'Item 1', 'Item 2'])
+        self.assertEqual(json.loads(self.export('json')), ndjson)
+
+    def test_imports_need_an_admin(self):
+        self.login(self.bob)
+        self.assertEqual(self.upload('{}').status_code, 403)
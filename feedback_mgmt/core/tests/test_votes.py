@@ -0,0 +1,85 @@
+from core.models import Feedback, Vote
+from core.votes import reconcile_upvote_counts
+
+from .base import CoreAPITestCase
+
+
+class UpvoteTests(CoreAPITestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.alice = self.make_user('alice')
+        self.bob = self.make_user('bob')
+        self.board = self.make_board()
+        self.feedback = self.make_feedback(self.board, self.alice)
+
+    def upvote(self, user):
+        self.login(user)
+        return self.client.post(f'/api/feedback/{self.feedback.pk}/upvote/')
+
+    def count(self):
+        return Feedback.objects.values_list('upvote_count', flat=True).get(pk=self.feedback.pk)
+
+    def test_toggle_moves_counter_with_the_ledger(self):
+        self.assertEqual(self.upvote(self.alice).data['detail'], 'Upvoted successfully.')
+        self.upvote(self.bob)
+        self.assertEqual(self.count(), 2)
+
+        self.assertEqual(self.upvote(self.alice).data['detail'], 'Upvote removed.')
+        self.assertEqual(self.count(), 1)
+        self.assertEqual(list(Vote.objects.values_list('user__username', flat=True)), ['bob'])
+        self.assertEqual(self.count(), Vote.objects.filter(feedback=self.feedback).count())
+
+    def test_scores_follow_votes(self):
+        self.upvote(self.alice)
+        feedback = Feedback.objects.get(pk=self.feedback.pk)
+        self.assertGreater(feedback.hot_score, 0)
+        self.assertEqual(feedback.trending_score, 1)
+
+        self.upvote(self.alice)
+        feedback.refresh_from_db()
+        self.assertEqual(feedback.trending_score, 0)
+
+    def test_payload_has_count_and_per_user_state(self):
+        self.upvote(self.bob)
+        self.login(self.alice)
+
+        response = self.client.get(f'/api/feedback/{self.feedback.pk}/')
+
+        self.assertEqual((response.data['upvote_count'], response.data['has_upvoted']), (1, False))
+        self.assertEqual(self.client.get('/api/feedback/my-votes/').data['ids'], [])
+
+    def test_reconcile_fixes_drifted_counters_only(self):
+        self.upvote(self.alice)
+        untouched = self.make_feedback(self.board, self.bob, title='Untouched')
+        Feedback.objects.filter(pk=self.feedback.pk).update(upvote_count=7)
+
+        self.assertEqual(reconcile_upvote_counts(), 1)
+        self.assertEqual(self.count(), 1)
+        untouched.refresh_from_db()
+        self.assertEqual(untouched.upvote_count, 0)
+
+
+class HasUpvotedTests(CoreAPITestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.alice = self.make_user('alice')
+        self.board = self.make_board()
+        self.items = [self.make_feedback(self.board, self.alice, title=f'Item {n}') for n in range(4)]
+        for item in self.items[:2]:
+            Vote.objects.create(feedback=item, user=self.alice)
+        self.login(self.alice)
+
+    def test_list_rows_carry_the_users_vote_state(self):
+        response = self.client.get('/api/feedback/?ordering=title')
+
+        self.assertEqual([item['has_upvoted'] for item in response.data['results']], [True, True, False, False])
+
+    def test_my_votes_lists_live_voted_ids(self):
+        self.items[0].deleted_at = self.items[0].created_at
+        self.items[0].save()
+
+        response = self.client.get(f'/api/feedback/my-votes/?board={self.board.pk}')
+
+        self.assertEqual(response.data['ids'], [self.items[1].pk])
@@ -0,0 +1,272 @@
+"""
+Streaming bulk import and export of feedback (NDJSON or CSV; export also
+as one JSON array).
+
+Import reads rows lazily, validates them in batches and writes each batch
+with a handful of bulk_create calls (feedback, tag links, votes, comments).
+Export walks the board in primary-key batches, so memory stays flat no matter
+how large the board is.
+
+Row shape (NDJSON; CSV uses the same column names, with `tags` and `voters`
+joined by "|" and no comments; the JSON array holds the same objects):
+
+    {"board": 1, "title": "...", "description": "...", "status": "open",
+     "feedback_type": "bug", "created_by": "alice", "created_at": "2025-01-01T00:00:00Z",
+     "tags": ["ui"], "voters": ["bob"], "comments": [{"author": "bob", "content": "+1"}]}
+"""
+import csv
+import io
+from itertools import islice
+
+from django.db import transaction
+
+from .models import Board, Comment, Feedback, User, Vote
+from .ranking import rescore_feedback
+from .renderers import dumps, iter_json_array, loads
+from .search import reindex_feedback
+from .similarity import reindex_similarity
+from .serializers import FeedbackImportRowSerializer
+from .signals import notify_boards_changed
+from .tags import normalize_tag_name, resolve_tag_map
+
+FORMATS = ('ndjson', 'csv')
+EXPORT_FORMATS = (*FORMATS, 'json')
+EXPORT_CONTENT_TYPES = {'ndjson': 'application/x-ndjson', 'csv': 'text/csv', 'json': 'application/json'}
+CSV_COLUMNS = ['id', 'board', 'title', 'description', 'status', 'feedback_type',
+               'created_by', 'created_at', 'upvote_count', 'comment_count', 'tags', 'voters']
+LIST_SEPARATOR = '|'
+DEFAULT_BATCH_SIZE = 1000
+
+
+def read_rows(stream, fmt):
+    """
+    Yield (line_number, row dict or None, parse error or None) from a binary or text stream.
+    """
+    if isinstance(stream.read(0), bytes):
+        stream = io.TextIOWrapper(stream, encoding='utf-8', newline='')
+
+    if fmt == 'csv':
+        reader = csv.DictReader(stream)
+        for row in reader:
+            for key in ('tags', 'voters'):
+                value = row.get(key) or ''
+                row[key] = [item for item in value.split(LIST_SEPARATOR) if item.strip()]
+            # Empty cells mean "use the default", not an empty value
+            row = {key: value for key, value in row.items() if value not in ('', None)}
+            yield reader.line_num, row, None
+        return
+
+    for line_number, line in enumerate(stream, start=1):
+        if not line.strip():
+            continue
+        try:
+            row = loads(line)
+        except ValueError as exc:
+            yield line_number, None, {'non_field_errors': [f'Invalid JSON: {exc}']}
+            continue
+        if not isinstance(row, dict):
+            yield line_number, None, {'non_field_errors': ['Each line must be a JSON object.']}
+            continue
+        yield line_number, row, None
+
+
+class FeedbackImporter:
+    """
+    Imports rows into boards in `allowed_board_ids` (None means any board).
+    Rows without `created_by` are attributed to `default_user`.
+    """
+
+    def __init__(self, allowed_board_ids=None, default_user=None, batch_size=DEFAULT_BATCH_SIZE):
+        self.allowed_board_ids = allowed_board_ids
+        self.default_user = default_user
+        self.batch_size = batch_size
+        self.created = 0
+        self.errors = []
+
+    def run(self, rows):
+        rows = iter(rows)
+        while True:
+            batch = list(islice(rows, self.batch_size))
+            if not batch:
+                break
+            self.import_batch(batch)
+        self.errors.sort(key=lambda error: error['line'])
+        return {'created': self.created, 'errors': self.errors}
+
+    def import_batch(self, batch):
+        valid = []
+        for line, row, error in batch:
+            if error:
+                self.errors.append({'line': line, 'errors': error})
+                continue
+            serializer = FeedbackImportRowSerializer(data=row)
+            if serializer.is_valid():
+                valid.append((line, serializer.validated_data))
+            else:
+                self.errors.append({'line': line, 'errors': serializer.errors})
+        if not valid:
+            return
+
+        boards = set(Board.objects.filter(pk__in={data['board'] for _, data in valid}).values_list('pk', flat=True))
+        if self.allowed_board_ids is not None:
+            boards &= set(self.allowed_board_ids)
+
+        usernames = set()
+        for _, data in valid:
+            usernames.update(filter(None, [data.get('created_by')]))
+            usernames.update(data['voters'])
+            usernames.update(filter(None, (comment.get('author') for comment in data['comments'])))
+        users = dict(User.objects.filter(username__in=usernames).values_list('username', 'pk'))
+
+        accepted = []
+        for line, data in valid:
+            problems = {}
+            if data['board'] not in boards:
+                problems['board'] = ['Unknown board or no access.']
+            referenced = set(filter(None, [data.get('created_by')])) | set(data['voters']) | \
+                set(filter(None, (comment.get('author') for comment in data['comments'])))
+            unknown = sorted(referenced - set(users))
+            if unknown:
+                problems['users'] = [f'Unknown usernames: {unknown}']
+            if problems:
+                self.errors.append({'line': line, 'errors': problems})
+            else:
+                accepted.append(data)
+
+        if accepted:
+            self.write(accepted, users)
+
+    def write(self, rows, users):
+        tag_map = resolve_tag_map(name for data in rows for name in data['tags'])
+        default_user_id = self.default_user.pk if self.default_user else None
+
+        with transaction.atomic():
+            items = [
+                Feedback(
+                    board_id=data['board'],
+                    title=data['title'],
+                    description=data['description'],
+                    status=data['status'],
+                    feedback_type=data['feedback_type'],
+                    created_by_id=users.get(data.get('created_by')) or default_user_id,
+                    upvote_count=len(set(data['voters'])),
+                    comment_count=len(data['comments']),
+                )
+                for data in rows
+            ]
+            Feedback.objects.bulk_create(items)
+
+            # auto_now_add ignores values passed to bulk_create, so restore imported timestamps.
+            dated = []
+            for item, data in zip(items, rows):
+                if data.get('created_at'):
+                    item.created_at = data['created_at']
+                    dated.append(item)
+            if dated:
+                Feedback.objects.bulk_update(dated, ['created_at'], batch_size=self.batch_size)
+
+            Link = Feedback.tags.through
+            links, votes, comments, dated_comments = [], [], [], []
+            for item, data in zip(items, rows):
+                tag_ids = {tag_map[key] for key in (normalize_tag_name(n).lower() for n in data['tags']) if key in tag_map}
+                links.extend(Link(feedback_id=item.pk, tag_id=tag_id) for tag_id in tag_ids)
+                votes.extend(Vote(feedback_id=item.pk, user_id=users[name]) for name in set(data['voters']))
+                for comment in data['comments']:
+                    obj = Comment(
+                        feedback_id=item.pk,
+                        created_by_id=users.get(comment.get('author')) or default_user_id,
+                        content=comment['content'],
+                    )
+                    comments.append(obj)
+                    if comment.get('created_at'):
+                        dated_comments.append((obj, comment['created_at']))
+
+            Link.objects.bulk_create(links, ignore_conflicts=True, batch_size=self.batch_size)
+            Vote.objects.bulk_create(votes, ignore_conflicts=True, batch_size=self.batch_size)
+            Comment.objects.bulk_create(comments, batch_size=self.batch_size)
+            if dated_comments:
+                for obj, created_at in dated_comments:
+                    obj.created_at = created_at
+                Comment.objects.bulk_update([obj for obj, _ in dated_comments], ['created_at'],
+                                            batch_size=self.batch_size)
+
+            # bulk_create skips model signals, so index, score and notify explicitly.
+            reindex_feedback([item.pk for item in items])
+            rescore_feedback([item.pk for item in items])
+            reindex_similarity([item.pk for item in items])
+            notify_boards_changed({item.board_id for item in items})
+
+        self.created += len(items)
+
+
+def export_rows(queryset, batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Yield export dicts for a Feedback queryset, loading `batch_size` rows at a time.
+    """
+    queryset = queryset.order_by('pk')
+    fields = ['id', 'board_id', 'title', 'description', 'status', 'feedback_type',
+              'created_by__username', 'created_at', 'upvote_count', 'comment_count']
+    last_pk = 0
+    while True:
+        batch = list(queryset.filter(pk__gt=last_pk).values(*fields)[:batch_size])
+        if not batch:
+            return
+        ids = [row['id'] for row in batch]
+        last_pk = ids[-1]
+
+        tags, voters, comments = {}, {}, {}
+        for feedback_id, name in Feedback.tags.through.objects.filter(feedback_id__in=ids) \
+                .values_list('feedback_id', 'tag__name'):
+            tags.setdefault(feedback_id, []).append(name)
+        for feedback_id, username in Vote.objects.filter(feedback_id__in=ids) \
+                .values_list('feedback_id', 'user__username'):
+            voters.setdefault(feedback_id, []).append(username)
+        for feedback_id, author, content, created_at in Comment.objects.filter(feedback_id__in=ids) \
+                .order_by('created_at', 'pk') \
+                .values_list('feedback_id', 'created_by__username', 'content', 'created_at'):
+            comments.setdefault(feedback_id, []).append(
+                {'author': author, 'content': content, 'created_at': created_at.isoformat()}
+            )
+
+        for row in batch:
+            yield {
+                'id': row['id'],
+                'board': row['board_id'],
+                'title': row['title'],
+                'description': row['description'],
+                'status': row['status'],
+                'feedback_type': row['feedback_type'],
+                'created_by': row['created_by__username'],
+                'created_at': row['created_at'].isoformat(),
+                'upvote_count': row['upvote_count'],
+                'comment_count': row['comment_count'],
+                'tags': tags.get(row['id'], []),
+                'voters': voters.get(row['id'], []),
+                'comments': comments.get(row['id'], []),
+            }
+
+
+def render_export(rows, fmt):
+    """
+    Turn export dicts into an iterator of text chunks (one per row; the JSON
+    array in chunks of core.renderers.ARRAY_CHUNK_ITEMS rows).
+    """
+    if fmt == 'json':
+        yield from iter_json_array(rows)
+        return
+
+    if fmt == 'csv':
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=CSV_COLUMNS, extrasaction='ignore')
+        writer.writeheader()
+        yield buffer.getvalue()
+        for row in rows:
+            buffer.seek(0)
+            buffer.truncate()
+            writer.writerow(dict(row, tags=LIST_SEPARATOR.join(row['tags']),
+                                 voters=LIST_SEPARATOR.join(row['voters'])))
+            yield buffer.getvalue()
+        return
+
+    for row in rows:
+        yield dumps(row).decode('utf-8') + '\n'
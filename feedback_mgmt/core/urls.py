@@ -1,7 +1,11 @@
+from django.conf import settings
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import BoardViewSet, FeedbackViewSet, CommentViewSet, TagViewSet
+from .views import BoardViewSet, FeedbackViewSet, CommentViewSet, TagViewSet, DeletionJobViewSet
+from .views_async import async_read_view
 from .views_auth import CustomTokenObtainPairView, register_user
+from .views_events import board_events
+from .views_metrics import metrics
 from rest_framework_simplejwt.views import TokenRefreshView
 
 router = DefaultRouter()
@@ -9,9 +13,27 @@ router.register(r'boards', BoardViewSet, basename='boards')
 router.register(r'feedback', FeedbackViewSet, basename='feedback')
 router.register(r'comments', CommentViewSet, basename='comments')
 router.register(r'tags', TagViewSet, basename='tags')
+router.register(r'deletions', DeletionJobViewSet, basename='deletions')
+
+# List/detail routes on the async read path (core.views_async). With
+# ASYNC_READ_VIEWS they come ahead of the router, which still serves everything else.
+async_read_urlpatterns = []
+for prefix, viewset in [('boards', BoardViewSet), ('feedback', FeedbackViewSet),
+                        ('comments', CommentViewSet), ('tags', TagViewSet)]:
+    async_read_urlpatterns += [
+        path(f'{prefix}/', async_read_view(viewset, prefix), name=f'{prefix}-list'),
+        path(f'{prefix}/<int:pk>/', async_read_view(viewset, prefix, detail=True), name=f'{prefix}-detail'),
+    ]
 
 urlpatterns = [
+    *(async_read_urlpatterns if settings.ASYNC_READ_VIEWS else []),
     path('', include(router.urls)),
+
+    # Realtime board events (SSE, served under ASGI)
+    path('boards/<int:board_id>/events/', board_events, name='board_events'),
+
+    # Prometheus scrape endpoint
+    path('metrics/', metrics, name='metrics'),
     
     # Auth endpoints
     path('auth/token/', CustomTokenObtainPairView.as_view(), name='token_obtain_pair'),
@@ -1,21 +1,36 @@
 from django.db import models
+from django.http import StreamingHttpResponse
 from rest_framework import viewsets, filters, status, permissions
+from rest_framework.parsers import MultiPartParser
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
 
-from .models import User, Board, Feedback, Comment, Tag, BoardMembership
+from .models import User, Board, Feedback, Comment, Tag, BoardMembership, DeletionJob
 from .serializers import (
-    UserSerializer, BoardSerializer, FeedbackSerializer, CommentSerializer, TagSerializer
+    UserSerializer, BoardSerializer, FeedbackSerializer, CommentSerializer, TagSerializer,
+    FeedbackBulkSerializer, DeletionJobSerializer,
 )
+from .serializers_common import field_requested, requested_expansions
 from .permissions import IsAdmin, IsOwnerOrAdmin, IsBoardMemberOrPublic
-from rest_framework import viewsets, permissions
-from .models import Tag
-from .serializers import TagSerializer
-from .permissions import IsAdmin
-
-
-class BoardViewSet(viewsets.ModelViewSet):
+from .access import accessible_board_ids, scoped_board_ids
+from .bulk import bulk_feedback_action
+from .deletion import soft_delete_boards, soft_delete_feedback
+from .events import feedback_delta, publish_event
+from .filters import FeedbackFilter, FeedbackOrderingFilter, FeedbackSearchFilter
+from .instrumentation import SerializerTimingMixin
+from .kanban import KanbanBoard
+from .merge import merge_feedback
+from .pagination import FeedbackPagination, KeysetPagination
+from .response_cache import ALL_BOARDS, BOARD_LIST, VersionedCacheMixin, cached_response
+from .search import get_search_backend
+from .similarity import find_similar
+from .stats import compute_board_stats
+from .transfer import EXPORT_CONTENT_TYPES, EXPORT_FORMATS, FORMATS, FeedbackImporter, export_rows, read_rows, render_export
+from .votes import annotate_has_upvoted, toggle_upvote, voted_feedback_ids
+
+
+class BoardViewSet(SerializerTimingMixin, VersionedCacheMixin, viewsets.ModelViewSet):
     """
     Boards: list and retrieve accessible by all members or public.
     Create, update, delete restricted to admins only.
@@ -34,11 +49,23 @@ class BoardViewSet(viewsets.ModelViewSet):
         return [permission() for permission in permission_classes]
 
     def get_queryset(self):
-        user = self.request.user
-        return Board.objects.filter(
-            models.Q(is_public=True) | 
-            models.Q(members=user)
-        ).distinct()
+        queryset = Board.objects.filter(id__in=accessible_board_ids(self.request)) \
+            .annotate(member_count=models.Count('boardmembership')) \
+            .order_by('id')
+        if self.action != 'list' or 'members' in requested_expansions(self.request):
+            queryset = queryset.prefetch_related('members')
+        return queryset
+
+    def get_cache_scopes(self, request):
+        return [BOARD_LIST]
+
+    def destroy(self, request, *args, **kwargs):
+        """
+        Hide the board at once and purge its feedback in the background.
+        Responds 202 with the DeletionJob to poll at /deletions/<id>/.
+        """
+        job = soft_delete_boards([self.get_object()], request.user)
+        return Response(DeletionJobSerializer(job).data, status=status.HTTP_202_ACCEPTED)
 
     @action(detail=True, methods=['post'], url_path='add-member', permission_classes=[IsAdmin])
     def add_member(self, request, pk=None):
@@ -54,71 +81,101 @@ class BoardViewSet(viewsets.ModelViewSet):
         BoardMembership.objects.get_or_create(user=user_to_add, board=board)
         return Response({'detail': f'User {username} added to board.'})
 
+    @action(detail=True, methods=['get'], url_path='stats')
+    def stats(self, request, pk=None):
+        """
+        Aggregated counts for the dashboard (by status, type, tag, creator and day).
+        """
+        board = self.get_object()
+        return cached_response(request, [board.pk], lambda: Response(compute_board_stats(board)))
+
+    @action(detail=True, methods=['get'], url_path='kanban')
+    def kanban(self, request, pk=None):
+        """
+        Every status column's first ?per_column= items (default 20) with its total
+        `count` and a `next` link; following a link (?status=&cursor=) pages one column.
+        Accepts the feedback list's ?ordering= (including hot/trending) and ?fields=.
+        """
+        board = self.get_object()
+        return cached_response(request, [board.pk], lambda: self._kanban(request, board), per_user=True)
 
-from rest_framework import viewsets, permissions, status, filters
-from rest_framework.decorators import action
-from rest_framework.response import Response
-from django_filters.rest_framework import DjangoFilterBackend, FilterSet, CharFilter
-from .models import Feedback
-from .serializers import FeedbackSerializer
-from .permissions import IsBoardMemberOrPublic, IsOwnerOrAdmin
-
-
-# Custom FilterSet to enable tag_name filtering
-class FeedbackFilter(FilterSet):
-    tag_name = CharFilter(field_name='tags__name', lookup_expr='icontains')
+    def _kanban(self, request, board):
+        queryset = Feedback.objects.filter(board_id=board.pk).select_related('board', 'created_by')
+        if field_requested(request, 'tags'):
+            queryset = queryset.prefetch_related('tags')
+        if field_requested(request, 'has_upvoted'):
+            queryset = annotate_has_upvoted(queryset, request.user)
 
-    class Meta:
-        model = Feedback
-        fields = ['status', 'feedback_type', 'board', 'tags', 'tag_name']
+        context = self.get_serializer_context()
+        kanban = KanbanBoard(request, queryset, lambda items: FeedbackSerializer(items, many=True, context=context).data)
+        if 'cursor' in request.query_params:
+            return kanban.column_page(request.query_params.get('status'))
+        return Response({'board': board.pk, **kanban.columns()})
 
 
-class FeedbackViewSet(viewsets.ModelViewSet):
+class FeedbackViewSet(SerializerTimingMixin, VersionedCacheMixin, viewsets.ModelViewSet):
     serializer_class = FeedbackSerializer
     queryset = Feedback.objects.all()
+    pagination_class = FeedbackPagination
 
     # Filtering, searching, ordering
     filter_backends = [
         DjangoFilterBackend,
-        filters.OrderingFilter,
-        filters.SearchFilter,
+        FeedbackOrderingFilter,
+        FeedbackSearchFilter,
     ]
-    filterset_class = FeedbackFilter  # ✅ Use custom filter
-    search_fields = ['title', 'description']
-    ordering_fields = ['created_at', 'upvotes', 'title', 'status']
-    ordering = ['-upvotes']
+    filterset_class = FeedbackFilter
+    ordering_fields = ['created_at', 'upvote_count', 'title', 'status']
+    ordering = ['-upvote_count']
+    # Payloads carry has_upvoted, so cached responses can't be shared between users.
+    cache_per_user = True
 
     def get_queryset(self):
-        user = self.request.user
-        return Feedback.objects.select_related('board', 'created_by') \
-            .prefetch_related('tags', 'upvotes') \
-            .filter(
-                models.Q(board__is_public=True) |
-                models.Q(board__members=user)
-            ).distinct()
+        queryset = Feedback.objects.select_related('board', 'created_by') \
+            .prefetch_related('tags') \
+            .filter(board_id__in=accessible_board_ids(self.request))
+        if field_requested(self.request, 'has_upvoted'):
+            queryset = annotate_has_upvoted(queryset, self.request.user)
+        return queryset
+
+    def get_cache_scopes(self, request):
+        # A board-scoped list (what the kanban and dashboard poll) only depends on that board.
+        board = request.query_params.get('board')
+        if self.action == 'list' and board and board.isdigit():
+            return [int(board)]
+        return [ALL_BOARDS]
 
     def get_permissions(self):
         if self.action in ['update', 'partial_update', 'destroy']:
             permission_classes = [IsOwnerOrAdmin]
+        elif self.action in ['import_feedback', 'merge']:
+            permission_classes = [IsAdmin]
         else:
             permission_classes = [permissions.IsAuthenticated, IsBoardMemberOrPublic]
         return [permission() for permission in permission_classes]
 
     def perform_create(self, serializer):
-        serializer.save(created_by=self.request.user)
+        feedback = serializer.save(created_by=self.request.user)
+        publish_event(feedback.board_id, 'feedback.created', feedback_delta(feedback))
+
+    def perform_update(self, serializer):
+        feedback = serializer.save()
+        publish_event(feedback.board_id, 'feedback.updated', feedback_delta(feedback))
+
+    def destroy(self, request, *args, **kwargs):
+        feedback = self.get_object()
+        job = soft_delete_feedback([feedback.pk], [feedback.board_id], request.user)
+        publish_event(feedback.board_id, 'feedback.bulk', {'action': 'delete', 'ids': [feedback.pk], 'status': None})
+        return Response(DeletionJobSerializer(job).data, status=status.HTTP_202_ACCEPTED)
 
 
     @action(detail=True, methods=['post'], url_path='upvote', permission_classes=[permissions.IsAuthenticated])
     def upvote(self, request, pk=None):
         feedback = self.get_object()
-        user = request.user
 
-        if feedback.upvotes.filter(id=user.id).exists():
-            feedback.upvotes.remove(user)
-            return Response({'detail': 'Upvote removed.'})
-        else:
-            feedback.upvotes.add(user)
+        if toggle_upvote(feedback, request.user):
             return Response({'detail': 'Upvoted successfully.'})
+        return Response({'detail': 'Upvote removed.'})
 
     @action(detail=True, methods=['post'], url_path='move', permission_classes=[permissions.IsAuthenticated])
     def move(self, request, pk=None):
@@ -133,25 +190,147 @@ class FeedbackViewSet(viewsets.ModelViewSet):
             return Response({'detail': 'Invalid status.'}, status=status.HTTP_400_BAD_REQUEST)
 
         feedback.status = new_status
-        feedback.save()
+        feedback.save(update_fields=['status', 'updated_at'])
+        publish_event(feedback.board_id, 'feedback.moved', {'id': feedback.pk, 'status': new_status})
         return Response({'detail': f'Status changed to {new_status}', 'new_status': new_status})
 
-
-
-
-from rest_framework import viewsets, permissions
-from django.db import models
-from .models import Comment
-from .serializers import CommentSerializer
-from .permissions import IsOwnerOrAdmin, IsBoardMemberOrPublic
-
-
-class CommentViewSet(viewsets.ModelViewSet):
+    @action(detail=False, methods=['get'], url_path='my-votes')
+    def my_votes(self, request):
+        """
+        Ids of the feedback the current user has upvoted, on ?board= or every accessible board.
+        """
+        board = request.query_params.get('board', '')
+        scopes = [int(board)] if board.isdigit() else [ALL_BOARDS]
+        return cached_response(
+            request, scopes,
+            lambda: Response({'ids': voted_feedback_ids(request.user, scoped_board_ids(request))}),
+            per_user=True,
+        )
+
+    @action(detail=False, methods=['get'], url_path='similar')
+    def similar(self, request):
+        """
+        Possible duplicates of the text being typed: ?board=&q=[&exclude=<id>][&limit=]
+        """
+        board = request.query_params.get('board', '')
+        if not board.isdigit():
+            return Response({'detail': 'board required.'}, status=status.HTTP_400_BAD_REQUEST)
+        if int(board) not in accessible_board_ids(request):
+            return Response({'detail': 'Not found.'}, status=status.HTTP_404_NOT_FOUND)
+        exclude = request.query_params.get('exclude', '')
+        try:
+            limit = min(max(int(request.query_params.get('limit', 5)), 1), 20)
+        except ValueError:
+            limit = 5
+
+        items = find_similar(int(board), request.query_params.get('q', ''), limit=limit,
+                             exclude=int(exclude) if exclude.isdigit() else None)
+        return Response({'results': [
+            {'id': item.pk, 'title': item.title, 'status': item.status,
+             'upvote_count': item.upvote_count, 'similarity': item.similarity}
+            for item in items
+        ]})
+
+    @action(detail=True, methods=['post'], url_path='merge', permission_classes=[IsAdmin])
+    def merge(self, request, pk=None):
+        """
+        Fold duplicates into this item. Body: {"ids": [12, 15]}
+        """
+        feedback = self.get_object()
+        ids = request.data.get('ids')
+        if not isinstance(ids, list) or not ids or not all(isinstance(i, int) for i in ids):
+            return Response({'detail': 'ids must be a non-empty list of ids.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        merged = merge_feedback(feedback, ids, user=request.user)
+        return Response({'id': feedback.pk, 'merged': merged})
+
+    @action(detail=True, methods=['get'], url_path='comments')
+    def comments(self, request, pk=None):
+        """
+        Thread for one feedback item, oldest first, with cursor paging (?cursor=&page_size=).
+        """
+        feedback = self.get_object()
+        queryset = Comment.objects.filter(feedback_id=feedback.pk) \
+            .select_related('created_by') \
+            .order_by('created_at', 'pk')
+
+        paginator = KeysetPagination()
+        page = paginator.paginate_queryset(queryset, request, view=self)
+        serializer = CommentSerializer(page, many=True, context=self.get_serializer_context())
+        return paginator.get_paginated_response(serializer.data)
+
+    @action(detail=False, methods=['post'], url_path='bulk', permission_classes=[permissions.IsAuthenticated])
+    def bulk(self, request):
+        """
+        Move, tag, untag or delete many feedback items at once.
+        Body: {"action": "move", "ids": [1, 2], "status": "completed"}
+        A delete responds 202 with the DeletionJob as `job`, as destroy does.
+        """
+        serializer = FeedbackBulkSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+
+        results, job = bulk_feedback_action(
+            request, data['action'], data['ids'],
+            status=data.get('status'),
+            tag_ids=data.get('tag_ids'),
+            tag_names=data.get('tag_names'),
+        )
+        if job is None:
+            return Response({'action': data['action'], 'results': results})
+        return Response({'action': data['action'], 'results': results, 'job': DeletionJobSerializer(job).data},
+                        status=status.HTTP_202_ACCEPTED)
+
+    @action(detail=False, methods=['post'], url_path='import', permission_classes=[IsAdmin],
+            parser_classes=[MultiPartParser])
+    def import_feedback(self, request):
+        """
+        Upload an NDJSON or CSV file as `file` (multipart). Returns created count and per-line errors.
+        """
+        upload = request.FILES.get('file')
+        if upload is None:
+            return Response({'detail': 'file required.'}, status=status.HTTP_400_BAD_REQUEST)
+        fmt = request.data.get('type') or ('csv' if upload.name.endswith('.csv') else 'ndjson')
+        if fmt not in FORMATS:
+            return Response({'detail': 'Invalid type.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        importer = FeedbackImporter(allowed_board_ids=accessible_board_ids(request), default_user=request.user)
+        report = importer.run(read_rows(upload, fmt))
+        return Response(report)
+
+    @action(detail=False, methods=['get'], url_path='export')
+    def export(self, request):
+        """
+        Stream accessible feedback as NDJSON (default), CSV (?type=csv) or one JSON
+        array (?type=json); honours the list filters.
+        """
+        fmt = request.query_params.get('type', 'ndjson')
+        if fmt not in EXPORT_FORMATS:
+            return Response({'detail': 'Invalid type.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        queryset = self.filter_queryset(Feedback.objects.filter(board_id__in=accessible_board_ids(request)))
+        response = StreamingHttpResponse(render_export(export_rows(queryset), fmt),
+                                         content_type=EXPORT_CONTENT_TYPES[fmt])
+        response['Content-Disposition'] = f'attachment; filename="feedback.{fmt}"'
+        return response
+
+    @action(detail=False, methods=['get'], url_path='suggest')
+    def suggest(self, request):
+        """
+        "Did you mean" for a search query: ?q=...&board=...
+        """
+        query = request.query_params.get('q', '')
+        suggestion = get_search_backend().suggest(query, scoped_board_ids(request))
+        return Response({'query': query, 'suggestion': suggestion})
+
+
+class CommentViewSet(SerializerTimingMixin, viewsets.ModelViewSet):
     """
     Comments: list/retrieve allowed for board members or public.
     Updates/deletes allowed for comment creator or admins.
     """
     serializer_class = CommentSerializer
+    pagination_class = FeedbackPagination
 
     def get_permissions(self):
         if self.action in ['update', 'partial_update', 'destroy']:
@@ -161,12 +340,11 @@ class CommentViewSet(viewsets.ModelViewSet):
         return [permission() for permission in permission_classes]
 
     def get_queryset(self):
-        user = self.request.user
         feedback_id = self.request.query_params.get('feedback')
 
         queryset = Comment.objects.filter(
-            models.Q(feedback__board__is_public=True) |
-            models.Q(feedback__board__members=user)
+            feedback__board_id__in=accessible_board_ids(self.request),
+            feedback__deleted_at__isnull=True,
         ).select_related('feedback', 'created_by')
 
         if feedback_id:
@@ -175,9 +353,10 @@ class CommentViewSet(viewsets.ModelViewSet):
         return queryset.order_by('created_at')  # oldest to newest
 
     def perform_create(self, serializer):
-        serializer.save(created_by=self.request.user)
+        comment = serializer.save(created_by=self.request.user)
+        publish_event(comment.feedback.board_id, 'comment.created', {'id': comment.pk, 'feedback': comment.feedback_id})
 
-class TagViewSet(viewsets.ModelViewSet):
+class TagViewSet(SerializerTimingMixin, viewsets.ModelViewSet):
     """
     Tag API:
     - Anyone (even unauthenticated) can list and retrieve tags.
@@ -195,4 +374,15 @@ class TagViewSet(viewsets.ModelViewSet):
         return [permissions.IsAuthenticated()]
 
 
+class DeletionJobViewSet(SerializerTimingMixin, viewsets.ReadOnlyModelViewSet):
+    """
+    Progress of background deletions. Admins see every job, other users the ones they started.
+    """
+    serializer_class = DeletionJobSerializer
+    permission_classes = [permissions.IsAuthenticated]
 
+    def get_queryset(self):
+        queryset = DeletionJob.objects.select_related('requested_by').order_by('-id')
+        if self.request.user.role != 'admin':
+            queryset = queryset.filter(requested_by=self.request.user)
+        return queryset
@@ -0,0 +1,146 @@
+"""
+Async read path for the list and retrieve endpoints (served under ASGI).
+
+`async_read_view()` wraps a viewset so GET and HEAD run as a coroutine.
+Authentication, the board access set, the response cache, counting and row
+fetching use async APIs (CachedJWTAuthentication.aauthenticate,
+aaccessible_board_ids, acached_response, acount/aiterator). Everything else
+is the viewset's own code, so payloads, status codes and headers match the
+sync path: get_queryset, filters, permissions, serializers, pagination
+links and exception handling. Other methods go to the sync viewset unchanged.
+
+Two steps stay synchronous, each in a single sync_to_async hop:
+django-filter's form validation (it looks up `?board=`/`?tags=` choices)
+and authenticators without an async variant.
+
+Enabled with settings.ASYNC_READ_VIEWS; see core.urls.
+"""
+from asgiref.sync import sync_to_async
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.http import Http404
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework import exceptions
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+
+from .access import aaccessible_board_ids
+from .pagination import apaginate_page_number
+from .response_cache import VersionedCacheMixin, acached_response
+
+LIST_ACTIONS = {'get': 'list', 'post': 'create'}
+DETAIL_ACTIONS = {'get': 'retrieve', 'put': 'update', 'patch': 'partial_update', 'delete': 'destroy'}
+ASYNC_METHODS = ('GET', 'HEAD')
+
+
+async def authenticate(request):
+    """
+    Request._authenticate() with awaitable authenticators.
+    """
+    for authenticator in request.authenticators:
+        try:
+            if hasattr(authenticator, 'aauthenticate'):
+                user_auth = await authenticator.aauthenticate(request)
+            else:
+                user_auth = await sync_to_async(authenticator.authenticate)(request)
+        except exceptions.APIException:
+            request._not_authenticated()
+            raise
+        if user_auth is not None:
+            request._authenticator = authenticator
+            request.user, request.auth = user_auth
+            return
+    request._not_authenticated()
+
+
+async def apaginate(view, queryset, request):
+    paginator = view.paginator
+    if paginator is None:
+        return None
+    if hasattr(paginator, 'apaginate_queryset'):
+        return await paginator.apaginate_queryset(queryset, request, view)
+    if isinstance(paginator, PageNumberPagination):
+        return await apaginate_page_number(paginator, queryset, request, view)
+    return await sync_to_async(paginator.paginate_queryset)(queryset, request, view)
+
+
+async def alist(view, request):
+    queryset = await sync_to_async(view.filter_queryset)(view.get_queryset())
+    page = await apaginate(view, queryset, request)
+    if page is not None:
+        return view.get_paginated_response(view.get_serializer(page, many=True).data)
+    items = [obj async for obj in queryset.aiterator(chunk_size=2000)]
+    return Response(view.get_serializer(items, many=True).data)
+
+
+async def aget_object(view):
+    """
+    GenericAPIView.get_object() on the async ORM.
+    """
+    queryset = await sync_to_async(view.filter_queryset)(view.get_queryset())
+    lookup_url_kwarg = view.lookup_url_kwarg or view.lookup_field
+    try:
+        obj = await queryset.aget(**{view.lookup_field: view.kwargs[lookup_url_kwarg]})
+    except (queryset.model.DoesNotExist, TypeError, ValueError, DjangoValidationError):
+        raise Http404(f'No {queryset.model._meta.object_name} matches the given query.')
+    view.check_object_permissions(view.request, obj)
+    return obj
+
+
+async def aretrieve(view, request):
+    return Response(view.get_serializer(await aget_object(view)).data)
+
+
+async def dispatch(view, request, *args, **kwargs):
+    """
+    APIView.dispatch() for GET/HEAD with the async handlers above.
+    """
+    view.args = args
+    view.kwargs = kwargs
+    request = view.initialize_request(request, *args, **kwargs)
+    view.request = request
+    view.headers = view.default_response_headers
+
+    try:
+        await authenticate(request)
+        await aaccessible_board_ids(request)
+        # Negotiation, permissions and throttles; with the user and access set loaded they don't query.
+        view.initial(request, *args, **kwargs)
+
+        handler = aretrieve if view.action == 'retrieve' else alist
+        if isinstance(view, VersionedCacheMixin):
+            response = await acached_response(request, view.get_cache_scopes(request),
+                                              lambda: handler(view, request), per_user=view.cache_per_user)
+        else:
+            response = await handler(view, request)
+    except Exception as exc:
+        response = view.handle_exception(exc)
+
+    view.response = view.finalize_response(request, response, *args, **kwargs)
+    return view.response
+
+
+def async_read_view(viewset_class, basename, detail=False):
+    """
+    An async view for a viewset's list (or, with `detail`, retrieve) route that
+    serves GET/HEAD itself and hands every other method to the sync viewset.
+    """
+    actions = DETAIL_ACTIONS if detail else LIST_ACTIONS
+    initkwargs = {'basename': basename, 'detail': detail}
+    sync_view = sync_to_async(viewset_class.as_view(actions, **initkwargs))
+
+    async def view(request, *args, **kwargs):
+        if request.method not in ASYNC_METHODS:
+            return await sync_view(request, *args, **kwargs)
+        viewset = viewset_class(**initkwargs)
+        # As in ViewSetMixin.as_view(): HEAD is answered like GET, under the same action.
+        viewset.action_map = {**actions, 'head': actions['get']}
+        for method, action in viewset.action_map.items():
+            # Bound like as_view() does; the Allow header is built from these.
+            setattr(viewset, method, getattr(viewset, action))
+        return await dispatch(viewset, request, *args, **kwargs)
+
+    # What ViewSetMixin.as_view() exposes; ReplicaRoutingMiddleware reads cls and actions.
+    view.cls = viewset_class
+    view.initkwargs = initkwargs
+    view.actions = actions
+    return csrf_exempt(view)
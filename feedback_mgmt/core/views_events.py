@@ -0,0 +1,74 @@
+# core/views_events.py
+
+import json
+
+from asgiref.sync import sync_to_async
+from django.http import HttpResponseForbidden, JsonResponse, StreamingHttpResponse
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+
+from .access import can_access_board
+from .authentication import CachedJWTAuthentication
+from .events import get_broker
+
+HEARTBEAT_SECONDS = 15
+
+
+def _authenticate(request):
+    """
+    JWT from the Authorization header, or from ?token= since EventSource can't send headers.
+    """
+    auth = CachedJWTAuthentication()
+    header = auth.get_header(request)
+    raw_token = auth.get_raw_token(header) if header else None
+    if raw_token is None:
+        raw_token = request.GET.get('token')
+    if not raw_token:
+        return None
+    try:
+        return auth.get_user(auth.get_validated_token(raw_token))
+    except (InvalidToken, AuthenticationFailed):
+        return None
+
+
+def _authorize(request, board_id):
+    user = _authenticate(request)
+    if user is None:
+        return None
+    request.user = user
+    return user if can_access_board(request, board_id) else False
+
+
+def _last_event_id(request):
+    value = request.headers.get('Last-Event-ID') or request.GET.get('last_event_id')
+    return int(value) if value and value.isdigit() else None
+
+
+def _format(event):
+    return f"id: {event['id']}\nevent: {event['type']}\ndata: {json.dumps(event['data'])}\n\n"
+
+
+async def _stream(events):
+    yield 'retry: 3000\n\n'
+    try:
+        async for event in events:
+            # A comment line on idle keeps proxies from closing the connection.
+            yield ': ping\n\n' if event is None else _format(event)
+    finally:
+        await events.aclose()
+
+
+async def board_events(request, board_id):
+    """
+    Server-Sent Events stream of changes on one board (needs an ASGI server).
+    """
+    user = await sync_to_async(_authorize)(request, board_id)
+    if user is None:
+        return JsonResponse({'detail': 'Authentication credentials were not provided.'}, status=401)
+    if user is False:
+        return HttpResponseForbidden()
+
+    events = get_broker().subscribe(board_id, _last_event_id(request), heartbeat=HEARTBEAT_SECONDS)
+    response = StreamingHttpResponse(_stream(events), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
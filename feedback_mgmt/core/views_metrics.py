@@ -0,0 +1,38 @@
+# core/views_metrics.py
+
+from django.conf import settings
+from django.http import HttpResponse, JsonResponse
+from django.utils.crypto import constant_time_compare
+from rest_framework.exceptions import AuthenticationFailed
+
+from .authentication import CachedJWTAuthentication
+from .instrumentation import registry
+
+
+def _bearer_token(request):
+    scheme, _, credentials = request.headers.get('Authorization', '').partition(' ')
+    return credentials.strip() if scheme.lower() == 'bearer' else ''
+
+
+def _allowed(request):
+    """
+    Scrapers send settings.METRICS_TOKEN in the Authorization header
+    (`Bearer <token>`); any other caller must be an authenticated admin.
+    """
+    token = getattr(settings, 'METRICS_TOKEN', '')
+    if token and constant_time_compare(token, _bearer_token(request)):
+        return True
+    try:
+        result = CachedJWTAuthentication().authenticate(request)
+    except AuthenticationFailed:
+        return False
+    return result is not None and result[0].role == 'admin'
+
+
+def metrics(request):
+    """
+    Request metrics in Prometheus text format.
+    """
+    if not _allowed(request):
+        return JsonResponse({'detail': 'You do not have permission to perform this action.'}, status=403)
+    return HttpResponse(registry.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
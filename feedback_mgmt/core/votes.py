@@ -0,0 +1,69 @@
+from django.db import IntegrityError, transaction
+from django.db.models import BooleanField, Exists, F, OuterRef, Value
+
+from .counters import reconcile_counts
+from .events import publish_event
+from .models import Feedback, Vote
+from .ranking import activity_update
+from .signals import notify_boards_changed
+
+
+def toggle_upvote(feedback, user):
+    """
+    Add the user's vote if missing, remove it otherwise.
+    Returns True when the feedback is upvoted after the call.
+
+    The vote row is the source of truth; the counter on Feedback is moved
+    with an F() update in the same transaction so reads never count rows.
+    The same UPDATE moves the hot/trending scores (see core.ranking).
+    """
+    with transaction.atomic():
+        deleted, _ = Vote.objects.filter(feedback_id=feedback.pk, user_id=user.pk).delete()
+        if deleted:
+            Feedback.objects.filter(pk=feedback.pk).update(
+                upvote_count=F('upvote_count') - 1, **activity_update(feedback, -1))
+            notify_boards_changed([feedback.board_id])
+            publish_event(feedback.board_id, 'feedback.upvoted', {'id': feedback.pk, 'delta': -1})
+            return False
+
+        try:
+            with transaction.atomic():
+                Vote.objects.create(feedback_id=feedback.pk, user_id=user.pk)
+        except IntegrityError:
+            # A concurrent request inserted the same vote first; it owns the increment.
+            return True
+
+        Feedback.objects.filter(pk=feedback.pk).update(
+            upvote_count=F('upvote_count') + 1, **activity_update(feedback, 1))
+        notify_boards_changed([feedback.board_id])
+        publish_event(feedback.board_id, 'feedback.upvoted', {'id': feedback.pk, 'delta': 1})
+        return True
+
+
+def annotate_has_upvoted(queryset, user):
+    """
+    Add a `has_upvoted` flag for `user` to every row as one EXISTS subquery
+    (served by the unique (feedback, user) index), so a page of any size
+    costs no extra queries.
+    """
+    if user is None or not user.is_authenticated:
+        return queryset.annotate(has_upvoted=Value(False, output_field=BooleanField()))
+    return queryset.annotate(has_upvoted=Exists(Vote.objects.filter(feedback_id=OuterRef('pk'), user_id=user.pk)))
+
+
+def voted_feedback_ids(user, board_ids):
+    """
+    Sorted ids of the feedback on `board_ids` that `user` has upvoted.
+    """
+    return sorted(
+        Vote.objects.filter(user_id=user.pk, feedback__board_id__in=board_ids, feedback__deleted_at__isnull=True)
+        .values_list('feedback_id', flat=True)
+    )
+
+
+def reconcile_upvote_counts(queryset=None):
+    """
+    Rewrite upvote_count from the vote table for every drifted row in `queryset`.
+    Returns the number of rows that were fixed.
+    """
+    return reconcile_counts(queryset if queryset is not None else Feedback.objects.all(), 'upvote_count', Vote)
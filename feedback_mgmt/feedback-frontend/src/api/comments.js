@@ -2,7 +2,7 @@ import axiosInstance from './axiosInstance';
 
 export const fetchComments = async (feedbackId) => {
   try {
-    const response = await axiosInstance.get(`/comments/?feedback=${feedbackId}`);
+    const response = await axiosInstance.get(`/feedback/${feedbackId}/comments/`);
     return response.data;
   } catch (error) {
     console.error('Failed to fetch comments', error);
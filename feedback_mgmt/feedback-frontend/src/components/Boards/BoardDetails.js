@@ -57,6 +57,13 @@ const BoardDetail = () => {
       {board && (
         <p className="board-card-description">{board.description || 'No description provided.'}</p>
       )}
+
+      {board && !board.is_public && (
+        <div className="board-card-members">
+          <strong>Members:</strong>{' '}
+          {board.members?.map(m => m.username).join(', ') || 'No members'}
+        </div>
+      )}
       
       <h3 className="dashboard-title">Feedbacks</h3>
       
@@ -82,7 +89,7 @@ const BoardDetail = () => {
                     </span>
                   )}
                 </div>
-                <div className="upvote-button" onClick={() => handleUpvote(fb.id)}>
+                <div className={`upvote-button${fb.has_upvoted ? ' upvoted' : ''}`} onClick={() => handleUpvote(fb.id)}>
                   👍 {fb.upvote_count || fb.upvotes?.length || 0}
                 </div>
               </div>
@@ -170,7 +170,7 @@ const BoardsPage = () => {
                   ) : (
                     <div>
                       <strong>Members:</strong>{' '}
-                      {board.members?.map(m => m.username).join(', ') || 'No members'}
+                      {board.member_count || 'No members'}
                     </div>
                   )}
                 </div>
@@ -62,16 +62,15 @@ const DashboardView = () => {
 
         const fetchData = async () => {
             try {
-                const res = await axiosInstance.get(`/feedback/?board=${selectedBoard}&page_size=1000`);
-                const feedbacks = res.data.results;
+                const res = await axiosInstance.get(`/boards/${selectedBoard}/stats/`);
+                const stats = res.data;
 
-                const total = res.data.count;
-                const open = feedbacks.filter(fb => fb.status === 'open').length;
-                const in_progress = feedbacks.filter(fb => fb.status === 'in_progress').length;
-                const completed = feedbacks.filter(fb => fb.status === 'completed').length;
+                const total = stats.total;
+                const open = stats.by_status.open || 0;
+                const in_progress = stats.by_status.in_progress || 0;
+                const completed = stats.by_status.completed || 0;
 
-                const sortedByVotes = [...feedbacks].sort((a, b) => (b.upvote_count || 0) - (a.upvote_count || 0));
-                const topVoted = sortedByVotes[0] || null;
+                const topVoted = stats.top_voted;
 
                 let dateCounts = {};
                 const now = new Date();
@@ -80,9 +79,8 @@ const DashboardView = () => {
                     const key = d.toISOString().split('T')[0];
                     dateCounts[key] = 0;
                 }
-                feedbacks.forEach(fb => {
-                    const dateKey = fb.created_at.split('T')[0];
-                    if (dateKey in dateCounts) dateCounts[dateKey]++;
+                stats.by_day.forEach(day => {
+                    if (day.date in dateCounts) dateCounts[day.date] = day.count;
                 });
                 const trending = Object.entries(dateCounts).map(([date, count]) => ({ date, count }));
 
@@ -21,6 +21,7 @@ const RedditStyle = () => {
   const [comments, setComments] = useState({});
   const [newComment, setNewComment] = useState({});
   const [upvoting, setUpvoting] = useState(null);
+  const [similar, setSimilar] = useState([]);
 
   useEffect(() => {
     fetchBoards();
@@ -33,6 +34,24 @@ const RedditStyle = () => {
     }
   }, [selectedBoard, selectedTagFilter]);
 
+  // Suggest existing items while a title is typed, so duplicates get upvoted instead of refiled.
+  useEffect(() => {
+    const title = newFeedback.title.trim();
+    if (!selectedBoard || title.length < 4) {
+      setSimilar([]);
+      return;
+    }
+    const timer = setTimeout(async () => {
+      try {
+        const res = await axiosInstance.get('/feedback/similar/', { params: { board: selectedBoard, q: title } });
+        setSimilar(res.data.results || []);
+      } catch (err) {
+        setSimilar([]);
+      }
+    }, 250);
+    return () => clearTimeout(timer);
+  }, [newFeedback.title, selectedBoard]);
+
   const fetchBoards = async () => {
     try {
       const res = await axios.get('/boards/');
@@ -211,6 +230,19 @@ const RedditStyle = () => {
           value={newFeedback.title}
           onChange={(e) => setNewFeedback({ ...newFeedback, title: e.target.value })}
         />
+        {similar.length > 0 && (
+          <div className="similar-feedback">
+            <p>Similar feedback already exists:</p>
+            <ul>
+              {similar.map((item) => (
+                <li key={item.id}>
+                  {item.title} ({item.upvote_count} upvotes){' '}
+                  <button className="btn-small" onClick={() => handleUpvote(item.id)}>Upvote instead</button>
+                </li>
+              ))}
+            </ul>
+          </div>
+        )}
         <textarea
           placeholder="Description"
           className="form-control"
@@ -294,7 +326,7 @@ const RedditStyle = () => {
               </div>
               <button
                 onClick={() => handleUpvote(fb.id)}
-                className="upvote-button"
+                className={`upvote-button${fb.has_upvoted ? ' upvoted' : ''}`}
                 disabled={upvoting === fb.id}
               >
                 👍 {fb.upvote_count}
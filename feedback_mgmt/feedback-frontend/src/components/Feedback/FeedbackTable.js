@@ -112,7 +112,8 @@ const FeedbackTable = ({ selectedBoard }) => {
 
     useEffect(() => {
         setLoading(true);
-        let sort_param = '';
+        // Unsorted, the table shows the most popular items first (decayed by age).
+        let sort_param = 'hot';
         if (sortBy.length > 0) {
             const s = sortBy[0];
             sort_param = (s.desc ? '-' : '') + s.id;
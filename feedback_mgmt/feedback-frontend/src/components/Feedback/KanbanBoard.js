@@ -11,6 +11,9 @@ const statuses = [
   { key: 'completed', title: 'Completed' },
 ];
 
+const PER_COLUMN = 20;
+const CARD_FIELDS = 'id,title,status,feedback_type,upvote_count';
+
 const KanbanBoard = () => {
   const { user } = useContext(AuthContext);
   const isAdmin = user?.role === 'admin';
@@ -18,6 +21,7 @@ const KanbanBoard = () => {
   const [boards, setBoards] = useState([]);
   const [selectedBoardId, setSelectedBoardId] = useState(null);
   const [columns, setColumns] = useState({ open: [], in_progress: [], completed: [] });
+  const [columnMeta, setColumnMeta] = useState({});
   const [loading, setLoading] = useState(false);
 
   const fetchBoards = async () => {
@@ -36,31 +40,105 @@ const KanbanBoard = () => {
     if (!boardId) return;
     setLoading(true);
     try {
-      const res = await axiosInstance.get(`/feedback/?board=${boardId}`);
-      const grouped = { open: [], in_progress: [], completed: [] };
-      res.data.results.forEach(item => {
-        grouped[item.status].push(item);
+      // One request returns every column's first page, its total and a cursor for the rest.
+      const res = await axiosInstance.get(`/boards/${boardId}/kanban/?per_column=${PER_COLUMN}&fields=${CARD_FIELDS}`);
+      const grouped = {};
+      const meta = {};
+      res.data.columns.forEach(column => {
+        grouped[column.status] = column.results;
+        meta[column.status] = { count: column.count, next: column.next };
       });
       setColumns(grouped);
+      setColumnMeta(meta);
     } catch (error) {
       console.error('Failed to fetch feedbacks:', error);
     }
     setLoading(false);
   };
 
+  const loadMore = async (statusKey) => {
+    const next = columnMeta[statusKey]?.next;
+    if (!next) return;
+    try {
+      const res = await axiosInstance.get(next);
+      setColumns(prev => {
+        const seen = new Set(prev[statusKey].map(f => f.id));
+        return { ...prev, [statusKey]: [...prev[statusKey], ...res.data.results.filter(f => !seen.has(f.id))] };
+      });
+      setColumnMeta(prev => ({ ...prev, [statusKey]: { ...prev[statusKey], next: res.data.next } }));
+    } catch (error) {
+      console.error('Failed to load more feedback:', error);
+    }
+  };
+
   useEffect(() => {
     fetchBoards();
   }, []);
 
   useEffect(() => {
-    if (selectedBoardId) {
-      fetchFeedbacks(selectedBoardId);
-      if (!isAdmin) {
-        const interval = setInterval(() => fetchFeedbacks(selectedBoardId), 15000);
-        return () => clearInterval(interval);
-      }
+    if (!selectedBoardId) return;
+    fetchFeedbacks(selectedBoardId);
+
+    const tokens = localStorage.getItem('authTokens');
+    const access = tokens ? JSON.parse(tokens).access : null;
+    if (!window.EventSource || !access) {
+      const interval = setInterval(() => fetchFeedbacks(selectedBoardId), 15000);
+      return () => clearInterval(interval);
     }
-  }, [selectedBoardId, isAdmin]);
+
+    // Live updates: the server pushes small deltas instead of us re-fetching the board.
+    const url = `${axiosInstance.defaults.baseURL}boards/${selectedBoardId}/events/?token=${encodeURIComponent(access)}`;
+    const source = new EventSource(url);
+    const refetch = () => fetchFeedbacks(selectedBoardId);
+
+    source.addEventListener('feedback.moved', (e) => {
+      const { id, status } = JSON.parse(e.data);
+      setColumns(prev => {
+        const item = Object.values(prev).flat().find(f => f.id === id);
+        if (!item || item.status === status) return prev;
+        const next = {};
+        Object.keys(prev).forEach(key => {
+          next[key] = prev[key].filter(f => f.id !== id);
+        });
+        next[status] = [...next[status], { ...item, status }];
+        return next;
+      });
+    });
+    source.addEventListener('feedback.upvoted', (e) => {
+      const { id, delta } = JSON.parse(e.data);
+      setColumns(prev => {
+        const next = {};
+        Object.keys(prev).forEach(key => {
+          next[key] = prev[key].map(f => (f.id === id ? { ...f, upvote_count: (f.upvote_count || 0) + delta } : f));
+        });
+        return next;
+      });
+    });
+    source.addEventListener('feedback.created', (e) => {
+      const item = JSON.parse(e.data);
+      setColumns(prev => (
+        Object.values(prev).flat().some(f => f.id === item.id)
+          ? prev
+          : { ...prev, [item.status]: [...prev[item.status], item] }
+      ));
+    });
+    source.addEventListener('feedback.updated', (e) => {
+      const item = JSON.parse(e.data);
+      setColumns(prev => {
+        const next = {};
+        Object.keys(prev).forEach(key => {
+          next[key] = prev[key].filter(f => f.id !== item.id);
+        });
+        const old = Object.values(prev).flat().find(f => f.id === item.id);
+        next[item.status] = [...next[item.status], { ...old, ...item }];
+        return next;
+      });
+    });
+    source.addEventListener('feedback.bulk', refetch);
+    source.addEventListener('reset', refetch);
+
+    return () => source.close();
+  }, [selectedBoardId]);
 
   const onDragEnd = (result) => {
     if (!isAdmin) return;
@@ -124,7 +202,10 @@ const KanbanBoard = () => {
                       backgroundColor: snapshot.isDraggingOver ? '#e0f2fe' : '#f5f5f5',
                     }}
                   >
-                    <div className="kanban-column-header">{status.title}</div>
+                    <div className="kanban-column-header">
+                      {status.title}
+                      {columnMeta[status.key] && ` (${columnMeta[status.key].count})`}
+                    </div>
                     <div className="kanban-items">
                       {columns[status.key].map((item, index) => (
                         <Draggable
@@ -156,6 +237,9 @@ const KanbanBoard = () => {
                       ))}
                       {provided.placeholder}
                     </div>
+                    {columnMeta[status.key]?.next && (
+                      <button className="btn-small" onClick={() => loadMore(status.key)}>Load more</button>
+                    )}
                   </div>
                 )}
               </Droppable>
@@ -35,7 +35,7 @@ INSTALLED_APPS = [
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'core.authentication.CachedJWTAuthentication',
     ),
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticated',
@@ -45,11 +45,24 @@ REST_FRAMEWORK = {
         'rest_framework.filters.OrderingFilter',
         'rest_framework.filters.SearchFilter',
     ],
+    # orjson-backed when installed, with the same output as DRF's JSON classes (core.renderers).
+    'DEFAULT_RENDERER_CLASSES': [
+        'core.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'core.renderers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 10,
 }
 
 MIDDLEWARE = [
+    'core.instrumentation.InstrumentationMiddleware',  # first, so it times the whole stack
+    'core.compression.CompressionMiddleware',  # after instrumentation, which then records bytes on the wire
+    'core.db_router.ReplicaRoutingMiddleware',
     'corsheaders.middleware.CorsMiddleware',  # ✅ must come before CommonMiddleware
     'django.middleware.common.CommonMiddleware',
 
@@ -88,10 +101,87 @@ DATABASES = {
         'PASSWORD': config('POSTGRES_PASSWORD', default='postgres'),
         'HOST': config('DB_HOST', default='db'),
         'PORT': '5432',
+        # Persistent connections for WSGI workers, with a liveness check before reuse.
+        'CONN_MAX_AGE': config('DB_CONN_MAX_AGE', default=60, cast=int),
+        'CONN_HEALTH_CHECKS': True,
     }
 }
 
+# Under ASGI each request gets its own thread, so persistent connections pile up
+# instead of being reused: use psycopg's pool (DB_POOL=True) there. Django refuses
+# pooling together with CONN_MAX_AGE.
+if config('DB_POOL', default=False, cast=bool):
+    DATABASES['default']['CONN_MAX_AGE'] = 0
+    DATABASES['default']['OPTIONS'] = {
+        'pool': {
+            'min_size': config('DB_POOL_MIN_SIZE', default=2, cast=int),
+            'max_size': config('DB_POOL_MAX_SIZE', default=20, cast=int),
+            'timeout': config('DB_POOL_TIMEOUT', default=10, cast=int),
+        },
+    }
+
+# DB_ENGINE=sqlite3 runs locally (and the benchmarks) without a Postgres server.
+if config('DB_ENGINE', default='postgresql') == 'sqlite3':
+    DATABASES['default'] = {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': BASE_DIR / 'db.sqlite3',
+    }
+
+# Read replicas: one alias per host in DB_REPLICA_HOSTS (comma separated), same
+# credentials as the primary. core.db_router sends safe-method reads to them.
+REPLICA_DATABASES = []
+for index, host in enumerate(filter(None, config('DB_REPLICA_HOSTS', default='').split(','))):
+    alias = f'replica_{index}'
+    DATABASES[alias] = {
+        **DATABASES['default'],
+        'HOST': host.strip(),
+        'TEST': {'MIRROR': 'default'},
+    }
+    REPLICA_DATABASES.append(alias)
+
+DATABASE_ROUTERS = ['core.db_router.PrimaryReplicaRouter']
+# How long a user who just wrote keeps reading from the primary.
+DB_PIN_SECONDS = config('DB_PIN_SECONDS', default=5, cast=int)
+
+# Local memory by default (one process, tests); set REDIS_URL to share the cache
+# between workers so response-cache versions and invalidations are seen by all of them.
+REDIS_URL = config('REDIS_URL', default='')
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
+FEEDBACK_CACHE_ALIAS = 'default'
+
+# Background tasks (core.tasks). Eager mode runs them in-process on commit, so a
+# development server (DEBUG) keeps search and purges current without
+# `manage.py run_worker`. Deployments with TASKS_EAGER off must run the worker.
+TASKS_EAGER = config('TASKS_EAGER', default=DEBUG, cast=bool)
+
+# Serve GET list/detail of boards, feedback, comments and tags through the async
+# read path (core.views_async). Only worth it under an ASGI server.
+ASYNC_READ_VIEWS = config('ASYNC_READ_VIEWS', default=False, cast=bool)
+
+# Response compression (core.compression): bodies smaller than this go uncompressed.
+COMPRESSION_MIN_SIZE = config('COMPRESSION_MIN_SIZE', default=1024, cast=int)
+COMPRESSION_GZIP_LEVEL = config('COMPRESSION_GZIP_LEVEL', default=6, cast=int)
+COMPRESSION_BROTLI_QUALITY = config('COMPRESSION_BROTLI_QUALITY', default=5, cast=int)
 
+# Request instrumentation (core.instrumentation); /api/metrics/ also accepts this token as
+# "Authorization: Bearer <token>".
+METRICS_TOKEN = config('METRICS_TOKEN', default='')
+SLOW_REQUEST_MS = config('SLOW_REQUEST_MS', default=500, cast=int)
+SLOW_REQUEST_QUERIES = config('SLOW_REQUEST_QUERIES', default=50, cast=int)
+RESPONSE_CACHE_TIMEOUT = config('RESPONSE_CACHE_TIMEOUT', default=300, cast=int)
 
 
 AUTH_PASSWORD_VALIDATORS = [